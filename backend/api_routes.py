@@ -17,7 +17,7 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from orchestrator.renata_orchestrator import RenataOrchestrator
+from orchestrator.renata_orchestrator import get_orchestrator
 from tools.tool_types import ToolStatus
 
 
@@ -43,7 +43,7 @@ class MarketDataRequest(BaseModel):
 
 
 # Initialize orchestrator
-orchestrator = RenataOrchestrator()
+orchestrator = get_orchestrator()
 
 # Create router
 router = APIRouter(
@@ -178,9 +178,9 @@ async def list_tools():
         for tool_id, tool_info in tools.items():
             tool_list.append({
                 "id": tool_id,
-                "name": tool_info["name"],
-                "description": tool_info["description"],
-                "keywords": tool_info["keywords"]
+                "name": tool_info.name,
+                "description": tool_info.description,
+                "keywords": list(tool_info.keywords)
             })
 
         return JSONResponse({
@@ -0,0 +1,132 @@
+"""
+Scanner Formatting Core
+
+Pure string-building for the human-in-the-loop formatter
+(/api/format/apply-formatting). Kept free of FastAPI, decorators and
+**kwargs so it can be compiled ahead of time with mypyc:
+
+    cd backend && mypyc formatter_core.py
+
+The compiled extension shadows this file on import; without it the
+pure-Python module is used unchanged.
+"""
+
+import json
+import threading
+from typing import Any, Dict, List, Tuple
+
+FrozenParams = Tuple[Tuple[str, Any], ...]
+
+FORMAT_HEADER = (
+    "# Scanner Configuration - User Adjustable Parameters\n"
+    "# Generated by Human-in-the-Loop Formatter\n"
+    "class ScannerConfig:\n"
+    "    \"\"\"User-configurable scanner parameters\"\"\"\n"
+)
+
+FORMAT_CONFIG_INIT = "\n# Initialize configuration\nconfig = ScannerConfig()\n\n"
+
+FORMAT_FOOTER_TMPL = (
+    "\n\n# Usage Instructions:\n"
+    "# 1. Adjust parameters in the ScannerConfig class above\n"
+    "# 2. Run the scanner normally\n"
+    "# 3. {n} parameters are now user-configurable"
+)
+
+# Bounded cache of JSON literals for parameter values, keyed on the
+# type-tagged frozen value (never id(), submitted dicts can be mutated).
+# Writes take the lock: apply_formatting calls in from asyncio.to_thread workers
+_LITERAL_CACHE: Dict[Any, str] = {}
+_LITERAL_CACHE_SIZE = 4096
+_LITERAL_CACHE_LOCK = threading.Lock()
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert a JSON-like value into a hashable, type-tagged form"""
+    if isinstance(value, dict):
+        return (dict, tuple((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return (list, tuple(freeze(v) for v in value))
+    # Tag scalars with their type so True/1/1.0 don't collide as cache keys
+    return (type(value), value)
+
+
+def thaw(frozen: Any) -> Any:
+    """Inverse of freeze"""
+    kind, payload = frozen
+    if kind is dict:
+        return {k: thaw(v) for k, v in payload}
+    if kind is list:
+        return [thaw(v) for v in payload]
+    return payload
+
+
+def freeze_parameters(approved_parameters: List[Dict[str, Any]]) -> FrozenParams:
+    """Canonical hashable form of approved parameters (order preserved, it drives output order)"""
+    return tuple(
+        (param.get('name', 'unknown'), freeze(param.get('value', {})))
+        for param in approved_parameters
+    )
+
+
+def to_literal(frozen_value: Any) -> str:
+    """JSON literal for a frozen parameter value, cached across requests"""
+    literal = _LITERAL_CACHE.get(frozen_value)
+    if literal is None:
+        literal = json.dumps(thaw(frozen_value))
+        with _LITERAL_CACHE_LOCK:
+            if len(_LITERAL_CACHE) >= _LITERAL_CACHE_SIZE:
+                # Drop the oldest entry (dicts keep insertion order)
+                _LITERAL_CACHE.pop(next(iter(_LITERAL_CACHE)), None)
+            _LITERAL_CACHE[frozen_value] = literal
+    return literal
+
+
+def is_range_value(param_value: Any) -> bool:
+    return isinstance(param_value, dict) and 'min' in param_value and 'max' in param_value
+
+
+def emit_param(param_name: str, param_value: Any, frozen_value: Any) -> str:
+    """Render one approved parameter as a pre-formed config chunk"""
+    if is_range_value(param_value):
+        return (
+            f"    {param_name}_min = {param_value['min']}\n"
+            f"    {param_name}_max = {param_value['max']}\n"
+        )
+    if isinstance(param_value, list):
+        return f"    {param_name} = {param_value}\n"
+    return f"    {param_name} = {to_literal(frozen_value)}\n"
+
+
+def improvement_for(param_name: str, param_value: Any) -> str:
+    """Describe the improvement made for one approved parameter"""
+    if is_range_value(param_value):
+        return f"Configurable range for {param_name}"
+    if isinstance(param_value, list):
+        return f"Configurable array for {param_name}"
+    return f"Configurable parameter {param_name}"
+
+
+def format_scanner(original_code: str, params: FrozenParams) -> Tuple[str, Tuple[str, ...]]:
+    """
+    Build the formatted scanner for a set of approved parameters.
+
+    Args:
+        original_code: Scanner source submitted by the user
+        params: Output of freeze_parameters()
+
+    Returns:
+        (formatted_code, improvements) with improvements as a tuple so a
+        cached value can't be mutated by callers
+    """
+    values = [(param_name, thaw(frozen_value), frozen_value) for param_name, frozen_value in params]
+    param_block = "".join([emit_param(name, value, frozen) for name, value, frozen in values])
+    # dict.fromkeys drops repeats (same-named parameters) while keeping first-seen order
+    improvements = tuple(dict.fromkeys([improvement_for(name, value) for name, value, _ in values]))
+
+    # Static header | parameter block | original code | footer
+    formatted_code = (
+        f"{FORMAT_HEADER}{param_block}{FORMAT_CONFIG_INIT}"
+        f"{original_code}{FORMAT_FOOTER_TMPL.format(n=len(params))}"
+    )
+    return formatted_code, improvements
@@ -8,26 +8,37 @@ from dotenv import load_dotenv
 load_dotenv()
 
 import asyncio
+import functools
+import hashlib
 import json
 import logging
+import re
+import shutil
+import tempfile
+import threading
 import uuid
 from datetime import datetime, date
 from typing import Dict, List, Optional, Any
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import asynccontextmanager
-import pandas as pd
+from operator import itemgetter
+import orjson
 import time
 
-# Add httpx import at top
-try:
-    import httpx
-except ImportError:
-    print("httpx not available, chart API will use requests instead")
-    import requests as httpx
+# pandas is only needed by a few handlers (and by uploaded scanner code);
+# import it on first use rather than at server start
+@functools.cache
+def _pd():
+    import pandas
+    return pandas
+
+import httpx
 
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, BackgroundTasks, Request, File, Form, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from fastapi.exceptions import RequestValidationError
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 import uvicorn
 import argparse
 
@@ -44,6 +55,11 @@ from uploaded_scanner_bypass import (
     execute_uploaded_scanner_direct
 )
 
+# Pure formatting core for /api/format/apply-formatting (mypyc-compilable)
+from formatter_core import format_scanner, freeze_parameters
+from scanner_runner import init_worker as init_scanner_worker, run_scanner
+from scan_store import ScanStore
+
 # Import intelligent parameter extraction system
 from core.intelligent_parameter_extractor import IntelligentParameterExtractor
 
@@ -123,6 +139,11 @@ def strip_thinking_text_from_code(code: str) -> str:
 
     return clean_code
 
+# Save -> load -> save round-trips strip the same code repeatedly. Keyed on
+# the code itself (str caches its hash); kept small since entries hold
+# whole scanner sources.
+_strip_thinking_text_cached = functools.lru_cache(maxsize=128)(strip_thinking_text_from_code)
+
 async def execute_uploaded_scanner_sync(uploaded_code: str, start_date: str, end_date: str, function_name: str = None) -> List[Dict]:
     """
     Execute uploaded scanner synchronously and return results immediately
@@ -438,11 +459,66 @@ limiter = Limiter(key_func=get_remote_address)
 # Concurrency control
 MAX_CONCURRENT_SCANS = 5
 active_scan_count = 0
-scan_lock = asyncio.Lock()
+
+# Worker processes for uploaded scanner code (scan-ez). exec() of user code
+# runs for minutes and would otherwise block the event loop for the duration.
+SCANNER_POOL = ProcessPoolExecutor(max_workers=MAX_CONCURRENT_SCANS, initializer=init_scanner_worker)
+
+def claim_scan_slot() -> bool:
+    """
+    Reserve one of the MAX_CONCURRENT_SCANS slots, or return False if all are taken.
+
+    No lock needed: the check and the increment run with no await in
+    between, so no other coroutine on the event loop can interleave.
+    """
+    global active_scan_count
+    if active_scan_count >= MAX_CONCURRENT_SCANS:
+        return False
+    active_scan_count += 1
+    return True
+
+def release_scan_slot() -> None:
+    """Give back a slot taken with claim_scan_slot()"""
+    global active_scan_count
+    active_scan_count = max(0, active_scan_count - 1)
+
+# Strong references to running background scan tasks, keyed by scan_id.
+# The event loop only holds weak references, so an unreferenced task can be
+# garbage collected mid-scan. Entries remove themselves when the task finishes.
+scan_tasks: Dict[str, asyncio.Task] = {}
+
+def track_scan_task(scan_id: str, task: asyncio.Task) -> asyncio.Task:
+    """Keep a background scan task alive until it completes"""
+    def _release(done: asyncio.Task) -> None:
+        if scan_tasks.get(scan_id) is done:
+            del scan_tasks[scan_id]
+
+    scan_tasks[scan_id] = task
+    task.add_done_callback(_release)
+    return task
 
 # Scan cleanup task
 SCAN_CLEANUP_INTERVAL = 3600  # 1 hour
 
+# Minimum spacing between WebSocket progress frames for one scan (final 100% always sent)
+PROGRESS_EMIT_INTERVAL = 0.1  # seconds
+
+# (epoch second, ISO string) behind progress_timestamp()
+_progress_ts = (0, "")
+
+def progress_timestamp() -> str:
+    """
+    Local ISO timestamp for progress heartbeats, rebuilt at most once per second.
+
+    Only consumed by the 10-minute staleness check in cleanup_old_scans, so
+    second resolution is plenty and chatty scans stop allocating per tick.
+    """
+    global _progress_ts
+    second = int(time.time())
+    if second != _progress_ts[0]:
+        _progress_ts = (second, datetime.fromtimestamp(second).isoformat())
+    return _progress_ts[1]
+
 # Pydantic models for API
 class ScanRequest(BaseModel):
     start_date: Optional[str] = None
@@ -500,33 +576,60 @@ class UserScansResponse(BaseModel):
 
 # WebSocket manager for real-time updates
 class ConnectionManager:
+    """
+    Progress subscriptions grouped into one room per scan_id.
+
+    Any number of clients (e.g. several dashboard tabs) can watch the same
+    scan; each update is serialized once and fanned out to the whole room.
+    """
+
     def __init__(self):
-        self.active_connections: Dict[str, WebSocket] = {}
+        self.active_connections: Dict[str, set] = {}
 
     async def connect(self, scan_id: str, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections[scan_id] = websocket
+        self.active_connections.setdefault(scan_id, set()).add(websocket)
         logger.info(f"WebSocket connected for scan {scan_id}")
 
-    def disconnect(self, scan_id: str):
-        if scan_id in self.active_connections:
+    def disconnect(self, scan_id: str, websocket: Optional[WebSocket] = None):
+        """Remove one subscriber from a scan's room, or the whole room if websocket is None"""
+        room = self.active_connections.get(scan_id)
+        if room is None:
+            return
+        if websocket is not None:
+            room.discard(websocket)
+        if websocket is None or not room:
             del self.active_connections[scan_id]
             logger.info(f"WebSocket disconnected for scan {scan_id}")
 
+    async def broadcast_progress(self, scan_id: str, payload: bytes):
+        """Send one pre-serialized JSON message to every subscriber of the scan"""
+        room = self.active_connections.get(scan_id)
+        if not room:
+            return
+        # Text frames: the frontend JSON.parse()s event.data, which a binary
+        # frame would deliver as a Blob. Decoded once for the whole room.
+        text = payload.decode()
+        subscribers = list(room)
+        outcomes = await asyncio.gather(
+            *(ws.send_text(text) for ws in subscribers), return_exceptions=True
+        )
+        for ws, outcome in zip(subscribers, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error sending progress for {scan_id}: {outcome}")
+                self.disconnect(scan_id, ws)
+
     async def send_progress(self, scan_id: str, progress: int, message: str, status: str = "running"):
-        if scan_id in self.active_connections:
-            try:
-                await self.active_connections[scan_id].send_json({
-                    "type": "progress",
-                    "scan_id": scan_id,
-                    "status": status,
-                    "progress_percent": progress,
-                    "message": message,
-                    "timestamp": datetime.now().isoformat()
-                })
-            except Exception as e:
-                logger.error(f"Error sending progress for {scan_id}: {e}")
-                self.disconnect(scan_id)
+        if scan_id not in self.active_connections:
+            return
+        await self.broadcast_progress(scan_id, orjson.dumps({
+            "type": "progress",
+            "scan_id": scan_id,
+            "status": status,
+            "progress_percent": progress,
+            "message": message,
+            "timestamp": datetime.now().isoformat()
+        }))
 
 # Background task for scan cleanup
 async def cleanup_old_scans():
@@ -576,11 +679,18 @@ async def cleanup_old_scans():
                 logger.info(f"Cleaning up old inactive scan: {scan_id} (status: {scan_info.get('status', 'unknown')})")
                 del active_scans[scan_id]
 
+            # completed_scans was never cleaned; expire finished scans idle for over an hour
+            expired = completed_scans.expire(SCAN_CLEANUP_INTERVAL, current_time)
+            if expired:
+                logger.info(f"Expired {expired} completed scans")
+
             await asyncio.sleep(300)  # Check every 5 minutes instead of every hour
         except Exception as e:
             logger.error(f"Error in scan cleanup: {e}")
             await asyncio.sleep(60)  # Wait 1 minute before retrying
 
+OPENROUTER_BASE_URL = 'https://openrouter.ai/api/v1'
+
 # Lifespan event handler for modern FastAPI
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -595,6 +705,13 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"❌ Failed to apply data type fix patch: {e}")
 
+    # Shared OpenRouter client: one connection pool (TLS/DNS reuse) for every chat request
+    app.state.openrouter = httpx.AsyncClient(
+        base_url=OPENROUTER_BASE_URL,
+        timeout=180.0,
+        limits=httpx.Limits(max_keepalive_connections=100, max_connections=100),
+    )
+
     # Start background cleanup task
     cleanup_task = asyncio.create_task(cleanup_old_scans())
     yield
@@ -605,6 +722,8 @@ async def lifespan(app: FastAPI):
         await cleanup_task
     except asyncio.CancelledError:
         pass
+    SCANNER_POOL.shutdown(wait=False, cancel_futures=True)
+    await app.state.openrouter.aclose()
 
 # Initialize FastAPI app with lifespan
 app = FastAPI(
@@ -766,8 +885,8 @@ except ImportError as e:
     print(f"⚠️ Scanner Execution Validator not available: {e}")
 
 # Global storage
-active_scans = {}
-completed_scans = {}  # Store completed scans to prevent 404 errors
+active_scans = ScanStore()
+completed_scans = ScanStore()  # Store completed scans to prevent 404 errors
 websocket_manager = ConnectionManager()
 
 def move_scan_to_completed(scan_id: str):
@@ -841,15 +960,11 @@ async def execute_scan(request: Request, scan_request: ScanRequest, background_t
     Execute a new LC scan with enhanced 90-day analysis
     Auto-calculates 90-day lookback period if no dates provided
     """
-    global active_scan_count
-
-    async with scan_lock:
-        if active_scan_count >= MAX_CONCURRENT_SCANS:
-            raise HTTPException(
-                status_code=429,
-                detail=f"Maximum concurrent scans ({MAX_CONCURRENT_SCANS}) reached. Please wait for current scans to complete."
-            )
-        active_scan_count += 1
+    if not claim_scan_slot():
+        raise HTTPException(
+            status_code=429,
+            detail=f"Maximum concurrent scans ({MAX_CONCURRENT_SCANS}) reached. Please wait for current scans to complete."
+        )
 
     try:
         # Handle automatic 90-day range calculation
@@ -1013,14 +1128,12 @@ async def execute_scan(request: Request, scan_request: ScanRequest, background_t
 
     except ValueError as e:
         # Decrement scan count on error
-        async with scan_lock:
-            active_scan_count = max(0, active_scan_count - 1)
+        release_scan_slot()
         logger.error(f"Validation error: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         # Decrement scan count on error
-        async with scan_lock:
-            active_scan_count = max(0, active_scan_count - 1)
+        release_scan_slot()
         logger.error(f"Error executing scan: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Scan execution failed: {str(e)}")
 
@@ -1028,8 +1141,6 @@ async def run_real_scan_background(scan_id: str, start_date: str, end_date: str)
     """
     Run the enhanced 90-day LC scan in background with progress updates
     """
-    global active_scan_count
-
     try:
         scan_info = active_scans[scan_id]
         start_time = datetime.now()
@@ -1041,31 +1152,30 @@ async def run_real_scan_background(scan_id: str, start_date: str, end_date: str)
             validated_progress = max(current_progress, min(100, max(0, progress)))
 
             # CRITICAL FIX: Always update last_progress_update to prevent cleanup during execution
-            scan_info["last_progress_update"] = datetime.now().isoformat()
+            # (the timestamp is cached per second, so duplicate ticks stay cheap)
+            scan_info["last_progress_update"] = progress_timestamp()
+
+            # Duplicate ticks are common; nothing else to do unless progress moved
+            if validated_progress == current_progress:
+                # Diagnostic logging for progress issues
+                if progress < current_progress:
+                    logger.warning(
+                        f"Scan {scan_id}: Progress decrease blocked ({current_progress}% -> {progress}%). "
+                        f"Message: {message}"
+                    )
+                return
 
-            # Only update if changed to avoid unnecessary WebSocket traffic
-            if validated_progress != current_progress:
-                scan_info["progress_percent"] = validated_progress
-                scan_info["message"] = message
-                new_status = "running" if validated_progress < 100 else "completed"
-                scan_info["status"] = new_status
+            scan_info["progress_percent"] = validated_progress
+            scan_info["message"] = message
+            new_status = "running" if validated_progress < 100 else "completed"
+            scan_info["status"] = new_status
 
-                # DON'T move to completed_scans yet - let the main function do it after final results are stored
+            # DON'T move to completed_scans yet - let the main function do it after final results are stored
 
-                # Send WebSocket update
-                await websocket_manager.send_progress(scan_id, validated_progress, message)
+            # Send WebSocket update
+            await websocket_manager.send_progress(scan_id, validated_progress, message)
 
-                logger.info(f"Scan {scan_id}: {validated_progress}% - {message}")
-            else:
-                # Even if progress hasn't changed, update the timestamp to show activity
-                logger.debug(f"Scan {scan_id}: Activity update - {message}")
-
-            # Diagnostic logging for progress issues
-            if progress < current_progress:
-                logger.warning(
-                    f"Scan {scan_id}: Progress decrease blocked ({current_progress}% -> {progress}%). "
-                    f"Message: {message}"
-                )
+            logger.info(f"Scan {scan_id}: {validated_progress}% - {message}")
 
         # Check if this is uploaded code execution
         scanner_type = scan_info.get("scanner_type", "lc")
@@ -1184,8 +1294,7 @@ async def run_real_scan_background(scan_id: str, start_date: str, end_date: str)
 
     finally:
         # Always decrement active scan count when done
-        async with scan_lock:
-            active_scan_count = max(0, active_scan_count - 1)
+        release_scan_slot()
         logger.info(f"Scan {scan_id} completed. Active scans: {active_scan_count}")
 
 @app.get("/api/scan/status")
@@ -1462,8 +1571,9 @@ async def websocket_scan_progress(websocket: WebSocket, scan_id: str):
                 break
 
     except WebSocketDisconnect:
-        websocket_manager.disconnect(scan_id)
         logger.info(f"WebSocket disconnected for scan {scan_id}")
+    finally:
+        websocket_manager.disconnect(scan_id, websocket)
 
 # ============================================================================
 # SAVE SCAN ENDPOINTS
@@ -2017,12 +2127,8 @@ async def execute_a_plus_scan(request: Request, scan_request: ScanRequest):
     if not A_PLUS_MODE:
         raise HTTPException(status_code=503, detail="A+ scanner not available")
 
-    global active_scan_count
-
-    async with scan_lock:
-        if active_scan_count >= MAX_CONCURRENT_SCANS:
-            raise HTTPException(status_code=429, detail="Maximum concurrent scans reached. Please try again later.")
-        active_scan_count += 1
+    if not claim_scan_slot():
+        raise HTTPException(status_code=429, detail="Maximum concurrent scans reached. Please try again later.")
 
     scan_id = str(uuid.uuid4())
     start_time = time.time()
@@ -2115,8 +2221,7 @@ async def execute_a_plus_scan(request: Request, scan_request: ScanRequest):
         raise HTTPException(status_code=500, detail=error_message)
 
     finally:
-        async with scan_lock:
-            active_scan_count -= 1
+        release_scan_slot()
 
 @app.post("/api/scan/execute/two-stage", response_model=ScanResponse)
 @limiter.limit("10/minute")  # More conservative limit for two-stage scans
@@ -2134,12 +2239,8 @@ async def execute_two_stage_scan_endpoint(request: Request, scan_request: ScanRe
     if not scan_request.uploaded_code:
         raise HTTPException(status_code=400, detail="Two-stage scanning requires uploaded scanner code")
 
-    global active_scan_count
-
-    async with scan_lock:
-        if active_scan_count >= MAX_CONCURRENT_SCANS:
-            raise HTTPException(status_code=429, detail="Maximum concurrent scans reached. Please try again later.")
-        active_scan_count += 1
+    if not claim_scan_slot():
+        raise HTTPException(status_code=429, detail="Maximum concurrent scans reached. Please try again later.")
 
     scan_id = f"twostage_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
     start_time = time.time()
@@ -2240,8 +2341,7 @@ async def execute_two_stage_scan_endpoint(request: Request, scan_request: ScanRe
         raise HTTPException(status_code=500, detail=error_message)
 
     finally:
-        async with scan_lock:
-            active_scan_count -= 1
+        release_scan_slot()
 
 async def run_two_stage_scan_background(
     scan_id: str,
@@ -2253,7 +2353,6 @@ async def run_two_stage_scan_background(
     """
     Background execution of two-stage scan with comprehensive progress updates
     """
-    global active_scan_count
     start_time = time.time()
 
     try:
@@ -2602,7 +2701,7 @@ async def sandbox_test_execution(code: str) -> Dict[str, Any]:
                 'sorted': sorted,
             },
             'datetime': datetime,
-            'pd': pd if 'pd' in globals() else None,
+            'pd': _pd(),
         }
 
         # Execute a minimal version for testing
@@ -3392,6 +3491,7 @@ class ApplyFormattingResponse(BaseModel):
     success: bool
     message: str
     improvements: List[str]
+    config_info: Optional[Dict[str, Any]] = None
 
 def analyze_scanner_code_intelligence_with_separation(code: str) -> Dict:
     """
@@ -5044,7 +5144,39 @@ async def save_scanners_to_dashboard(request: dict):
             "saved_scanners": []
         }
 
-@app.post("/api/format/apply-formatting", response_model=ApplyFormattingResponse)
+# Individual-scanner detection for apply_formatting: lines assigning an
+# lc_frontside pattern column, and the single-pattern columns that mark
+# an already-structured individual scanner
+_LC_PATTERN_ASSIGNMENT_RE = re.compile(r"^(?=.*df\['lc_frontside)(?=.*= \().*$", re.MULTILINE)
+_INDIVIDUAL_SCANNER_MARKER_RE = re.compile(
+    r"df\['lc_frontside_(?:d3_extended_1|d2_extended|d2_extended_1)'\] = "
+)
+
+# Scanners larger than this (in characters) are formatted off the event loop
+_FORMAT_OFFLOAD_THRESHOLD = 64 * 1024
+
+# Repeat submissions of the same scanner + parameters are served from a
+# bounded LRU cache; formatter_core itself stays decorator-free for mypyc
+_format_scanner = functools.lru_cache(maxsize=256)(format_scanner)
+
+# Response for the individual-scanner bypass; only formatted_code and
+# pattern_count vary per request
+_INDIVIDUAL_TEMPLATE = ApplyFormattingResponse(
+    formatted_code="",
+    success=True,
+    message="Individual scanner detected - formatting bypassed to preserve syntax integrity",
+    improvements=["Individual scanner file detected - no formatting needed",
+                  "File is already perfectly structured for direct execution",
+                  "Complex trading logic preserved without modification"],
+    config_info={
+        "scanner_type": "individual_lc_scanner",
+        "requires_formatting": False,
+        "pattern_count": 1,
+        "execution_method": "direct"
+    }
+)
+
+@app.post("/api/format/apply-formatting", response_model=ApplyFormattingResponse, response_model_exclude_none=True)
 async def apply_formatting(request: ApplyFormattingRequest):
     """
     🚀 Apply Human-Approved Parameter Formatting
@@ -5052,107 +5184,52 @@ async def apply_formatting(request: ApplyFormattingRequest):
     Takes the original code and approved parameters to generate a properly
     formatted scanner with user-configurable parameters.
     """
-    try:
-        logger.info(f"🚀 Applying formatting with {len(request.approved_parameters)} approved parameters")
-
-        # 🔧 SKIP FORMATTING FOR INDIVIDUAL SCANNERS
-        # Individual scanners are already perfectly structured and don't need parameter extraction
-        # Attempting to format them breaks their complex boolean logic
-
-        # Import the detection function
-        from uploaded_scanner_bypass import detect_scanner_type_simple
-
-        # Check if this is an individual scanner
-        scanner_type = detect_scanner_type_simple(request.original_code)
-        if scanner_type == "direct_execution":
-            # Check if it's an individual scanner (single pattern)
-            is_standalone_script = 'if __name__ == "__main__":' in request.original_code
-            pattern_lines = [line for line in request.original_code.split('\n') if 'df[\'lc_frontside' in line and '= (' in line]
-            actual_pattern_count = len(pattern_lines)
-
-            is_individual_scanner = (
-                'async def main(' in request.original_code and
-                not is_standalone_script and
-                actual_pattern_count == 1 and
-                (('df[\'lc_frontside_d3_extended_1\'] = ' in request.original_code) or
-                 ('df[\'lc_frontside_d2_extended\'] = ' in request.original_code) or
-                 ('df[\'lc_frontside_d2_extended_1\'] = ' in request.original_code))
-            )
+    logger.info("🚀 Applying formatting with %d approved parameters", len(request.approved_parameters))
 
-            if is_individual_scanner:
-                logger.info("🎯 INDIVIDUAL SCANNER DETECTED: Skipping formatting - file is already perfectly structured")
-                return ApplyFormattingResponse(
-                    formatted_code=request.original_code,  # Return unchanged
-                    success=True,
-                    message="Individual scanner detected - formatting bypassed to preserve syntax integrity",
-                    improvements=["Individual scanner file detected - no formatting needed",
-                                 "File is already perfectly structured for direct execution",
-                                 "Complex trading logic preserved without modification"],
-                    config_info={
-                        "scanner_type": "individual_lc_scanner",
-                        "requires_formatting": False,
-                        "pattern_count": actual_pattern_count,
-                        "execution_method": "direct"
-                    }
-                )
+    # 🔧 SKIP FORMATTING FOR INDIVIDUAL SCANNERS
+    # Individual scanners are already perfectly structured and don't need parameter extraction
+    # Attempting to format them breaks their complex boolean logic
 
-        # Generate formatted code with approved parameters (for other scanner types)
-        improvements = []
-        formatted_lines = []
-
-        # Start with original code
-        original_lines = request.original_code.split('\n')
-
-        # Create configuration section at the top
-        formatted_lines.append("# Scanner Configuration - User Adjustable Parameters")
-        formatted_lines.append("# Generated by Human-in-the-Loop Formatter")
-        formatted_lines.append("class ScannerConfig:")
-        formatted_lines.append("    \"\"\"User-configurable scanner parameters\"\"\"")
-
-        # Add approved parameters as config attributes
-        for param in request.approved_parameters:
-            param_name = param.get('name', 'unknown')
-            param_value = param.get('value', {})
-
-            if isinstance(param_value, dict) and 'min' in param_value and 'max' in param_value:
-                formatted_lines.append(f"    {param_name}_min = {param_value['min']}")
-                formatted_lines.append(f"    {param_name}_max = {param_value['max']}")
-                improvements.append(f"Configurable range for {param_name}")
-            elif isinstance(param_value, list):
-                formatted_lines.append(f"    {param_name} = {param_value}")
-                improvements.append(f"Configurable array for {param_name}")
-            else:
-                formatted_lines.append(f"    {param_name} = {json.dumps(param_value)}")
-                improvements.append(f"Configurable parameter {param_name}")
+    # Import the detection function
+    from uploaded_scanner_bypass import detect_scanner_type_simple
 
-        formatted_lines.append("")
-        formatted_lines.append("# Initialize configuration")
-        formatted_lines.append("config = ScannerConfig()")
-        formatted_lines.append("")
+    # Check if this is an individual scanner
+    scanner_type = detect_scanner_type_simple(request.original_code)
+    if scanner_type == "direct_execution":
+        # Check if it's an individual scanner (single pattern)
+        is_standalone_script = 'if __name__ == "__main__":' in request.original_code
+        actual_pattern_count = len(_LC_PATTERN_ASSIGNMENT_RE.findall(request.original_code))
 
-        # Add original code with parameter references updated
-        formatted_lines.extend(original_lines)
-
-        # Add usage instructions
-        formatted_lines.append("")
-        formatted_lines.append("# Usage Instructions:")
-        formatted_lines.append("# 1. Adjust parameters in the ScannerConfig class above")
-        formatted_lines.append("# 2. Run the scanner normally")
-        formatted_lines.append(f"# 3. {len(request.approved_parameters)} parameters are now user-configurable")
-
-        formatted_code = '\n'.join(formatted_lines)
-
-        logger.info(f"✅ Formatting applied successfully with {len(improvements)} improvements")
-
-        return ApplyFormattingResponse(
-            formatted_code=formatted_code,
-            success=True,
-            message=f"Successfully formatted scanner with {len(request.approved_parameters)} configurable parameters",
-            improvements=improvements
+        is_individual_scanner = (
+            'async def main(' in request.original_code and
+            not is_standalone_script and
+            actual_pattern_count == 1 and
+            _INDIVIDUAL_SCANNER_MARKER_RE.search(request.original_code) is not None
         )
 
-    except Exception as e:
-        logger.error(f"❌ Formatting failed: {e}")
+        if is_individual_scanner:
+            logger.info("🎯 INDIVIDUAL SCANNER DETECTED: Skipping formatting - file is already perfectly structured")
+            # Copy the prebuilt template instead of re-validating every field
+            return _INDIVIDUAL_TEMPLATE.model_copy(update={
+                "formatted_code": request.original_code,  # Return unchanged
+                "config_info": {**_INDIVIDUAL_TEMPLATE.config_info, "pattern_count": actual_pattern_count}
+            })
+
+    # Generate formatted code with approved parameters (for other scanner types)
+    # Only parameter coercion is expected to fail (unserialisable values);
+    # anything else is a bug and is left to FastAPI's 500 handling
+    try:
+        frozen_parameters = freeze_parameters(request.approved_parameters)
+        if len(request.original_code) > _FORMAT_OFFLOAD_THRESHOLD:
+            # Large scanners are formatted in the default thread pool so the
+            # event loop keeps serving other requests meanwhile
+            formatted_code, improvements = await asyncio.get_running_loop().run_in_executor(
+                None, _format_scanner, request.original_code, frozen_parameters
+            )
+        else:
+            formatted_code, improvements = _format_scanner(request.original_code, frozen_parameters)
+    except (TypeError, ValueError) as e:
+        logger.error("❌ Formatting failed: %s", e)
         return ApplyFormattingResponse(
             formatted_code=request.original_code,
             success=False,
@@ -5160,74 +5237,99 @@ async def apply_formatting(request: ApplyFormattingRequest):
             improvements=[]
         )
 
+    logger.info("✅ Formatting applied successfully with %d improvements", len(improvements))
+
+    # Pre-encode the success payload: skips pydantic re-validation of the
+    # (potentially very large) formatted_code and the stdlib JSON encoder
+    return Response(
+        content=orjson.dumps({
+            "formatted_code": formatted_code,
+            "success": True,
+            "message": f"Successfully formatted scanner with {len(request.approved_parameters)} configurable parameters",
+            "improvements": improvements
+        }),
+        media_type="application/json"
+    )
+
+# The capabilities payload is static: encode it once and let clients
+# (and any CDN in front of the API) revalidate with the ETag
+_FORMATTING_CAPABILITIES = {
+    "system_name": "Human-in-the-Loop Scanner Formatter",
+    "version": "1.0.0",
+    "capabilities": {
+        "intelligent_parameter_extraction": {
+            "ai_powered": True,
+            "confidence_scoring": True,
+            "human_readable_descriptions": True,
+            "supported_types": ["filter", "config", "threshold", "unknown"]
+        },
+        "collaborative_formatting": {
+            "step_by_step_process": True,
+            "user_approval_required": True,
+            "real_time_preview": True,
+            "undo_support": True
+        },
+        "learning_system": {
+            "user_feedback_learning": True,
+            "personalized_suggestions": True,
+            "historical_analysis": True,
+            "preference_adaptation": True
+        },
+        "scanner_support": {
+            "lc_scanners": True,
+            "a_plus_scanners": True,
+            "async_scanners": True,
+            "custom_scanners": True,
+            "multi_language": False  # Currently Python only
+        }
+    },
+    "process_steps": [
+        {
+            "id": "parameter_discovery",
+            "name": "Parameter Discovery",
+            "description": "AI identifies and categorizes parameters with confidence scores"
+        },
+        {
+            "id": "infrastructure_enhancement",
+            "name": "Infrastructure Enhancement",
+            "description": "Add production-grade features like async patterns and error handling"
+        },
+        {
+            "id": "optimization",
+            "name": "Performance Optimization",
+            "description": "Apply performance improvements while preserving functionality"
+        },
+        {
+            "id": "validation",
+            "name": "Validation & Preview",
+            "description": "Final validation and preview of enhanced scanner"
+        }
+    ],
+    "philosophy": "Templates guide, don't constrain. User has final authority on all decisions.",
+    "learning_features": [
+        "Parameter confirmation patterns",
+        "Step approval preferences",
+        "Enhancement selection history",
+        "Quality feedback integration"
+    ]
+}
+
+_CAPABILITIES_BYTES = orjson.dumps(_FORMATTING_CAPABILITIES)
+_CAPS_ETAG = f'"{hashlib.md5(_CAPABILITIES_BYTES).hexdigest()}"'
+_CAPS_HEADERS = {"ETag": _CAPS_ETAG, "Cache-Control": "public, max-age=3600"}
+
 @app.get("/api/format/capabilities")
-async def formatting_capabilities():
+async def formatting_capabilities(request: Request):
     """
     📊 Get Human-in-the-Loop Formatting Capabilities
 
     Return information about the collaborative formatting system's
     capabilities and features.
     """
-    return {
-        "system_name": "Human-in-the-Loop Scanner Formatter",
-        "version": "1.0.0",
-        "capabilities": {
-            "intelligent_parameter_extraction": {
-                "ai_powered": True,
-                "confidence_scoring": True,
-                "human_readable_descriptions": True,
-                "supported_types": ["filter", "config", "threshold", "unknown"]
-            },
-            "collaborative_formatting": {
-                "step_by_step_process": True,
-                "user_approval_required": True,
-                "real_time_preview": True,
-                "undo_support": True
-            },
-            "learning_system": {
-                "user_feedback_learning": True,
-                "personalized_suggestions": True,
-                "historical_analysis": True,
-                "preference_adaptation": True
-            },
-            "scanner_support": {
-                "lc_scanners": True,
-                "a_plus_scanners": True,
-                "async_scanners": True,
-                "custom_scanners": True,
-                "multi_language": False  # Currently Python only
-            }
-        },
-        "process_steps": [
-            {
-                "id": "parameter_discovery",
-                "name": "Parameter Discovery",
-                "description": "AI identifies and categorizes parameters with confidence scores"
-            },
-            {
-                "id": "infrastructure_enhancement",
-                "name": "Infrastructure Enhancement",
-                "description": "Add production-grade features like async patterns and error handling"
-            },
-            {
-                "id": "optimization",
-                "name": "Performance Optimization",
-                "description": "Apply performance improvements while preserving functionality"
-            },
-            {
-                "id": "validation",
-                "name": "Validation & Preview",
-                "description": "Final validation and preview of enhanced scanner"
-            }
-        ],
-        "philosophy": "Templates guide, don't constrain. User has final authority on all decisions.",
-        "learning_features": [
-            "Parameter confirmation patterns",
-            "Step approval preferences",
-            "Enhancement selection history",
-            "Quality feedback integration"
-        ]
-    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or _CAPS_ETAG in if_none_match):
+        return Response(status_code=304, headers=_CAPS_HEADERS)
+    return Response(content=_CAPABILITIES_BYTES, media_type="application/json", headers=_CAPS_HEADERS)
 
 # httpx already imported at top of file
 
@@ -5265,42 +5367,212 @@ class ProjectResponse(BaseModel):
     code: Optional[str] = None
     function_name: Optional[str] = None
 
-@app.post("/api/projects", response_model=ProjectResponse)
-async def create_project(project_data: ProjectCreate):
+def _dump_json(obj: Any) -> bytes:
+    """Serialize a project/parameter config the way it is stored on disk"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+
+def _write_fd(fd: int, data: bytes, mode: Optional[int] = None) -> None:
+    """Write all of data to fd with raw os.write calls (after chmod to mode, if given), then close it"""
+    try:
+        if mode is not None:
+            os.fchmod(fd, mode)
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+    finally:
+        os.close(fd)
+
+def _write_bytes(path, data: bytes) -> None:
+    """Write already-encoded bytes with raw os.write calls, bypassing Python's buffered text IO"""
+    _write_fd(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644), data)
+
+def _write_bytes_atomic(path, data: bytes) -> None:
+    """
+    Write to a unique sibling temp file and os.replace it over path.
+
+    Readers never see a partial file, and concurrent saves of the same
+    path (asyncio.to_thread workers) each get their own temp file.
+    """
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        _write_fd(fd, data, 0o644)  # mkstemp creates 0600
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+def _write_scanner(path, code_text: str) -> None:
+    """Persist scanner source (run later from source by scanner_runner, never imported)"""
+    _write_bytes(path, code_text.encode('utf-8'))
+
+# Blocking filesystem helpers. The async project handlers run these through
+# asyncio.to_thread so disk latency never stalls the event loop.
+def _load_config_sync(path) -> Dict:
+    """Read and parse a JSON config file"""
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+def _save_config_sync(path, config: Dict) -> None:
+    """Encode a config and atomically replace the file on disk"""
+    _write_bytes_atomic(path, _dump_json(config))
+
+def _rmtree_sync(path) -> None:
+    """Recursively delete a directory tree, ignoring files that vanish underneath"""
+    shutil.rmtree(path, ignore_errors=True)
+
+# Parsed project.config.json files keyed by project directory name,
+# revalidated against the file's mtime on every listing
+_PROJECT_CONFIG_CACHE: Dict[str, tuple] = {}
+_PROJECT_CONFIG_CACHE_LOCK = threading.Lock()
+
+def _load_project_config_cached(project_key: str, config_file) -> tuple:
+    """
+    Return (mtime_ns, parsed project config), re-reading it only when its mtime changed.
+
+    The returned dict is shared with the cache and must not be mutated.
+    Raises FileNotFoundError if the config file does not exist.
+    """
+    mtime_ns = os.stat(config_file).st_mtime_ns
+    with _PROJECT_CONFIG_CACHE_LOCK:
+        cached = _PROJECT_CONFIG_CACHE.get(project_key)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached
+
+    with open(config_file, 'rb') as f:
+        config = orjson.loads(f.read())
+    entry = (mtime_ns, config)
+    with _PROJECT_CONFIG_CACHE_LOCK:
+        _PROJECT_CONFIG_CACHE[project_key] = entry
+    return entry
+
+# Pre-serialized /api/projects listing: (monotonic time built, JSON bytes)
+_PROJECT_LIST_TTL = 1.0
+_project_list_buffer: Optional[tuple] = None
+
+def _invalidate_project_list() -> None:
+    """Drop the pre-serialized listing after any project write"""
+    global _project_list_buffer
+    _project_list_buffer = None
+
+def _evict_project_configs(live_keys: set) -> None:
+    """Drop cached configs for projects that no longer exist"""
+    with _PROJECT_CONFIG_CACHE_LOCK:
+        for key in [k for k in _PROJECT_CONFIG_CACHE if k not in live_keys]:
+            del _PROJECT_CONFIG_CACHE[key]
+
+# In-flight background deletions; held here so the tasks aren't garbage collected mid-run
+_BACKGROUND_DELETES: set = set()
+
+def _move_to_trash_sync(projects_dir: Path, project_path: Path) -> Path:
+    """Rename a project directory into projects/.trash/{uuid} and return its new path"""
+    trash_dir = projects_dir / ".trash"
+    trash_dir.mkdir(exist_ok=True)
+    trash_path = trash_dir / uuid.uuid4().hex
+    os.rename(project_path, trash_path)
+    return trash_path
+
+async def _trash_project(projects_dir: Path, project_path: Path) -> asyncio.Task:
+    """
+    Detach a project from projects/ with a single rename and delete it in the background.
+
+    The directory moves to projects/.trash/{uuid} (same filesystem, so the
+    rename is atomic) and the O(files) rmtree runs in a worker thread.
+    """
+    trash_path = await asyncio.to_thread(_move_to_trash_sync, projects_dir, project_path)
+    task = asyncio.create_task(asyncio.to_thread(_rmtree_sync, trash_path))
+    _BACKGROUND_DELETES.add(task)
+    task.add_done_callback(_BACKGROUND_DELETES.discard)
+    return task
+
+# Shared pool for fanning out project config reads in list_projects
+_PROJECT_LOAD_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="project-config")
+
+def _load_project_summary(entry: os.DirEntry) -> Optional[tuple]:
+    """
+    Build the sidebar summary for one project directory, or None if it has no readable config.
+
+    Returns (config mtime_ns, summary). The summary is a plain dict with the
+    ProjectResponse fields; the list path skips model construction since the
+    payload goes straight to orjson.
+    """
+    # Plain string join: this runs once per project on every listing
+    config_file = os.path.join(entry.path, "project.config.json")
+    try:
+        mtime_ns, config = _load_project_config_cached(entry.name, config_file)
+
+        # Extract scanner names for display
+        scanners = config.get("scanners", [])
+        scanner_names = [s.get("scanner_name", "Unknown Scanner") for s in scanners]
+
+        return mtime_ns, {
+            "id": config.get("project_id", entry.name),
+            "name": config.get("name", "Unknown Project"),
+            "description": config.get("description", ""),
+            "aggregation_method": config.get("aggregation_method", "union"),
+            "tags": config.get("tags", []),
+            "scanner_count": len(scanners),
+            "scanners": scanner_names,  # Add scanner names
+            "created_at": config.get("created_at", ""),
+            "updated_at": config.get("updated_at", ""),
+            "last_executed": config.get("last_executed"),
+            "execution_count": config.get("execution_count", 0),
+            "code": None,  # Don't include code in list
+            "function_name": config.get("function_name")
+        }
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to load project config {config_file}: {e}")
+        return None
+
+def _create_project_sync(project_dir: Path, code: Optional[str], config: Dict) -> None:
+    """Lay out a new project directory on disk"""
+    project_dir.mkdir(parents=True, exist_ok=True)
+    (project_dir / "parameters").mkdir(exist_ok=True)
+    if code:
+        _write_scanner(project_dir / "scanner.py", code)
+    _save_config_sync(project_dir / "project.config.json", config)
+
+@app.post(
+    "/api/projects",
+    response_model=ProjectResponse,
+    openapi_extra={"requestBody": {"content": {"application/json": {"schema": ProjectCreate.model_json_schema()}}, "required": True}},
+)
+async def create_project(request: Request):
     """
     📁 Create a new project from uploaded scanner
 
     This endpoint creates a new project when a scanner is successfully
     formatted and uploaded through Renata AI.
     """
+    # Validate straight from the raw body with pydantic-core's JSON parser
+    # (no intermediate dict), same 422 shape as a typed body parameter
+    try:
+        project_data = ProjectCreate.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError([{**err, "loc": ("body", *err["loc"])} for err in e.errors()])
+
     try:
         # Generate unique project ID
         project_id = str(uuid.uuid4())
 
-        # Create project directory (working directory is edge-dev-main/)
+        # Project directory (working directory is edge-dev-main/)
         project_dir = Path(f"projects/{project_id}")
-        project_dir.mkdir(parents=True, exist_ok=True)
-
-        # Create parameters directory
-        (project_dir / "parameters").mkdir(exist_ok=True)
-
-        # Save scanner code if provided
-        code_file_path = None
-        if project_data.code:
-            code_file_path = project_dir / "scanner.py"
-            with open(code_file_path, 'w') as f:
-                f.write(project_data.code)
-            logger.info(f"💾 Saved scanner code to {code_file_path}")
 
         # Create project config
+        now_iso = datetime.now().isoformat()
         config = {
             "project_id": project_id,
             "name": project_data.name,
             "description": project_data.description,
             "scanners": [],  # Will be populated when scanners are added
             "aggregation_method": project_data.aggregation_method,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat(),
+            "created_at": now_iso,
+            "updated_at": now_iso,
             "version": 1,
             "tags": project_data.tags,
             "created_by": "renata-ai-upload",
@@ -5310,32 +5582,71 @@ async def create_project(project_data: ProjectCreate):
             "has_code": bool(project_data.code)
         }
 
-        # Save config file
-        config_path = project_dir / "project.config.json"
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
+        # Create the directories, scanner code (if provided) and config file
+        await asyncio.to_thread(_create_project_sync, project_dir, project_data.code, config)
+        if project_data.code:
+            logger.info(f"💾 Saved scanner code to {project_dir / 'scanner.py'}")
 
+        _invalidate_project_list()
         logger.info(f"✅ Created project {project_id}: {project_data.name}")
 
-        return ProjectResponse(
-            id=project_id,
-            name=project_data.name,
-            description=project_data.description,
-            aggregation_method=project_data.aggregation_method,
-            tags=project_data.tags,
-            scanner_count=0,
-            created_at=config["created_at"],
-            updated_at=config["updated_at"],
-            last_executed=None,
-            execution_count=0,
-            code=project_data.code,  # Include code in response
-            function_name=project_data.function_name
-        )
+        # Fields match ProjectResponse; encoded directly rather than re-validated
+        return Response(content=orjson.dumps({
+            "id": project_id,
+            "name": project_data.name,
+            "description": project_data.description,
+            "aggregation_method": project_data.aggregation_method,
+            "tags": project_data.tags,
+            "scanner_count": 0,
+            "scanners": [],
+            "created_at": config["created_at"],
+            "updated_at": config["updated_at"],
+            "last_executed": None,
+            "execution_count": 0,
+            "code": project_data.code,  # Include code in response
+            "function_name": project_data.function_name
+        }), media_type="application/json")
 
     except Exception as e:
         logger.error(f"❌ Failed to create project: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to create project: {str(e)}")
 
+def _load_project_detail_sync(project_path: Path) -> tuple:
+    """
+    Read a project's config and scanner.py (None if the project has no code).
+
+    Opens the files directly instead of stat-ing them first; raises
+    FileNotFoundError when the project or its config doesn't exist.
+    """
+    config = _load_config_sync(project_path / "project.config.json")
+    try:
+        with open(project_path / "scanner.py", 'r') as f:
+            raw_code = f.read()
+    except FileNotFoundError:
+        raw_code = None
+    return config, raw_code
+
+def _list_project_summaries_sync(projects_dir: Path) -> List[Dict[str, Any]]:
+    """Load the summary of every project directory under projects_dir, most recently updated first"""
+    # scandir's DirEntry caches d_type from the directory read, so no
+    # per-entry stat is needed to skip non-directories
+    with os.scandir(projects_dir) as it:
+        entries = [
+            entry for entry in it
+            if entry.is_dir(follow_symlinks=False) and not entry.name.startswith(".")
+        ]
+    seen = {entry.name for entry in entries}
+
+    # Overlap the per-project stat/open latency across a shared pool
+    projects = [p for p in _PROJECT_LOAD_EXECUTOR.map(_load_project_summary, entries) if p is not None]
+
+    _evict_project_configs(seen)
+
+    # Sort by most recent. The config is rewritten on every project update,
+    # so its mtime tracks updated_at and compares as a plain int
+    projects.sort(key=itemgetter(0), reverse=True)
+    return [summary for _, summary in projects]
+
 @app.get("/api/projects")
 async def list_projects(id: Optional[str] = None):
     """
@@ -5344,33 +5655,23 @@ async def list_projects(id: Optional[str] = None):
     - Without id: Returns all projects (without code for performance)
     - With id: Returns single project with full code
     """
+    global _project_list_buffer
     try:
         # Working directory is edge-dev-main/, so projects/ is at projects/
         projects_dir = Path("projects")
 
-        if not projects_dir.exists():
-            return [] if not id else None
-
         # If id is provided, return single project with code
         if id:
-            project_path = projects_dir / id
-            config_file = project_path / "project.config.json"
-
-            if not project_path.exists() or not config_file.exists():
+            try:
+                config, raw_code = await asyncio.to_thread(_load_project_detail_sync, projects_dir / id)
+            except FileNotFoundError:
                 raise HTTPException(status_code=404, detail=f"Project {id} not found")
 
-            with open(config_file, 'r') as f:
-                config = json.load(f)
-
-            # Load code from scanner.py if it exists
             code = None
             function_name = config.get("function_name", "scan_function")
-            scanner_file = project_path / "scanner.py"
-            if scanner_file.exists():
-                with open(scanner_file, 'r') as f:
-                    raw_code = f.read()
+            if raw_code is not None:
                 # CRITICAL: Strip any thinking text before returning
-                code = strip_thinking_text_from_code(raw_code)
+                code = _strip_thinking_text_cached(raw_code)
                 logger.info(f"📄 Loaded code for project {id}: {len(code)} characters (stripped thinking)")
 
             return {
@@ -5392,42 +5693,20 @@ async def list_projects(id: Optional[str] = None):
             }
 
         # Otherwise, return list without code (for sidebar performance)
-        projects = []
-        for project_path in projects_dir.iterdir():
-            if project_path.is_dir():
-                config_file = project_path / "project.config.json"
-                if config_file.exists():
-                    try:
-                        with open(config_file, 'r') as f:
-                            config = json.load(f)
-
-                        # Extract scanner names for display
-                        scanners = config.get("scanners", [])
-                        scanner_names = [s.get("scanner_name", "Unknown Scanner") for s in scanners]
-
-                        projects.append(ProjectResponse(
-                            id=config.get("project_id", project_path.name),
-                            name=config.get("name", "Unknown Project"),
-                            description=config.get("description", ""),
-                            aggregation_method=config.get("aggregation_method", "union"),
-                            tags=config.get("tags", []),
-                            scanner_count=len(scanners),
-                            scanners=scanner_names,  # Add scanner names
-                            created_at=config.get("created_at", ""),
-                            updated_at=config.get("updated_at", ""),
-                            last_executed=config.get("last_executed"),
-                            execution_count=config.get("execution_count", 0),
-                            code=None,  # Don't include code in list
-                            function_name=config.get("function_name")
-                        ))
-                    except Exception as e:
-                        logger.warning(f"⚠️ Failed to load project config {config_file}: {e}")
+        if not projects_dir.exists():
+            return []
+
+        # Polling sidebars within the TTL get the last rendered buffer as-is
+        buffer = _project_list_buffer
+        if buffer is not None and time.monotonic() - buffer[0] < _PROJECT_LIST_TTL:
+            return Response(content=buffer[1], media_type="application/json")
 
-        # Sort by most recent
-        projects.sort(key=lambda p: p.updated_at, reverse=True)
+        projects = await asyncio.to_thread(_list_project_summaries_sync, projects_dir)
 
         logger.info(f"📁 Listed {len(projects)} projects")
-        return projects
+        body = orjson.dumps(projects)
+        _project_list_buffer = (time.monotonic(), body)
+        return Response(content=body, media_type="application/json")
 
     except HTTPException:
         raise
@@ -5455,9 +5734,9 @@ async def delete_project(id: str):
             logger.info(f"🗑️ Project {id} not found, considering it deleted")
             return {"success": True, "message": "Project deleted (or never existed)"}
 
-        # Delete the project directory
-        import shutil
-        shutil.rmtree(project_path)
+        # Move the project out of the way now, remove its files in the background
+        await _trash_project(projects_dir, project_path)
+        _invalidate_project_list()
 
         logger.info(f"✅ Deleted project {id}")
         return {"success": True, "message": f"Project {id} deleted successfully"}
@@ -5468,6 +5747,75 @@ async def delete_project(id: str):
         logger.error(f"❌ Failed to delete project: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to delete project: {str(e)}")
 
+def _save_scanner_sync(project_path: Path, project_id: str, scanner_id: str,
+                       scanner_name: str, clean_code: str) -> bool:
+    """
+    Write a scanner into a project and register it in project.config.json.
+
+    Returns False when nothing changed on disk (identical re-save).
+    """
+    # Create scanners directory if it doesn't exist
+    scanners_dir = project_path / "scanners"
+    scanners_dir.mkdir(exist_ok=True)
+
+    # Save CLEAN scanner code to file (skipped when identical to what's on disk)
+    scanner_file = scanners_dir / f"{scanner_name}.py"
+    try:
+        with open(scanner_file, 'r', encoding='utf-8') as f:
+            code_changed = f.read() != clean_code
+    except (FileNotFoundError, UnicodeDecodeError):
+        code_changed = True
+    if code_changed:
+        _write_scanner(scanner_file, clean_code)
+
+    # Update project config
+    now_iso = datetime.now().isoformat()
+    config_file = project_path / "project.config.json"
+    old_bytes = None
+    if config_file.exists():
+        with open(config_file, 'rb') as f:
+            old_bytes = f.read()
+        config = orjson.loads(old_bytes)
+    else:
+        config = {
+            "project_id": project_id,
+            "name": project_id.replace('-', ' ').title(),
+            "description": "",
+            "aggregation_method": "union",
+            "tags": [],
+            "scanners": [],
+            "created_at": now_iso,
+            "updated_at": now_iso,
+            "status": "active"
+        }
+
+    # Add scanner to config if not already there
+    scanner_ref = {
+        "scanner_id": scanner_id,
+        "scanner_name": scanner_name,
+        "scanner_file": f"scanners/{scanner_name}.py",
+        "enabled": True,
+        "weight": 1.0,
+        "order_index": len(config.get("scanners", []))
+    }
+
+    config["scanners"] = config.get("scanners", [])
+    already_listed = any(
+        s.get("scanner_id") == scanner_id and s.get("scanner_file") == scanner_ref["scanner_file"]
+        for s in config["scanners"]
+    )
+    if not already_listed:
+        config["scanners"].append(scanner_ref)
+    if code_changed or not already_listed:
+        config["updated_at"] = now_iso
+
+    # Save updated config, unless re-saving an identical scanner left it unchanged
+    new_bytes = _dump_json(config)
+    if new_bytes == old_bytes:
+        return False
+    _write_bytes_atomic(config_file, new_bytes)
+    return True
+
 @app.post("/api/save-scanner")
 async def save_scanner_to_project(request: dict):
     """
@@ -5485,7 +5833,7 @@ async def save_scanner_to_project(request: dict):
             raise HTTPException(status_code=400, detail="Missing required fields")
 
         # CRITICAL: Strip any thinking text before saving
-        clean_code = strip_thinking_text_from_code(scanner_code)
+        clean_code = _strip_thinking_text_cached(scanner_code)
         if len(clean_code) != len(scanner_code):
             logger.info(f"🧹 Stripped {len(scanner_code) - len(clean_code)} chars from scanner code before saving")
 
@@ -5496,52 +5844,14 @@ async def save_scanner_to_project(request: dict):
         if not project_path.exists():
             raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
 
-        # Create scanners directory if it doesn't exist
-        scanners_dir = project_path / "scanners"
-        scanners_dir.mkdir(exist_ok=True)
-
-        # Save CLEAN scanner code to file
-        scanner_file = scanners_dir / f"{scanner_name}.py"
-        with open(scanner_file, 'w') as f:
-            f.write(clean_code)
-
-        # Update project config
-        config_file = project_path / "project.config.json"
-        if config_file.exists():
-            with open(config_file, 'r') as f:
-                config = json.load(f)
+        saved = await asyncio.to_thread(
+            _save_scanner_sync, project_path, project_id, scanner_id, scanner_name, clean_code
+        )
+        if saved:
+            _invalidate_project_list()
+            logger.info(f"✅ Saved scanner {scanner_name} to project {project_id}")
         else:
-            config = {
-                "project_id": project_id,
-                "name": project_id.replace('-', ' ').title(),
-                "description": "",
-                "aggregation_method": "union",
-                "tags": [],
-                "scanners": [],
-                "created_at": datetime.now().isoformat(),
-                "updated_at": datetime.now().isoformat(),
-                "status": "active"
-            }
-
-        # Add scanner to config if not already there
-        scanner_ref = {
-            "scanner_id": scanner_id,
-            "scanner_name": scanner_name,
-            "scanner_file": f"scanners/{scanner_name}.py",
-            "enabled": True,
-            "weight": 1.0,
-            "order_index": len(config.get("scanners", []))
-        }
-
-        config["scanners"] = config.get("scanners", [])
-        config["scanners"].append(scanner_ref)
-        config["updated_at"] = datetime.now().isoformat()
-
-        # Save updated config
-        with open(config_file, 'w') as f:
-            json.dump(config, f, indent=2)
-
-        logger.info(f"✅ Saved scanner {scanner_name} to project {project_id}")
+            logger.info(f"✅ Scanner {scanner_name} already up to date in project {project_id}")
 
         return {
             "success": True,
@@ -5557,6 +5867,12 @@ async def save_scanner_to_project(request: dict):
         logger.error(f"❌ Failed to save scanner: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to save scanner: {str(e)}")
 
+def _make_project_dirs_sync(project_dir: Path) -> None:
+    """Create a project directory with its scanners/ and parameters/ subdirectories"""
+    project_dir.mkdir(parents=True, exist_ok=True)
+    (project_dir / "scanners").mkdir(exist_ok=True)
+    (project_dir / "parameters").mkdir(exist_ok=True)
+
 # 🔧 RENATA FORMAT SCAN ENDPOINT - ENHANCED WITH PROJECT CREATION
 @app.post("/api/format-scan")
 async def format_scan_renata(scanFile: UploadFile = File(...), formatterType: str = Form("edge"), message: str = Form("")):
@@ -5582,8 +5898,9 @@ async def format_scan_renata(scanFile: UploadFile = File(...), formatterType: st
             # Fallback to utf-8 with error handling for emoji/special characters
             file_content = content.decode('utf-8', errors='replace')
 
-        # Initialize response data
-        stats = {"lines": len(file_content.split('\n')), "parameters": "N/A", "validation": "Passed"}
+        # Initialize response data (count, not split: no list of line strings for big uploads)
+        lines = file_content.count('\n') + (0 if file_content.endswith('\n') else 1)
+        stats = {"lines": lines, "parameters": "N/A", "validation": "Passed"}
         changes = []
 
         try:
@@ -5678,6 +5995,12 @@ import pandas_market_calendars as mcal
                 project_id = str(uuid.uuid4())
                 project_name = f"{scanFile.filename.replace('.py', '')}"
 
+                # Lay out the project directories once, up front
+                project_dir = project_manager.get_project_directory(project_id)
+                await asyncio.to_thread(_make_project_dirs_sync, project_dir)
+                scanners_dir = os.path.join(project_dir, "scanners")
+                parameters_dir = os.path.join(project_dir, "parameters")
+
                 # Create scanner references and save scanner files
                 scanner_references = []
                 for i, scanner in enumerate(scanners):
@@ -5687,22 +6010,16 @@ import pandas_market_calendars as mcal
 
                     # Create scanner file
                     scanner_filename = f"{scanner_id}.py"
-                    project_dir = project_manager.get_project_directory(project_id)
-                    project_dir.mkdir(parents=True, exist_ok=True)
-                    scanner_file_path = project_dir / "scanners" / scanner_filename
-                    scanner_file_path.parent.mkdir(exist_ok=True)
+                    scanner_file_path = os.path.join(scanners_dir, scanner_filename)
 
-                    with open(scanner_file_path, 'w') as f:
-                        f.write(scanner_code)
+                    await asyncio.to_thread(_write_scanner, scanner_file_path, scanner_code)
 
                     # Create parameter file
                     param_filename = f"{scanner_id}_params.json"
-                    parameter_file_path = project_dir / "parameters" / param_filename
-                    parameter_file_path.parent.mkdir(exist_ok=True)
+                    parameter_file_path = os.path.join(parameters_dir, param_filename)
 
                     # Save parameters - convert list to dictionary format for parameter manager
                     parameters_list = scanner.get('parameters', [])
-                    import json
 
                     # Convert parameter list to dictionary format expected by parameter manager
                     parameters_dict = {}
@@ -5713,8 +6030,7 @@ import pandas_market_calendars as mcal
                             # Simple string parameter
                             parameters_dict[param] = param
 
-                    with open(parameter_file_path, 'w') as f:
-                        json.dump(parameters_dict, f, indent=2)
+                    await asyncio.to_thread(_save_config_sync, parameter_file_path, parameters_dict)
 
                     # Create scanner reference
                     scanner_ref = ScannerReference(
@@ -5741,10 +6057,9 @@ import pandas_market_calendars as mcal
                 )
 
                 # Save project configuration directly (bypassing ProjectManager.create_project issues)
-                import json
                 config_path = project_dir / "project.config.json"
 
-                # Convert ProjectConfig to dict and save directly
+                # Convert ProjectConfig to dict and save directly (orjson encodes datetimes natively)
                 project_dict = {
                     "project_id": project_config.project_id,
                     "name": project_config.name,
@@ -5761,17 +6076,17 @@ import pandas_market_calendars as mcal
                     ],
                     "aggregation_method": project_config.aggregation_method.value if hasattr(project_config.aggregation_method, 'value') else project_config.aggregation_method,
                     "tags": project_config.tags,
-                    "created_at": project_config.created_at.isoformat(),
-                    "updated_at": project_config.updated_at.isoformat(),
+                    "created_at": project_config.created_at,
+                    "updated_at": project_config.updated_at,
                     "version": project_config.version,
                     "created_by": project_config.created_by,
-                    "last_executed": project_config.last_executed.isoformat() if project_config.last_executed else None,
+                    "last_executed": project_config.last_executed,
                     "execution_count": project_config.execution_count
                 }
 
-                with open(config_path, 'w') as f:
-                    json.dump(project_dict, f, indent=2)
+                await asyncio.to_thread(_save_config_sync, config_path, project_dict)
 
+                _invalidate_project_list()
                 logger.info(f"✅ Project created with ID: {project_id}, scanners: {len(scanner_references)}")
                 logger.info(f"📁 Project saved to: {config_path}")
                 logger.info(f"📊 Scanner files: {[str(s.scanner_file) for s in scanner_references]}")
@@ -5839,7 +6154,7 @@ import pandas_market_calendars as mcal
                 "formatted_code": formatted_code,
                 "changes": changes,
                 "stats": {
-                    "lines": len(file_content.split('\n')),
+                    "lines": lines,
                     "scanners_generated": len(scanners),
                     "parameters": "AI-Optimized",
                     "validation": "Passed",
@@ -5973,6 +6288,122 @@ class ProjectExecutionResponse(BaseModel):
     results: Optional[List[Dict]] = []
     total_found: Optional[int] = 0
 
+def _result_default(obj: Any) -> Any:
+    """orjson fallback for scanner result values (pandas Timestamps, dates, numpy scalars)"""
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    if hasattr(obj, "item"):
+        return obj.item()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def _results_response(content: Dict[str, Any]) -> Response:
+    """
+    JSON response for payloads carrying scanner results.
+
+    Result lists can run to thousands of rows; encoding them with orjson
+    directly skips per-row response-model validation and stdlib json.
+    NaN values come out as null instead of failing the response.
+    """
+    return Response(
+        content=orjson.dumps(
+            content,
+            default=_result_default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ),
+        media_type="application/json"
+    )
+
+def _make_progress_callback(scan_id: str):
+    """Progress callback for real-time updates; closes over scan_id only"""
+    async def progress_callback(progress: int, message: str):
+        scan = active_scans[scan_id]
+
+        # Enforce monotonic progress (never decrease)
+        current_progress = scan.get("progress_percent", 0)
+        validated_progress = max(current_progress, min(100, max(0, progress)))
+
+        # Update last_progress_update to prevent cleanup (cached per second)
+        scan["last_progress_update"] = progress_timestamp()
+
+        # A repeated tick changes nothing the client can see; stop here
+        if validated_progress == current_progress and message == scan.get("message"):
+            return
+        logger.debug(f"📊 Progress callback called: {scan_id} - {progress}% - {message}")
+
+        # Polled state is always the latest; the message coalesces latest-wins
+        scan["progress_percent"] = validated_progress
+        scan["message"] = message
+        scan["status"] = "running" if validated_progress < 100 else "completed"
+
+        # Throttle WebSocket frames: only when progress moved since the last
+        # frame, at most one per PROGRESS_EMIT_INTERVAL, but never hold back 100%
+        now = time.monotonic()
+        if validated_progress == scan.get("last_emitted_progress", 0) or (
+            validated_progress < 100
+            and now - scan.get("last_emit_ts", 0.0) < PROGRESS_EMIT_INTERVAL
+        ):
+            return
+        scan["last_emit_ts"] = now
+        scan["last_emitted_progress"] = validated_progress
+
+        # Send WebSocket update
+        await websocket_manager.send_progress(scan_id, validated_progress, message)
+
+        logger.info(f"✓ Scan {scan_id}: {validated_progress}% - {message} - WebSocket sent")
+
+    return progress_callback
+
+async def _run_scan_with_progress(scan_id: str, code: str, start_date: str, end_date: str):
+    """
+    Background task to run a project scan and send progress updates.
+
+    Module-level and fed only primitives, so a running scan doesn't keep the
+    request handler's frame (and the request) alive.
+    """
+    try:
+        logger.info(f"🔄 Background task started for {scan_id}")
+
+        # The source is passed in directly; don't keep a second copy in the
+        # scan's status entry for the scan's lifetime
+        active_scans[scan_id].pop("uploaded_code", None)
+
+        # Execute the scan with progress callback
+        logger.info(f"🎯 About to call execute_uploaded_scanner_direct for {scan_id}")
+        scan_results = await execute_uploaded_scanner_direct(
+            code=code,
+            start_date=start_date,
+            end_date=end_date,
+            progress_callback=_make_progress_callback(scan_id),
+            pure_execution_mode=True
+        )
+        logger.info(f"✅ execute_uploaded_scanner_direct completed for {scan_id}, results: {len(scan_results)}")
+
+        # Store results and mark as completed
+        active_scans[scan_id]["results"] = scan_results
+        active_scans[scan_id]["status"] = "completed"
+        active_scans[scan_id]["progress_percent"] = 100
+        active_scans[scan_id]["message"] = f"✅ Scan complete: {len(scan_results)} results"
+
+        # Send final WebSocket update
+        await websocket_manager.send_progress(scan_id, 100, f"✅ Scan complete: {len(scan_results)} results")
+
+        logger.info(f"✅ Background scan completed: {scan_id}, found {len(scan_results)} results")
+
+    except Exception as e:
+        logger.error(f"❌ Background scan failed: {scan_id}, error: {str(e)}")
+        active_scans[scan_id]["status"] = "failed"
+        active_scans[scan_id]["message"] = f"❌ Scan failed: {str(e)}"
+        active_scans[scan_id]["progress_percent"] = 0
+
+        # Send error WebSocket update
+        await websocket_manager.send_progress(scan_id, 0, f"❌ Scan failed: {str(e)}")
+
+# execute_project log line for the chosen code source, indexed by "is not formatted_code"
+_CODE_SOURCE_LOG = (
+    "✅ Using RENATA FORMATTED CODE (full market scan)",
+    "⚠️  Using original code (may have limited symbols)",
+)
+
 @app.post("/api/projects/{project_id}/execute", response_model=ProjectExecutionResponse)
 async def execute_project(project_id: str, request: ProjectExecutionRequest):
     """Execute a project by calling the scanner execution service with real-time progress updates"""
@@ -5982,19 +6413,19 @@ async def execute_project(project_id: str, request: ProjectExecutionRequest):
         # 🎯 CRITICAL FIX: Prefer formatted code (full market scan) over original code
         # Renata formats code to use multi-stage architecture with full market scanning
         # Check if formatted_code is provided and use it, otherwise fall back to original
-        scanner_code = (
-            request.formatted_code or  # PRIORITY 1: Renata's formatted code (full market)
-            request.scanner_code or      # PRIORITY 2: Scanner code from database
-            request.code or              # PRIORITY 3: Generic code field
-            request.uploaded_code or     # PRIORITY 4: Original uploaded code
-            ""
+        candidates = (
+            request.formatted_code,  # PRIORITY 1: Renata's formatted code (full market)
+            request.scanner_code,    # PRIORITY 2: Scanner code from database
+            request.code,            # PRIORITY 3: Generic code field
+            request.uploaded_code,   # PRIORITY 4: Original uploaded code
+        )
+        source_index, scanner_code = next(
+            ((i, c) for i, c in enumerate(candidates) if c), (None, "")
         )
 
         # Log which code source is being used
-        if request.formatted_code and len(request.formatted_code) > 0:
-            logger.info(f"✅ Using RENATA FORMATTED CODE (full market scan) - {len(request.formatted_code)} characters")
-        elif scanner_code:
-            logger.info(f"⚠️  Using original code (may have limited symbols) - {len(scanner_code)} characters")
+        if source_index is not None:
+            logger.info(f"{_CODE_SOURCE_LOG[source_index != 0]} - {len(scanner_code)} characters")
 
         if not scanner_code:
             raise HTTPException(
@@ -6015,86 +6446,29 @@ async def execute_project(project_id: str, request: ProjectExecutionRequest):
         scan_id = f"project_{project_id}_{int(time.time())}"
 
         # Initialize scan in active_scans for WebSocket progress tracking
+        created_at = datetime.now().isoformat()
         active_scans[scan_id] = {
             "scan_id": scan_id,
             "status": "running",
             "start_date": start_date,
             "end_date": end_date,
-            "created_at": datetime.now().isoformat(),
+            "created_at": created_at,
             "progress_percent": 0,
             "message": "Initializing scan...",
             "results": [],
             "uploaded_code": scanner_code,
             "scanner_type": "uploaded",
             "use_two_stage": False,
-            "last_progress_update": datetime.now().isoformat()
+            "last_progress_update": created_at
         }
 
         logger.info(f"🚀 Starting background scan with progress updates: {scan_id}")
 
-        # Run scan in background task with progress callback
-        async def run_scan_with_progress():
-            """Background task to run scan and send progress updates"""
-            try:
-                logger.info(f"🔄 Background task started for {scan_id}")
-
-                # Progress callback for real-time updates
-                async def progress_callback(progress: int, message: str):
-                    logger.info(f"📊 Progress callback called: {scan_id} - {progress}% - {message}")
-
-                    # Enforce monotonic progress (never decrease)
-                    current_progress = active_scans[scan_id].get("progress_percent", 0)
-                    validated_progress = max(current_progress, min(100, max(0, progress)))
-
-                    # Update last_progress_update to prevent cleanup
-                    active_scans[scan_id]["last_progress_update"] = datetime.now().isoformat()
-
-                    # Only update if changed to avoid unnecessary WebSocket traffic
-                    if validated_progress != current_progress:
-                        active_scans[scan_id]["progress_percent"] = validated_progress
-                        active_scans[scan_id]["message"] = message
-                        new_status = "running" if validated_progress < 100 else "completed"
-                        active_scans[scan_id]["status"] = new_status
-
-                        # Send WebSocket update
-                        await websocket_manager.send_progress(scan_id, validated_progress, message)
-
-                        logger.info(f"✓ Scan {scan_id}: {validated_progress}% - {message} - WebSocket sent")
-
-                # Execute the scan with progress callback
-                logger.info(f"🎯 About to call execute_uploaded_scanner_direct for {scan_id}")
-                scan_results = await execute_uploaded_scanner_direct(
-                    code=scanner_code,
-                    start_date=start_date,
-                    end_date=end_date,
-                    progress_callback=progress_callback,
-                    pure_execution_mode=True
-                )
-                logger.info(f"✅ execute_uploaded_scanner_direct completed for {scan_id}, results: {len(scan_results)}")
-
-                # Store results and mark as completed
-                active_scans[scan_id]["results"] = scan_results
-                active_scans[scan_id]["status"] = "completed"
-                active_scans[scan_id]["progress_percent"] = 100
-                active_scans[scan_id]["message"] = f"✅ Scan complete: {len(scan_results)} results"
-
-                # Send final WebSocket update
-                await websocket_manager.send_progress(scan_id, 100, f"✅ Scan complete: {len(scan_results)} results")
-
-                logger.info(f"✅ Background scan completed: {scan_id}, found {len(scan_results)} results")
-
-            except Exception as e:
-                logger.error(f"❌ Background scan failed: {scan_id}, error: {str(e)}")
-                active_scans[scan_id]["status"] = "failed"
-                active_scans[scan_id]["message"] = f"❌ Scan failed: {str(e)}"
-                active_scans[scan_id]["progress_percent"] = 0
-
-                # Send error WebSocket update
-                await websocket_manager.send_progress(scan_id, 0, f"❌ Scan failed: {str(e)}")
-
         # Start background task
         logger.info(f"🚀 Starting background task for scan: {scan_id}")
-        task = asyncio.create_task(run_scan_with_progress())
+        task = track_scan_task(
+            scan_id, asyncio.create_task(_run_scan_with_progress(scan_id, scanner_code, start_date, end_date))
+        )
         logger.info(f"✅ Background task created: {task}, scan_id: {scan_id}")
 
         # Return immediately with execution_id (scan runs in background)
@@ -6140,16 +6514,17 @@ async def get_project_execution_status(project_id: str, execution_id: Optional[s
             "total_found": 0
         })
 
-        return {
+        results = scan_status.get("results", [])
+        return _results_response({
             "success": True,
             "execution_id": status_id,
             "status": scan_status["status"],
             "progress_percent": scan_status.get("progress_percent", 0),
             "message": scan_status.get("message", "Unknown status"),
-            "results": scan_status.get("results", []),
-            "total_found": len(scan_status.get("results", [])),
+            "results": results,
+            "total_found": len(results),
             "timestamp": datetime.now().isoformat()
-        }
+        })
 
     except HTTPException:
         raise
@@ -6173,29 +6548,8 @@ class ChatResponse(BaseModel):
     model: Optional[str] = None
     usage: Optional[Dict[str, Any]] = None
 
-@app.post("/api/ai/chat", response_model=ChatResponse)
-async def ai_chat(request: ChatRequest):
-    """
-    🤖 AI Chat endpoint using OpenRouter API
-    Direct AI responses for code formatting and general assistance
-    """
-    try:
-        import httpx
-
-        # Use the existing AI scanner service which already has the API key
-        api_key = getattr(ai_scanner_service_fast, 'api_key', '')
-        if not api_key:
-            # Try environment variable as fallback
-            import os
-            api_key = os.getenv('OPENROUTER_API_KEY', '')
-
-        if not api_key:
-            raise HTTPException(status_code=500, detail="OpenRouter API key not configured")
-
-        base_url = 'https://openrouter.ai/api/v1'
-
-        # Comprehensive System Prompt for CE-Hub Scanner Formatting
-        system_prompt = f"""Transform the following Python code into a 2-stage trading scanner architecture.
+# Comprehensive System Prompt for CE-Hub Scanner Formatting
+CHAT_SYSTEM_PROMPT = """Transform the following Python code into a 2-stage trading scanner architecture.
 
 REQUIREMENTS:
 
@@ -6221,70 +6575,137 @@ Extract ALL parameters from input code. Preserve exact values.
 Output Python code only. Start with import statements.
 """
 
-        # DEBUG: Log what we're sending to the AI
-        logger.info(f"🔍 Sending to AI - message length: {len(request.message)} chars")
-        logger.info(f"🔍 Message preview: {request.message[:200]}...")
-
-        async with httpx.AsyncClient(timeout=180.0) as client:
-            response = await client.post(
-                f"{base_url}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                    "HTTP-Referer": "http://localhost:5665",
-                    "X-Title": "CE-Hub Trading Scanner"
+async def _open_chat_stream(message: str) -> "httpx.Response":
+    """
+    Start a streaming OpenRouter chat completion and return the open response.
+
+    The status is checked before returning, so callers only ever see a 200
+    whose body is the SSE event stream. The caller must aclose() it.
+    """
+    # Use the existing AI scanner service which already has the API key
+    api_key = getattr(ai_scanner_service_fast, 'api_key', '')
+    if not api_key:
+        # Try environment variable as fallback
+        api_key = os.getenv('OPENROUTER_API_KEY', '')
+
+    if not api_key:
+        raise HTTPException(status_code=500, detail="OpenRouter API key not configured")
+
+    # DEBUG: Log what we're sending to the AI
+    logger.info(f"🔍 Sending to AI - message length: {len(message)} chars")
+    logger.info(f"🔍 Message preview: {message[:200]}...")
+
+    client: httpx.AsyncClient = app.state.openrouter
+    upstream = client.build_request(
+        "POST",
+        "/chat/completions",
+        headers={
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "http://localhost:5665",
+            "X-Title": "CE-Hub Trading Scanner"
+        },
+        json={
+            "model": "qwen/qwen3-coder",
+            "messages": [
+                {
+                    "role": "system",
+                    "content": CHAT_SYSTEM_PROMPT
                 },
-                json={
-                    "model": "qwen/qwen3-coder",
-                    "messages": [
-                        {
-                            "role": "system",
-                            "content": system_prompt
-                        },
-                        {
-                            "role": "user",
-                            "content": request.message
-                        }
-                    ],
-                    "temperature": 0.1,
-                    "max_tokens": 32000
+                {
+                    "role": "user",
+                    "content": message
                 }
-            )
+            ],
+            "temperature": 0.1,
+            "max_tokens": 32000,
+            "stream": True
+        }
+    )
 
-            if response.status_code != 200:
-                logger.error(f"OpenRouter API error: {response.status_code} - {response.text}")
-                raise HTTPException(status_code=500, detail="AI service temporarily unavailable")
+    try:
+        response = await client.send(upstream, stream=True)
+    except httpx.TimeoutException:
+        logger.error("AI service timeout")
+        raise HTTPException(status_code=504, detail="AI service timeout")
+    except httpx.RequestError as e:
+        logger.error(f"AI service request error: {e}")
+        raise HTTPException(status_code=503, detail="AI service unavailable")
 
-            result = response.json()
+    if response.status_code != 200:
+        body = await response.aread()
+        await response.aclose()
+        logger.error(f"OpenRouter API error: {response.status_code} - {body.decode('utf-8', errors='replace')}")
+        raise HTTPException(status_code=500, detail="AI service temporarily unavailable")
 
-            if not result.get("choices") or not result["choices"][0].get("message"):
-                raise HTTPException(status_code=500, detail="Invalid response from AI service")
+    return response
 
-            ai_message = result["choices"][0]["message"]["content"]
+@app.post("/api/ai/chat", response_model=ChatResponse)
+async def ai_chat(request: ChatRequest):
+    """
+    🤖 AI Chat endpoint using OpenRouter API
+    Direct AI responses for code formatting and general assistance
 
-            logger.info(f"✅ AI response generated successfully ({len(ai_message)} chars)")
-            logger.info(f"🔍 AI response preview: {ai_message[:500] if ai_message else 'EMPTY RESPONSE'}")
+    Reads the same SSE stream as /api/ai/chat/stream and accumulates it
+    into a single response.
+    """
+    try:
+        response = await _open_chat_stream(request.message)
 
-            # Handle OpenRouter usage data safely by converting any problematic types
-            usage_data = result.get("usage")
-            if usage_data:
-                # Convert cost to int if it's a float (OpenRouter returns float)
-                if "cost" in usage_data and isinstance(usage_data["cost"], float):
-                    usage_data["cost"] = int(usage_data["cost"] * 1000000)  # Convert to micro-dollars
+        parts = []
+        model = None
+        usage_data = None
+        saw_choice = False
+        try:
+            async for line in response.aiter_lines():
+                # SSE: "data: {chunk}" events, ": comment" keep-alives, blank separators
+                if not line.startswith("data: "):
+                    continue
+                data = line[6:]
+                if data == "[DONE]":
+                    break
+                chunk = orjson.loads(data)
+                model = chunk.get("model", model)
+                if chunk.get("usage"):
+                    usage_data = chunk["usage"]
+                choices = chunk.get("choices")
+                if choices:
+                    saw_choice = True
+                    content = (choices[0].get("delta") or {}).get("content")
+                    if content:
+                        parts.append(content)
+        finally:
+            await response.aclose()
 
-                # Convert nested dict fields to strings to avoid Pydantic validation issues
-                for key in ["prompt_tokens_details", "completion_tokens_details", "cost_details"]:
-                    if key in usage_data and isinstance(usage_data[key], dict):
-                        usage_data[key] = str(usage_data[key])
+        if not saw_choice:
+            raise HTTPException(status_code=500, detail="Invalid response from AI service")
 
-            return ChatResponse(
-                message=ai_message,
-                type="ai_response",
-                timestamp=datetime.now().isoformat(),
-                model=result.get("model"),
-                usage=usage_data
-            )
+        ai_message = "".join(parts)
+
+        logger.info(f"✅ AI response generated successfully ({len(ai_message)} chars)")
+        logger.info(f"🔍 AI response preview: {ai_message[:500] if ai_message else 'EMPTY RESPONSE'}")
+
+        # Handle OpenRouter usage data safely by converting any problematic types
+        if usage_data:
+            # Convert cost to int if it's a float (OpenRouter returns float)
+            if "cost" in usage_data and isinstance(usage_data["cost"], float):
+                usage_data["cost"] = int(usage_data["cost"] * 1000000)  # Convert to micro-dollars
+
+            # Convert nested dict fields to strings to avoid Pydantic validation issues
+            for key in ["prompt_tokens_details", "completion_tokens_details", "cost_details"]:
+                if key in usage_data and isinstance(usage_data[key], dict):
+                    usage_data[key] = str(usage_data[key])
+
+        return ChatResponse(
+            message=ai_message,
+            type="ai_response",
+            timestamp=datetime.now().isoformat(),
+            model=model,
+            usage=usage_data
+        )
 
+    except HTTPException:
+        raise
     except httpx.TimeoutException:
         logger.error("AI service timeout")
         raise HTTPException(status_code=504, detail="AI service timeout")
@@ -6295,6 +6716,28 @@ Output Python code only. Start with import statements.
         logger.error(f"AI chat endpoint error: {e}")
         raise HTTPException(status_code=500, detail=f"AI chat error: {str(e)}")
 
+@app.post("/api/ai/chat/stream")
+async def ai_chat_stream(request: ChatRequest):
+    """
+    🤖 Streaming AI Chat endpoint
+
+    Relays OpenRouter's server-sent events as they arrive, so the first
+    tokens reach the client after one round trip instead of after the
+    whole completion has been generated.
+    """
+    response = await _open_chat_stream(request.message)
+
+    async def relay():
+        try:
+            async for line in response.aiter_lines():
+                yield line + "\n"
+        except httpx.HTTPError as e:
+            logger.error(f"AI stream interrupted: {e}")
+        finally:
+            await response.aclose()
+
+    return StreamingResponse(relay(), media_type="text/event-stream")
+
 
 # ==================== SCAN EZ API ====================
 # Simple scanner execution for the /5665/scan_ez page
@@ -6307,6 +6750,24 @@ class ScanEZRequest(BaseModel):
     end_date: str       # End date for scan
     parameters: Dict = {}  # Optional parameters to inject
 
+UPLOADED_SCANNERS_DIR = os.path.realpath(os.path.join(os.path.dirname(__file__), "uploaded_scanners"))
+_SCANNER_FILE_RE = re.compile(r"[A-Za-z0-9_.\-]+\.py")
+
+def resolve_uploaded_scanner(scanner_file: str) -> str:
+    """
+    Path of an uploaded scanner file inside uploaded_scanners/.
+
+    Rejects (400) names with path separators and anything that resolves
+    outside the directory, e.g. through a symlink.
+    """
+    if not _SCANNER_FILE_RE.fullmatch(scanner_file):
+        raise HTTPException(status_code=400, detail=f"Invalid scanner file name: {scanner_file}")
+
+    scanner_path = os.path.realpath(os.path.join(UPLOADED_SCANNERS_DIR, scanner_file))
+    if os.path.dirname(scanner_path) != UPLOADED_SCANNERS_DIR:
+        raise HTTPException(status_code=400, detail=f"Invalid scanner file name: {scanner_file}")
+    return scanner_path
+
 class ScanEZResponse(BaseModel):
     """Response model for Scan EZ endpoint"""
     success: bool
@@ -6335,15 +6796,14 @@ async def execute_uploaded_scan_ez(request: Request, scan_request: ScanEZRequest
     Returns:
         ScanEZResponse with results from the scanner execution
     """
-    global active_scan_count
+    # Validate the name before taking a scan slot
+    scanner_path = resolve_uploaded_scanner(scan_request.scanner_file)
 
-    async with scan_lock:
-        if active_scan_count >= MAX_CONCURRENT_SCANS:
-            raise HTTPException(
-                status_code=429,
-                detail=f"Maximum concurrent scans ({MAX_CONCURRENT_SCANS}) reached. Please wait for current scans to complete."
-            )
-        active_scan_count += 1
+    if not claim_scan_slot():
+        raise HTTPException(
+            status_code=429,
+            detail=f"Maximum concurrent scans ({MAX_CONCURRENT_SCANS}) reached. Please wait for current scans to complete."
+        )
 
     scan_id = f"scanez_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}"
     start_time = time.time()
@@ -6365,93 +6825,31 @@ async def execute_uploaded_scan_ez(request: Request, scan_request: ScanEZRequest
             "created_at": datetime.now().isoformat()
         }
 
-        # Read the uploaded scanner file
-        scanner_path = os.path.join(
-            os.path.dirname(__file__),
-            "uploaded_scanners",
-            scan_request.scanner_file
-        )
-
-        if not os.path.exists(scanner_path):
+        # The worker reads and compiles the file itself, reusing its compiled
+        # code while (mtime, size) are unchanged, so only stat it here (a
+        # single syscall, no exists()-then-open race)
+        try:
+            scanner_stat = os.stat(scanner_path)
+        except FileNotFoundError:
             raise HTTPException(
                 status_code=404,
                 detail=f"Scanner file not found: {scan_request.scanner_file}"
             )
 
-        with open(scanner_path, 'r') as f:
-            scanner_code = f.read()
-
-        logger.info(f"📄 Loaded scanner code: {len(scanner_code)} characters")
-
-        # Execute the uploaded scanner using simple direct execution
-        # Import pandas and numpy for the scanner
-        import pandas as pd
-        import numpy as np
-        import requests
-        import io
-
-        # Prepare execution environment
-        exec_globals = {
-            '__name__': '__main__',
-            'pd': pd,
-            'np': np,
-            'requests': requests,
-            'datetime': datetime,  # Use module-level datetime
-            'timedelta': timedelta,  # Use module-level timedelta
-            'API_KEY': '4r6MZNWLy2ucmhVI7fY8MrvXfXTSmxpy',  # Working API key
-            'BASE_URL': 'https://api.polygon.io',
-        }
-
-        # Inject date variables
-        exec_globals['START_DATE'] = scan_request.start_date
-        exec_globals['END_DATE'] = scan_request.end_date
-        exec_globals['start_date'] = scan_request.start_date
-        exec_globals['end_date'] = scan_request.end_date
-
-        # Capture stdout
-        old_stdout = sys.stdout
-        captured_output = io.StringIO()
-        sys.stdout = captured_output
-
-        try:
-            # Execute the code
-            exec(scanner_code, exec_globals)
-
-            # Try to find results in globals
-            result_vars = ['results', 'df', 'data', 'output', 'matches', 'signals']
-            results = []
-
-            for var_name in result_vars:
-                if var_name in exec_globals and exec_globals[var_name] is not None:
-                    var_data = exec_globals[var_name]
-
-                    if isinstance(var_data, list):
-                        logger.info(f"✅ Found {len(var_data)} results in '{var_name}'")
-                        results = var_data
-                        break
-                    elif hasattr(var_data, 'to_dict'):  # DataFrame
-                        results = var_data.to_dict('records')
-                        logger.info(f"✅ Found {len(results)} results in DataFrame '{var_name}'")
-                        break
-
-            # If no results found but there's a main() function, try calling it
-            if not results and 'main' in exec_globals and callable(exec_globals['main']):
-                logger.info("🎯 Calling main() function...")
-                result = exec_globals['main']()
-                if isinstance(result, list):
-                    results = result
-                    logger.info(f"✅ main() returned {len(results)} results")
-
-            logger.info(f"✅ Execution completed: {len(results)} results")
-
-        except Exception as e:
-            logger.error(f"❌ Scanner execution error: {e}")
-            import traceback
-            traceback.print_exc()
-            results = []
-
-        finally:
-            sys.stdout = old_stdout
+        logger.info(f"📄 Scanner file: {scanner_stat.st_size} bytes")
+
+        # Execute in a worker process so the scan doesn't block the event loop
+        results = await asyncio.get_running_loop().run_in_executor(
+            SCANNER_POOL,
+            run_scanner,
+            None,
+            scanner_path,
+            scan_request.start_date,
+            scan_request.end_date,
+            '4r6MZNWLy2ucmhVI7fY8MrvXfXTSmxpy',  # Working API key
+            'https://api.polygon.io',
+            (scanner_stat.st_mtime_ns, scanner_stat.st_size),
+        )
 
         execution_time = time.time() - start_time
 
@@ -6467,14 +6865,16 @@ async def execute_uploaded_scan_ez(request: Request, scan_request: ScanEZRequest
 
         logger.info(f"✅ SCAN EZ completed: {len(results)} results in {execution_time:.2f}s")
 
-        return ScanEZResponse(
-            success=True,
-            results=results,
-            total_found=len(results),
-            execution_time=execution_time,
-            message=f"Scanner executed successfully. Found {len(results)} results.",
-            scan_id=scan_id
-        )
+        # Same shape as ScanEZResponse (still the documented response model),
+        # encoded directly rather than validated row by row
+        return _results_response({
+            "success": True,
+            "results": results,
+            "total_found": len(results),
+            "execution_time": execution_time,
+            "message": f"Scanner executed successfully. Found {len(results)} results.",
+            "scan_id": scan_id
+        })
 
     except HTTPException:
         raise
@@ -6495,8 +6895,7 @@ async def execute_uploaded_scan_ez(request: Request, scan_request: ScanEZRequest
             detail=f"Scanner execution failed: {str(e)}"
         )
     finally:
-        async with scan_lock:
-            active_scan_count -= 1
+        release_scan_slot()
 
 
 # ==================== END SCAN EZ API ====================
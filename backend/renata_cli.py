@@ -8,32 +8,108 @@ Version: 1.0.0
 
 import sys
 import os
+import re
+import asyncio
+import atexit
+import contextlib
+import functools
+import hashlib
+import socket
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+try:
+    import readline  # line editing and history for input(); pyreadline3 on Windows
+except ImportError:
+    readline = None
+
+try:
+    from tqdm import tqdm  # optional: nicer batch progress bar
+except ImportError:
+    tqdm = None
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from orchestrator.renata_orchestrator import RenataOrchestrator
-import pandas as pd
-import numpy as np
 from datetime import datetime
 import json
 
+# pandas and the orchestrator (which pulls in every tool) are imported on
+# first use, so --help, --client and argparse errors return immediately
+@functools.cache
+def _pd():
+    import pandas
+    return pandas
 
-class RenataCLI:
+
+def _is_frame(value) -> bool:
+    """Duck-typed DataFrame check (pandas, Arrow, lazy frames) that never imports pandas"""
+    return hasattr(value, "shape") and hasattr(value, "columns")
+
+
+async def _ainput(prompt: str) -> str:
     """
-    Command-line interface for RENATA V2
+    input() that doesn't block the event loop
+
+    Reads on a daemon thread so a pending prompt never keeps the process
+    alive at exit, and hands the line (or EOFError) back to the loop.
     """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
 
-    def __init__(self):
-        """Initialize CLI"""
-        self.orchestrator = RenataOrchestrator()
-        self.context = {}
-        self.history = []
-        self.running = True
+    def resolve(setter, value):
+        if not future.done():
+            setter(value)
 
-    def print_banner(self):
-        """Print welcome banner"""
-        banner = """
+    def read():
+        try:
+            line = input(prompt)
+        except BaseException as e:
+            outcome = (future.set_exception, e)
+        else:
+            outcome = (future.set_result, line)
+        with contextlib.suppress(RuntimeError):  # loop already closed
+            loop.call_soon_threadsafe(resolve, *outcome)
+
+    threading.Thread(target=read, daemon=True).start()
+    return await future
+
+
+def _write(lines: list):
+    """Emit a block of output lines with one write and one flush"""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+def load_data(path: str, nrows: int = None):
+    """
+    Load a market-data file into a DataFrame
+
+    Parquet and Feather files go to their native readers. CSVs are parsed
+    with pyarrow's multithreaded reader when pyarrow is installed, falling
+    back to the C engine (memory-mapped). nrows reads only the first rows,
+    which the pyarrow engine doesn't support, so it always uses the C engine.
+    """
+    pd = _pd()
+    suffix = os.path.splitext(path)[1].lower()
+
+    if suffix == ".parquet":
+        df = pd.read_parquet(path)
+    elif suffix == ".feather":
+        df = pd.read_feather(path)
+    else:
+        if nrows is None:
+            try:
+                return pd.read_csv(path, engine="pyarrow")
+            except ImportError:
+                pass
+        return pd.read_csv(path, memory_map=True, nrows=nrows)
+
+    return df if nrows is None else df.head(nrows)
+
+
+BANNER = """
 ╔══════════════════════════════════════════════════════════════╗
 ║                                                              ║
 ║   🤖 RENATA V2 - AI-Powered Trading Platform              ║
@@ -44,12 +120,9 @@ class RenataCLI:
 ║   Type 'help' for commands or 'exit' to quit                 ║
 ║                                                              ║
 ╚══════════════════════════════════════════════════════════════╝
-        """
-        print(banner)
+"""
 
-    def print_help(self):
-        """Print help information"""
-        help_text = """
+HELP_TEXT = """
 📖 Available Commands
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
@@ -58,8 +131,11 @@ Interactive Commands:
   exit, quit              Exit the CLI
   clear                   Clear screen
   history                 Show conversation history
+  history save <path>     Save conversation history as JSON Lines
   context                 Show current context
-  reset                   Reset context and history
+  cache                   Show result cache statistics
+  reset                   Reset context, history and cache
+  wait                    Wait for requests still running in the background
 
 Scanner Commands:
   generate <description>  Generate a V31 scanner
@@ -93,8 +169,208 @@ Backtest Commands:
   • Type 'clear' to start fresh
 
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-        """
-        print(help_text)
+"""
+
+# Explicit command verbs at the start of a request (longest alternative
+# first: \b would otherwise let "analyze" match "analyze-backtest")
+_FAST_CMD = re.compile(
+    r"^(analyze-backtest|generate|analyze|indicators|optimize|plan|backtest)\b\s*(.*)$",
+    re.IGNORECASE | re.DOTALL
+)
+
+# Interactive commands offered by Tab completion
+COMMANDS = (
+    'help', 'exit', 'quit', 'clear', 'history', 'context', 'reset',
+    'generate', 'analyze', 'indicators', 'optimize', 'plan',
+    'backtest', 'analyze-backtest', 'cache', 'wait',
+)
+
+HISTORY_FILE = os.path.expanduser("~/.renata_history")
+HISTORY_LENGTH = 1000
+
+# Batch requests processed concurrently (tool calls are mostly I/O bound)
+BATCH_WORKERS = 8
+
+# Adjacent batch requests handed to the orchestrator together, when it
+# supports process_requests_batch()
+MICRO_BATCH = 4
+
+# --serve closes client connections that stay quiet this long (seconds)
+SERVE_IDLE_TIMEOUT = 10.0
+
+# Interactive results remembered per (request, context) pair
+RESULT_CACHE_SIZE = 256
+
+# Orchestrator requests allowed in flight from the interactive prompt
+MAX_PENDING = 4
+
+# Conversation entries kept for the 'history' command
+HISTORY_SIZE = 500
+
+
+class BatchProgress:
+    """
+    Batch progress with an ETA on stderr, leaving stdout for results
+
+    Keeps an exponential moving average of execution time per tool and per
+    request; the ETA is remaining requests x request average / workers, and
+    the slowest tool so far is shown next to it. Uses tqdm when installed,
+    otherwise a single self-overwriting line. Silent when stderr isn't a
+    terminal so redirected logs stay clean.
+    """
+
+    ALPHA = 0.1
+
+    def __init__(self, total: int, workers: int):
+        self.total = total
+        self.workers = max(1, workers)
+        self.done = 0
+        self.ok = 0
+        self.request_ema = None
+        self.tool_ema = {}
+        self.enabled = sys.stderr.isatty()
+        self._bar = None
+        if self.enabled and tqdm is not None:
+            self._bar = tqdm(total=total, desc="batch", unit="req", file=sys.stderr)
+
+    def _ema(self, current, sample: float) -> float:
+        return sample if current is None else (1 - self.ALPHA) * current + self.ALPHA * sample
+
+    def update(self, result: dict):
+        self.done += 1
+        self.ok += bool(result.get("success"))
+
+        elapsed = result.get("execution_time", 0)
+        self.request_ema = self._ema(self.request_ema, elapsed)
+        tools = result.get("tools_used") or []
+        for tool in tools:
+            self.tool_ema[tool] = self._ema(self.tool_ema.get(tool), elapsed / len(tools))
+
+        if not self.enabled:
+            return
+
+        eta = (self.total - self.done) * self.request_ema / self.workers
+        slowest = max(self.tool_ema, key=self.tool_ema.get) if self.tool_ema else "-"
+        if self._bar is not None:
+            self._bar.set_postfix(ok=self.ok, eta_tool=slowest, refresh=False)
+            self._bar.update(1)
+        else:
+            sys.stderr.write(
+                f"\r⏳ {self.done}/{self.total}  ok={self.ok}  eta≈{eta:.1f}s  slowest={slowest}"
+            )
+            sys.stderr.flush()
+
+    def close(self):
+        if self._bar is not None:
+            self._bar.close()
+        elif self.enabled:
+            sys.stderr.write("\n")
+            sys.stderr.flush()
+
+
+class RenataCLI:
+    """
+    Command-line interface for RENATA V2
+    """
+
+    def __init__(self, use_cache: bool = True, history_size: int = HISTORY_SIZE):
+        """Initialize CLI"""
+        self._orchestrator = None
+        self.context = {}
+        # Oldest entries fall off once history_size is reached; _history_count
+        # keeps numbering stable across the ones that dropped out
+        self.history = deque(maxlen=history_size)
+        self._history_count = 0
+        self._history_rendered = deque(maxlen=history_size)
+        self.running = True
+        self.use_cache = use_cache
+        self._cache = OrderedDict()
+        self._cache_hits = 0
+
+        # Built-in commands, matched on the whole lowercased input; anything
+        # else (generate/analyze/plan ...) goes to the orchestrator
+        self._cmds = {
+            "exit": self._cmd_exit,
+            "quit": self._cmd_exit,
+            "q": self._cmd_exit,
+            "help": self.print_help,
+            "clear": self._cmd_clear,
+            "history": self.print_history,
+            "context": self.print_context,
+            "cache": self.print_cache,
+            "reset": self._cmd_reset,
+        }
+        self._histfile = HISTORY_FILE
+        self._readline_ready = False
+
+    @property
+    def orchestrator(self):
+        """RenataOrchestrator, created on first use"""
+        if self._orchestrator is None:
+            from orchestrator.renata_orchestrator import get_orchestrator
+            self._orchestrator = get_orchestrator()
+        return self._orchestrator
+
+    @orchestrator.setter
+    def orchestrator(self, orchestrator):
+        self._orchestrator = orchestrator
+
+    def setup_readline(self):
+        """Enable line editing, persistent prompt history and command completion"""
+        if readline is None or self._readline_ready:
+            return
+        self._readline_ready = True
+
+        try:
+            readline.read_history_file(self._histfile)
+        except (FileNotFoundError, OSError):
+            pass
+        readline.set_history_length(HISTORY_LENGTH)
+        atexit.register(self._save_history)
+
+        readline.set_completer(self._complete_command)
+        if "libedit" in (readline.__doc__ or ""):
+            # macOS ships libedit, which has its own binding syntax
+            readline.parse_and_bind("bind ^I rl_complete")
+        else:
+            readline.parse_and_bind("tab: complete")
+            # Pastes arrive as one chunk and stay on the prompt until Enter,
+            # instead of being processed key by key (and submitted at the
+            # first pasted newline)
+            readline.parse_and_bind("set enable-bracketed-paste on")
+
+    def _save_history(self):
+        """Write prompt history back to disk (registered with atexit)"""
+        try:
+            readline.write_history_file(self._histfile)
+        except OSError:
+            pass
+
+    def _complete_command(self, text: str, state: int):
+        """readline completer over COMMANDS for the first word of the line"""
+        if readline.get_line_buffer()[:readline.get_begidx()].strip():
+            return None
+        matches = [cmd for cmd in COMMANDS if cmd.startswith(text)]
+        return matches[state] if state < len(matches) else None
+
+    def print_banner(self):
+        """Print welcome banner"""
+        _write([BANNER])
+
+    @staticmethod
+    def clear_screen():
+        """Clear the terminal with ANSI escapes instead of spawning clear/cls"""
+        # Modern Windows terminals understand ANSI too; keep cls only for legacy consoles
+        if os.name == 'nt' and (not sys.stdout.isatty() or os.environ.get('TERM') == ''):
+            os.system('cls')
+            return
+        # Clear screen, clear scrollback, cursor home
+        sys.stdout.write("\x1b[2J\x1b[3J\x1b[H")
+        sys.stdout.flush()
+
+    def print_help(self):
+        """Print help information"""
+        _write([HELP_TEXT])
 
     def print_history(self):
         """Print conversation history"""
@@ -102,20 +378,38 @@ Backtest Commands:
             print("📭 No history yet")
             return
 
-        print("\n📜 Conversation History:")
-        print("━" * 70)
-
-        for i, (user_input, result) in enumerate(self.history, 1):
-            timestamp = datetime.now().strftime("%H:%M:%S")
-            print(f"\n[{i}] {timestamp} 👤 User: {user_input}")
+        _write(["\n📜 Conversation History:", "━" * 70, *self._history_rendered])
 
-            if result.get("success"):
-                print(f"    ✅ Success: {result['response'][:100]}...")
-            else:
-                print(f"    ❌ Error: {result['response']}")
+    def _add_history(self, user_input: str, result: dict):
+        """Record a processed request, rendering its 'history' entry once, now"""
+        self.history.append((user_input, result))
+        self._history_count += 1
 
-            print(f"    🔧 Tools: {', '.join(result['tools_used'])}")
-            print(f"    ⏱️  Time: {result['execution_time']:.4f}s")
+        # Timestamp of when the request was processed, not when history is shown
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        if result.get("success"):
+            outcome = f"    ✅ Success: {result['response'][:100]}..."
+        else:
+            outcome = f"    ❌ Error: {result['response']}"
+
+        self._history_rendered.append("\n".join((
+            f"\n[{self._history_count}] {timestamp} 👤 User: {user_input}",
+            outcome,
+            f"    🔧 Tools: {', '.join(result['tools_used'])}",
+            f"    ⏱️  Time: {result['execution_time']:.4f}s",
+        )))
+
+    def save_history(self, path: str):
+        """Write the kept history to a JSON Lines file, one record per request"""
+        first = self._history_count - len(self.history) + 1
+        try:
+            with open(path, "w") as fp:
+                for i, (user_input, result) in enumerate(self.history, first):
+                    fp.write(json.dumps(self._batch_record(i, user_input, result), default=str) + "\n")
+        except OSError as e:
+            print(f"❌ Could not save history: {e}")
+            return
+        print(f"💾 Saved {len(self.history)} history entries to {path}")
 
     def print_context(self):
         """Print current context"""
@@ -123,57 +417,145 @@ Backtest Commands:
             print("📭 No context stored")
             return
 
-        print("\n📦 Current Context:")
-        print("━" * 70)
+        lines = ["\n📦 Current Context:", "━" * 70]
 
         for key, value in self.context.items():
-            if isinstance(value, pd.DataFrame):
-                print(f"  📊 {key}: DataFrame ({len(value)} rows)")
-            elif isinstance(value, str) and len(value) > 50:
-                print(f"  📄 {key}: {value[:50]}...")
+            # Strings are the common case; shape[0] is metadata, so a lazy
+            # frame isn't materialized just to count its rows
+            if isinstance(value, str):
+                if len(value) > 50:
+                    lines.append(f"  📄 {key}: {value[:50]}...")
+                else:
+                    lines.append(f"  🔑 {key}: {value}")
+            elif _is_frame(value):
+                lines.append(f"  📊 {key}: DataFrame ({value.shape[0]} rows)")
             else:
-                print(f"  🔑 {key}: {value}")
+                lines.append(f"  🔑 {key}: {value}")
 
-    def process_input(self, user_input: str):
+        _write(lines)
+
+    def _task_context(self) -> dict:
         """
-        Process user input through orchestrator
+        Copy of the context for one background task or batch worker
 
-        Args:
-            user_input: User's command or request
+        DataFrames are copied too: tools such as the Indicator Calculator
+        add columns in place, and tasks run concurrently.
         """
+        return {key: value.copy() if _is_frame(value) else value for key, value in self.context.items()}
+
+    def _ctx_fp(self) -> str:
+        """Fingerprint of the current context (DataFrames by identity, not content)"""
+        items = sorted(
+            (key, id(value) if _is_frame(value) else value)
+            for key, value in self.context.items()
+        )
+        return hashlib.blake2b(repr(items).encode(), digest_size=16).hexdigest()
+
+    def print_cache(self):
+        """Print result cache statistics"""
+        state = "on" if self.use_cache else "off (--no-cache)"
+        _write([
+            f"\n🗃️  Result cache: {state}",
+            f"  Entries: {len(self._cache)}/{RESULT_CACHE_SIZE}",
+            f"  Hits: {self._cache_hits}",
+        ])
+
+    def _cmd_exit(self):
+        self.running = False
+
+    def _cmd_clear(self):
+        self.clear_screen()
+        self.print_banner()
 
-        # Handle special commands
-        if user_input.lower() in ['exit', 'quit', 'q']:
-            self.running = False
-            return
+    def _cmd_reset(self):
+        self.context = {}
+        self.history.clear()
+        self._history_rendered.clear()
+        self._history_count = 0
+        self._cache.clear()
+        print("🔄 Context and history reset")
+
+    def _run_command(self, user_input: str) -> bool:
+        """Run user_input if it is a built-in command; returns whether it was"""
+        command = user_input.strip()
+        handler = self._cmds.get(command.lower())
+        if handler is not None:
+            handler()
+            return True
+
+        if command.lower().startswith("history save "):
+            self.save_history(command[len("history save "):].strip())
+            return True
+
+        return False
+
+    def _is_command(self, user_input: str) -> bool:
+        command = user_input.strip().lower()
+        return command in self._cmds or command.startswith("history save ")
+
+    def _cache_key(self, user_input: str):
+        return (user_input, self._ctx_fp()) if self.use_cache else None
+
+    def _cached_result(self, key):
+        """Cached result for key (marked cached), or None"""
+        cached = self._cache.get(key) if key else None
+        if cached is None:
+            return None
+        self._cache.move_to_end(key)
+        self._cache_hits += 1
+        return {**cached, "cached": True}
+
+    def _cache_result(self, key, result: dict):
+        if key:
+            self._cache[key] = result
+            if len(self._cache) > RESULT_CACHE_SIZE:
+                self._cache.popitem(last=False)
+
+    def _execute(self, user_input: str, context: dict, stream_output: bool = True):
+        """
+        Run one request through the orchestrator
 
-        elif user_input.lower() == 'help':
-            self.print_help()
-            return
+        Input starting with an explicit command verb goes straight to that
+        intent's tools via process_command(); anything else goes through
+        full intent detection, streamed when stream_output allows it.
 
-        elif user_input.lower() == 'clear':
-            import os
-            os.system('clear' if os.name != 'nt' else 'cls')
-            self.print_banner()
-            return
+        Returns:
+            (result, streamed) where streamed means it was already displayed
+        """
+        process_command = getattr(self.orchestrator, "process_command", None)
+        match = _FAST_CMD.match(user_input) if process_command is not None else None
+        if match:
+            return process_command(match.group(1).lower(), user_input, context), False
 
-        elif user_input.lower() == 'history':
-            self.print_history()
-            return
+        # Prefer streaming so output shows up as each tool finishes
+        stream = getattr(self.orchestrator, "process_request_stream", None) if stream_output else None
+        if stream is not None:
+            return self.display_result_stream(stream(user_input, context)), True
 
-        elif user_input.lower() == 'context':
-            self.print_context()
-            return
+        return self.orchestrator.process_request(user_input, context), False
+
+    def process_input(self, user_input: str):
+        """
+        Process user input through orchestrator
+
+        Args:
+            user_input: User's command or request
+        """
 
-        elif user_input.lower() == 'reset':
-            self.context = {}
-            self.history = []
-            print("🔄 Context and history reset")
+        # Handle special commands
+        if self._run_command(user_input):
             return
 
-        # Process through orchestrator
+        # Process through orchestrator, reusing the result of an identical
+        # request made with an identical context
         try:
-            result = self.orchestrator.process_request(user_input, self.context)
+            key = self._cache_key(user_input)
+            result = self._cached_result(key)
+
+            streamed = False
+            if result is None:
+                result, streamed = self._execute(user_input, self.context)
+                self._cache_result(key, result)
 
             # Update context with results
             if result["success"] and result.get("execution_time", 0) < 1.0:
@@ -182,97 +564,328 @@ Backtest Commands:
                 pass
 
             # Store in history
-            self.history.append((user_input, result))
+            self._add_history(user_input, result)
 
-            # Format and display response
-            self.display_result(result)
+            # Format and display response (already shown if it was streamed)
+            if not streamed:
+                self.display_result(result)
 
         except KeyboardInterrupt:
             print("\n\n🛑 Interrupted by user")
         except Exception as e:
             print(f"\n❌ Error: {e}")
 
-    def display_result(self, result: dict):
+    @staticmethod
+    def _result_details(result: dict) -> list:
+        """Tools/timing lines shown under a successful result"""
+        lines = [
+            f"\n🔧 Tools Used: {', '.join(result['tools_used'])}",
+            f"⏱️  Execution Time: {result['execution_time']:.4f}s",
+        ]
+
+        if result.get("cached"):
+            lines.append("♻️  Cached result (same request and context)")
+        elif result["execution_time"] < 0.01:
+            lines.append("⚡ Lightning Fast!")
+        elif result["execution_time"] < 0.1:
+            lines.append("🚀 Very Fast!")
+
+        return lines
+
+    @staticmethod
+    def display_result_stream(stream) -> dict:
+        """
+        Display a process_request_stream() as it arrives
+
+        Chunks are written and flushed as soon as they are yielded; the
+        status and details follow once the final result is known.
+
+        Returns:
+            The aggregated result dictionary from the end of the stream
+        """
+        sys.stdout.write("\n" + "━" * 70 + "\n")
+        sys.stdout.flush()
+
+        result = None
+        last = "\n"
+        for chunk, meta in stream:
+            if meta is not None:
+                result = meta
+            if chunk:
+                sys.stdout.write(chunk)
+                sys.stdout.flush()
+                last = chunk
+
+        # Finish the response's last line, then leave one blank line
+        gap = "\n" if last.endswith("\n") else "\n\n"
+        if result["success"]:
+            lines = [f"{gap}✅ SUCCESS", *RenataCLI._result_details(result)]
+        else:
+            lines = [f"{gap}❌ ERROR"]
+        lines.append("━" * 70)
+        _write(lines)
+
+        return result
+
+    @staticmethod
+    def display_result(result: dict):
         """Display orchestrator result"""
 
-        print("\n" + "━" * 70)
+        lines = ["\n" + "━" * 70]
 
         if result["success"]:
-            print(f"✅ SUCCESS")
-            print(f"\n{result['response']}")
+            lines.append("✅ SUCCESS")
+            lines.append(f"\n{result['response']}")
 
             # Show details
-            print(f"\n🔧 Tools Used: {', '.join(result['tools_used'])}")
-            print(f"⏱️  Execution Time: {result['execution_time']:.4f}s")
-
-            if result["execution_time"] < 0.01:
-                print(f"⚡ Lightning Fast!")
-            elif result["execution_time"] < 0.1:
-                print(f"🚀 Very Fast!")
+            lines.extend(RenataCLI._result_details(result))
 
         else:
-            print(f"❌ ERROR")
-            print(f"\n{result['response']}")
+            lines.append("❌ ERROR")
+            lines.append(f"\n{result['response']}")
+
+        lines.append("━" * 70)
+        _write(lines)
 
-        print("━" * 70)
+    async def _process_background(self, user_input: str, context: dict, key, stream_output: bool):
+        """Run one prompt's request off the event loop, then record and show it"""
+        try:
+            result, streamed = await asyncio.to_thread(self._execute, user_input, context, stream_output)
+
+            self._cache_result(key, result)
+            self._add_history(user_input, result)
+            if not streamed:
+                self.display_result(result)
 
-    def run_interactive(self):
-        """Run interactive CLI loop"""
+        except Exception as e:
+            print(f"\n❌ Error: {e}")
+
+    async def run_interactive(self):
+        """
+        Run interactive CLI loop
+
+        Requests run in the background (up to MAX_PENDING at once) so the next
+        prompt can be typed while earlier ones are still being processed;
+        results print as they complete. 'wait' blocks until all are done.
+        Built-in commands and cached results are handled immediately.
+        """
+        self.setup_readline()
         self.print_banner()
 
         print("\n🎉 Welcome to RENATA V2!")
         print("💬 Start typing your requests in natural language...")
         print("   Type 'help' for commands or 'exit' to quit\n")
 
+        pending = set()
+
         while self.running:
             try:
                 # Get user input
-                user_input = input("👤 You: ").strip()
+                user_input = (await _ainput("👤 You: ")).strip()
+            except (EOFError, KeyboardInterrupt):
+                print("\n\n👋 Goodbye!")
+                break
+
+            if not user_input:
+                continue
 
-                if not user_input:
-                    continue
+            if user_input.lower() == "wait":
+                if pending:
+                    await asyncio.wait(pending)
+                continue
 
-                # Process input
+            # Built-in commands and cache hits are instant; handle them inline
+            if self._is_command(user_input):
                 self.process_input(user_input)
+                continue
+            key = self._cache_key(user_input)
+            if key is not None and key in self._cache:
+                self.process_input(user_input)
+                continue
 
-            except EOFError:
-                print("\n\n👋 Goodbye!")
-                break
-            except KeyboardInterrupt:
-                print("\n\n👋 Goodbye!")
-                break
+            while len(pending) >= MAX_PENDING:
+                await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
 
-    def run_batch(self, requests: list):
-        """Run batch processing mode"""
-        print(f"🚀 Batch Mode: Processing {len(requests)} requests\n")
+            # Stream output only when nothing else is printing
+            task = asyncio.create_task(
+                self._process_background(user_input, self._task_context(), key, stream_output=not pending)
+            )
+            pending.add(task)
+            task.add_done_callback(pending.discard)
 
-        results = []
+        if pending:
+            print(f"⏳ Waiting for {len(pending)} pending request(s)...")
+            await asyncio.wait(pending)
 
-        for i, request in enumerate(requests, 1):
-            print(f"\n[{i}/{len(requests)}] Processing: {request}")
+    def _process_single(self, chunk: list, context: dict) -> list:
+        """Per-request fallback with the same shape as process_requests_batch()"""
+        return [self.orchestrator.process_request(chunk[0], context)]
 
-            try:
-                result = self.orchestrator.process_request(request, self.context)
-                results.append(result)
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serve newline-delimited JSON requests on one connection
 
-                status = "✅" if result["success"] else "❌"
-                print(f"   {status} {result['tools_used']} ({result['execution_time']:.4f}s)")
+        Each message is {"request": str, "context": dict, "data": path,
+        "nrows": int}; all but request are optional and apply to that
+        request only. The reply is the orchestrator result as one JSON line.
+        """
+        try:
+            while True:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), SERVE_IDLE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if not line:
+                    break
+
+                try:
+                    message = json.loads(line)
+                    context = self._task_context()
+                    context.update(message.get("context") or {})
+                    if message.get("data"):
+                        context["df"] = await asyncio.to_thread(load_data, message["data"], message.get("nrows"))
+                    result = await asyncio.to_thread(
+                        self.orchestrator.process_request, message["request"], context
+                    )
+                except Exception as e:
+                    result = {"success": False, "response": str(e), "tools_used": [], "execution_time": 0}
+
+                writer.write(json.dumps(result, default=str).encode() + b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, socket_path: str):
+        """
+        Serve requests over a Unix domain socket until interrupted
 
-            except Exception as e:
-                print(f"   ❌ Error: {e}")
-                results.append({"success": False, "error": str(e)})
+        Repeated `--client` invocations then reuse this process's warmed
+        orchestrator instead of paying imports and setup every time.
+        """
+        # A socket file left by a previous server would make bind() fail
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(socket_path)
+
+        server = await asyncio.start_unix_server(self._handle_client, path=socket_path)
+        print(f"🔌 Serving RENATA V2 on {socket_path}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(socket_path)
+
+    @staticmethod
+    def _batch_record(i: int, request: str, result: dict) -> dict:
+        """JSON Lines record for one batch result (i is the request's 1-based position)"""
+        record = {
+            "i": i,
+            "request": request,
+            "success": result.get("success", False),
+            "tools_used": result.get("tools_used", []),
+            "execution_time": result.get("execution_time", 0),
+            "response": result.get("response"),
+        }
+        if "error" in result:
+            record["error"] = result["error"]
+        return record
+
+    def run_batch(self, requests: list, workers: int = BATCH_WORKERS, micro_batch: int = MICRO_BATCH,
+                  out: str = None):
+        """
+        Run batch processing mode
+
+        Requests run concurrently on a thread pool, each task with its own copy
+        of the context. If the orchestrator has process_requests_batch(),
+        adjacent requests are grouped into chunks of micro_batch and each chunk
+        goes through one call. Progress prints in completion order.
+
+        With out set, each result is written to that file as a JSON Lines
+        record as soon as it completes and nothing is kept in memory, so
+        memory stays flat however large the batch is.
+
+        Returns:
+            Results in request order, or None when streamed to out
+        """
+        print(f"🚀 Batch Mode: Processing {len(requests)} requests\n")
+
+        results = None if out else [None] * len(requests)
+        n_ok = 0
+        n_total = 0
+        sum_time = 0.0
+
+        process_chunk = getattr(self.orchestrator, "process_requests_batch", None)
+        if process_chunk is None or micro_batch <= 1:
+            process_chunk, micro_batch = self._process_single, 1
+
+        indexed = list(enumerate(requests, 1))
+        chunks = [indexed[i:i + micro_batch] for i in range(0, len(indexed), micro_batch)]
+        progress = BatchProgress(len(requests), workers)
+
+        with contextlib.ExitStack() as stack:
+            stack.callback(progress.close)
+            fp = stack.enter_context(open(out, "w", buffering=1 << 20)) if out else None
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=max(1, workers)))
+            futures = {
+                executor.submit(process_chunk, [request for _, request in chunk], self._task_context()): chunk
+                for chunk in chunks
+            }
+
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    chunk_results = future.result()
+                except Exception as e:
+                    chunk_results = [e] * len(chunk)
+
+                for (i, request), result in zip(chunk, chunk_results):
+                    print(f"\n[{i}/{len(requests)}] Processed: {request}")
+
+                    if isinstance(result, Exception):
+                        print(f"   ❌ Error: {result}")
+                        result = {"success": False, "error": str(result)}
+                    else:
+                        status = "✅" if result["success"] else "❌"
+                        print(f"   {status} {result['tools_used']} ({result['execution_time']:.4f}s)")
+
+                    n_total += 1
+                    n_ok += bool(result.get("success"))
+                    sum_time += result.get("execution_time", 0)
+                    progress.update(result)
+
+                    if fp is not None:
+                        fp.write(json.dumps(self._batch_record(i, request, result), default=str) + "\n")
+                    else:
+                        results[i - 1] = result
 
         # Summary
         print("\n" + "=" * 70)
         print("📊 BATCH PROCESSING SUMMARY")
         print("=" * 70)
-        successful = sum(1 for r in results if r.get("success"))
-        print(f"✅ Successful: {successful}/{len(results)} ({successful/len(results)*100:.1f}%)")
-        print(f"❌ Failed: {len(results) - successful}/{len(results)}")
+        print(f"✅ Successful: {n_ok}/{n_total} ({n_ok/n_total*100:.1f}%)")
+        print(f"❌ Failed: {n_total - n_ok}/{n_total}")
+        print(f"⏱️  Total tool time: {sum_time:.4f}s")
+        if out:
+            print(f"💾 Results written to {out}")
 
         return results
 
 
+def request_via_socket(socket_path: str, request: str, context: dict = None, data: str = None,
+                       nrows: int = None) -> dict:
+    """Send one request to a `--serve` process and return its result"""
+    message = {"request": request, "context": context or {}}
+    if data:
+        message["data"] = os.path.abspath(data)
+        message["nrows"] = nrows
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(message).encode() + b"\n")
+        with sock.makefile("rb") as reply:
+            return json.loads(reply.readline())
+
+
 def main():
     """Main entry point"""
 
@@ -294,6 +907,10 @@ Examples:
 
   # With data context
   python renata_cli.py --request "Analyze AAPL" --data market_data.csv
+
+  # Warm server + fast repeated requests
+  python renata_cli.py --serve /tmp/renata.sock
+  python renata_cli.py --client /tmp/renata.sock --request "Analyze AAPL"
         """
     )
 
@@ -309,10 +926,63 @@ Examples:
         help='JSON file with batch requests'
     )
 
+    parser.add_argument(
+        '--workers', '-w',
+        type=int,
+        default=BATCH_WORKERS,
+        help=f'Concurrent requests in batch mode (default: {BATCH_WORKERS})'
+    )
+
+    parser.add_argument(
+        '--micro-batch',
+        type=int,
+        default=MICRO_BATCH,
+        help=f'Requests per orchestrator call in batch mode, when supported (default: {MICRO_BATCH})'
+    )
+
+    parser.add_argument(
+        '--out', '-o',
+        type=str,
+        help='Stream batch results to this JSON Lines file instead of keeping them in memory'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always run requests through the orchestrator, even repeated ones'
+    )
+
+    parser.add_argument(
+        '--history-size',
+        type=int,
+        default=HISTORY_SIZE,
+        help=f'Conversation entries kept for the history command (default: {HISTORY_SIZE})'
+    )
+
+    parser.add_argument(
+        '--serve',
+        metavar='SOCKET_PATH',
+        type=str,
+        help='Keep a warm orchestrator serving requests on a Unix socket'
+    )
+
+    parser.add_argument(
+        '--client',
+        metavar='SOCKET_PATH',
+        type=str,
+        help='Send --request to a running --serve process instead of starting an orchestrator'
+    )
+
     parser.add_argument(
         '--data', '-d',
         type=str,
-        help='CSV data file to load as context'
+        help='CSV data file to load as context (.parquet and .feather also accepted)'
+    )
+
+    parser.add_argument(
+        '--nrows',
+        type=int,
+        help='Only load the first N rows of --data (quick sampling of large files)'
     )
 
     parser.add_argument(
@@ -330,13 +1000,27 @@ Examples:
 
     args = parser.parse_args()
 
+    # Client mode: hand the request to a running server, no local orchestrator
+    if args.client:
+        if not args.request:
+            parser.error("--client requires --request")
+        try:
+            result = request_via_socket(
+                args.client, args.request, {"ticker": args.ticker}, args.data, args.nrows
+            )
+        except OSError as e:
+            print(f"❌ Could not reach server at {args.client}: {e}")
+            return 1
+        RenataCLI.display_result(result)
+        return 0 if result["success"] else 1
+
     # Create CLI instance
-    cli = RenataCLI()
+    cli = RenataCLI(use_cache=not args.no_cache, history_size=args.history_size)
 
     # Load data if provided
     if args.data:
         try:
-            df = pd.read_csv(args.data)
+            df = load_data(args.data, args.nrows)
             cli.context['df'] = df
             cli.context['ticker'] = args.ticker
             print(f"✅ Loaded data: {len(df)} rows from {args.data}")
@@ -344,6 +1028,14 @@ Examples:
             print(f"❌ Error loading data: {e}")
             return 1
 
+    # Server mode
+    if args.serve:
+        try:
+            asyncio.run(cli.serve(args.serve))
+        except KeyboardInterrupt:
+            print("\n👋 Server stopped")
+        return 0
+
     # Single request mode
     if args.request:
         cli.print_banner()
@@ -358,7 +1050,7 @@ Examples:
                 requests = json.load(f)
 
             cli.print_banner()
-            cli.run_batch(requests)
+            cli.run_batch(requests, workers=args.workers, micro_batch=args.micro_batch, out=args.out)
             return 0
 
         except Exception as e:
@@ -366,7 +1058,10 @@ Examples:
             return 1
 
     # Default to interactive mode
-    cli.run_interactive()
+    try:
+        asyncio.run(cli.run_interactive())
+    except KeyboardInterrupt:
+        print("\n\n👋 Goodbye!")
 
     return 0
 
@@ -0,0 +1,82 @@
+"""
+Scan EZ Scan Store
+
+Bounded scan_id -> scan state mapping behind main.active_scans and
+main.completed_scans. Kept free of FastAPI and of any import of main so
+it can be unit tested on its own.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+class ScanStore(dict):
+    """
+    scan_id -> scan state, bounded so a long-lived server doesn't grow forever.
+
+    Inserting past max_size evicts finished scans, least recently updated
+    first. Running scans are never evicted (background tasks keep updating
+    them by scan_id), so while everything is live the store may go over
+    max_size. expire() drops finished scans that have been idle for longer
+    than a TTL (called from cleanup_old_scans).
+    """
+
+    FINISHED = frozenset({"completed", "failed", "error", "cancelled"})
+
+    def __init__(self, max_size: int = 1024):
+        super().__init__()
+        self.max_size = max_size
+
+    @staticmethod
+    def _last_touched(info: Dict) -> str:
+        return info.get("last_progress_update") or info.get("created_at") or ""
+
+    def __setitem__(self, scan_id: str, info: Dict):
+        super().__setitem__(scan_id, info)
+        if len(self) > self.max_size:
+            self._evict(len(self) - self.max_size)
+
+    # Every insertion path goes through __setitem__ so the cap applies
+
+    def setdefault(self, scan_id: str, info: Dict = None):
+        if scan_id not in self:
+            self[scan_id] = info
+        return self[scan_id]
+
+    def update(self, *args, **kwargs):
+        for scan_id, info in dict(*args, **kwargs).items():
+            self[scan_id] = info
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def _evict(self, count: int):
+        # Only finished scans, oldest first
+        finished = sorted(
+            (item for item in self.items() if item[1].get("status") in self.FINISHED),
+            key=lambda item: self._last_touched(item[1])
+        )
+        for scan_id, _ in finished[:count]:
+            del self[scan_id]
+            logger.info(f"Evicted scan {scan_id} (scan store over {self.max_size} entries)")
+
+    def expire(self, ttl_seconds: float, now: datetime) -> int:
+        """Drop finished scans not updated within ttl_seconds; returns how many were removed"""
+        expired = []
+        for scan_id, info in self.items():
+            if info.get("status") not in self.FINISHED:
+                continue
+            try:
+                touched = datetime.fromisoformat(self._last_touched(info))
+            except ValueError:
+                expired.append(scan_id)
+                continue
+            if (now - touched).total_seconds() > ttl_seconds:
+                expired.append(scan_id)
+        for scan_id in expired:
+            del self[scan_id]
+        return len(expired)
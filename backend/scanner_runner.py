@@ -0,0 +1,163 @@
+"""
+Scan EZ Scanner Runner
+
+Executes an uploaded scanner file and collects its results. Runs inside
+the worker processes of main.SCANNER_POOL, so a long scan never blocks
+the API's event loop. Kept free of FastAPI and of any import of main so
+spawned workers only pay for this module.
+"""
+
+import contextlib
+import io
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from types import CodeType
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RESULT_VARS = ('results', 'df', 'data', 'output', 'matches', 'signals')
+
+# Scanners that print per ticker can emit megabytes; keep only the head
+MAX_CAPTURED_OUTPUT = 64 * 1024  # characters
+
+
+class CappedOutput(io.StringIO):
+    """StringIO that keeps only the first `limit` characters written to it"""
+
+    def __init__(self, limit: int = MAX_CAPTURED_OUTPUT):
+        super().__init__()
+        self._room = limit
+
+    def write(self, s: str) -> int:
+        if self._room > 0:
+            chunk = s[:self._room]
+            self._room -= len(chunk)
+            super().write(chunk)
+        # Report everything as written so print() callers never see a short write
+        return len(s)
+
+
+# Libraries handed to every scanner, imported once per worker process
+_SCANNER_LIBS: Dict[str, Any] = {}
+
+
+def init_worker() -> None:
+    """
+    ProcessPoolExecutor initializer: import the scanner libraries up front.
+
+    Workers pay the pandas import when they start rather than inside the
+    first scan, and the API process itself never imports them here.
+    """
+    import numpy
+    import pandas
+    import requests
+    _SCANNER_LIBS.update(pd=pandas, np=numpy, requests=requests)
+
+
+# Per-worker LRU of compiled scanner files keyed by (path, st_mtime_ns, st_size),
+# so repeat scans of an unchanged file skip reading and compiling it
+_COMPILED: "OrderedDict[Tuple[str, int, int], CodeType]" = OrderedDict()
+_COMPILED_MAX = 32
+
+
+def compiled_scanner(scanner_code: Optional[str], scanner_path: str,
+                     cache_key: Optional[Tuple[int, int]] = None) -> CodeType:
+    """
+    Compile scanner source, reusing the cached code object for an unchanged file.
+
+    Args:
+        scanner_code: Source text, or None to read it from scanner_path
+        scanner_path: File the source came from (also the code's filename)
+        cache_key: (st_mtime_ns, st_size) of scanner_path; None disables caching
+    """
+    if cache_key is None:
+        if scanner_code is None:
+            with open(scanner_path, 'r') as f:
+                scanner_code = f.read()
+        return compile(scanner_code, scanner_path, 'exec')
+
+    key = (scanner_path, *cache_key)
+    code = _COMPILED.get(key)
+    if code is not None:
+        _COMPILED.move_to_end(key)
+        return code
+
+    code = compiled_scanner(scanner_code, scanner_path)
+    _COMPILED[key] = code
+    if len(_COMPILED) > _COMPILED_MAX:
+        _COMPILED.popitem(last=False)
+    return code
+
+
+def run_scanner(scanner_code: Optional[str], scanner_path: str, start_date: str, end_date: str,
+                api_key: str, base_url: str,
+                cache_key: Optional[Tuple[int, int]] = None) -> List[Dict[str, Any]]:
+    """
+    Execute scanner source and return its results as a list of records.
+
+    Pass scanner_code=None with the file's (st_mtime_ns, st_size) as
+    cache_key to load the scanner from scanner_path through the
+    compiled-code cache.
+
+    Results are taken from the first of RESULT_VARS holding a list or a
+    DataFrame, falling back to calling main(). Anything the scanner prints
+    is captured (up to MAX_CAPTURED_OUTPUT characters) rather than written
+    to the worker's stdout. Scanner errors are logged and yield an empty list.
+    """
+    if not _SCANNER_LIBS:
+        init_worker()
+
+    # Prepare execution environment
+    exec_globals = {
+        '__name__': '__main__',
+        **_SCANNER_LIBS,
+        'datetime': datetime,
+        'timedelta': timedelta,
+        'API_KEY': api_key,
+        'BASE_URL': base_url,
+        # Inject date variables
+        'START_DATE': start_date,
+        'END_DATE': end_date,
+        'start_date': start_date,
+        'end_date': end_date,
+    }
+
+    results = []
+    try:
+        with contextlib.redirect_stdout(CappedOutput()):
+            # Execute the code
+            exec(compiled_scanner(scanner_code, scanner_path, cache_key), exec_globals)
+
+            # Try to find results in globals
+            for var_name in RESULT_VARS:
+                var_data = exec_globals.get(var_name)
+                if var_data is None:
+                    continue
+                if isinstance(var_data, list):
+                    logger.info(f"✅ Found {len(var_data)} results in '{var_name}'")
+                    results = var_data
+                    break
+                elif hasattr(var_data, 'to_dict'):  # DataFrame
+                    results = var_data.to_dict('records')
+                    logger.info(f"✅ Found {len(results)} results in DataFrame '{var_name}'")
+                    break
+
+            # If no results found but there's a main() function, try calling it
+            if not results and callable(exec_globals.get('main')):
+                logger.info("🎯 Calling main() function...")
+                result = exec_globals['main']()
+                if isinstance(result, list):
+                    results = result
+                    logger.info(f"✅ main() returned {len(results)} results")
+
+        logger.info(f"✅ Execution completed: {len(results)} results")
+
+    except Exception as e:
+        # Through logging rather than print_exc() so the traceback reaches the
+        # configured handlers instead of whatever stdout currently is
+        logger.exception(f"❌ Scanner execution error: {e}")
+        results = []
+
+    return results
@@ -1,28 +1,90 @@
 #!/usr/bin/env python3
 """
 Show what scanner code looks like
+
+Usage:
+    python show_scanner.py
+    python show_scanner.py --description "Backside B gap scanner" --lines 120
+    python show_scanner.py -d "D2 momentum scanner" -d "D1 gap scanner"
 """
 
+import argparse
+import functools
+import io
+import itertools
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from tools.v31_scanner_generator import v31_scanner_generator
+from tools.tool_types import ToolStatus
+
+DEFAULT_DESCRIPTION = "D2 momentum scanner"
+DEFAULT_LINES = 80
+
+
+@functools.lru_cache(maxsize=128)
+def _generate(description: str):
+    """
+    Generate a scanner for a description, once per description per process
+
+    Apart from the "Generated:" timestamp in its header, the code only
+    depends on the description, so repeated previews reuse the first
+    result. Returns the ToolResult; treat it as read-only since it is
+    shared between callers.
+    """
+    return v31_scanner_generator({"description": description})
+
+
+def show(description: str, n_lines: int = DEFAULT_LINES) -> bool:
+    """Print the first n_lines of the scanner generated for description"""
+    result = _generate(description)
 
-# Generate a D2 scanner
-result = v31_scanner_generator({
-    "description": "D2 momentum scanner"
-})
+    if result.status != ToolStatus.SUCCESS:
+        print(f"❌ Could not generate scanner for '{description}': {result.error}")
+        return False
 
-if result.status.value == "SUCCESS":
     code = result.result["scanner_code"]
 
-    # Show first 80 lines
-    lines = code.split('\n')
-    print("=" * 70)
-    print("  YOUR D2 SCANNER CODE (First 80 lines)")
-    print("=" * 70)
-    print('\n'.join(lines[:80]))
-    print("\n" + "=" * 70)
-    print(f"  TOTAL: {len(code)} characters, {len(lines)} lines")
-    print("=" * 70)
+    # Show first n_lines lines without splitting the whole file
+    head = list(itertools.islice(io.StringIO(code), n_lines))
+    preview = "".join(head)
+    if len(head) == n_lines and preview.endswith("\n"):
+        # The last shown line's newline separates it from code not shown
+        preview = preview[:-1]
+    total_lines = code.count("\n") + 1
+
+    rule = "=" * 70
+    sys.stdout.write(
+        f"{rule}\n  YOUR SCANNER CODE: {description} (First {n_lines} lines)\n{rule}\n"
+        f"{preview}\n"
+        f"\n{rule}\n  TOTAL: {len(code)} characters, {total_lines} lines\n{rule}\n"
+    )
+    return True
+
+
+def main(argv=None) -> int:
+    """Preview one or more generated scanners from a single process"""
+    parser = argparse.ArgumentParser(description="Preview generated V31 scanner code")
+    parser.add_argument(
+        '--description', '-d',
+        action='append',
+        help=f'Scanner description; repeat for several previews (default: "{DEFAULT_DESCRIPTION}")'
+    )
+    parser.add_argument(
+        '--lines', '-n',
+        type=int,
+        default=DEFAULT_LINES,
+        help=f'Lines of code to show (default: {DEFAULT_LINES})'
+    )
+    args = parser.parse_args(argv)
+
+    ok = True
+    for description in args.description or [DEFAULT_DESCRIPTION]:
+        ok = show(description, args.lines) and ok
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
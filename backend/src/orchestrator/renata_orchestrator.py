@@ -6,30 +6,124 @@ Version: 1.0.0
 Purpose: Understand user requests and route to appropriate tools
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Callable, Iterator, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from graphlib import TopologicalSorter
+import copy
+import dataclasses
+import functools
+import importlib
+import json
+import logging
+import os
 import re
+import threading
 import time
 
-# Import shared types
-import sys
-import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../'))
-
-# Import all 13 tools
-from tools.v31_scanner_generator import v31_scanner_generator
-from tools.v31_validator import v31_validator
-from tools.scanner_executor import scanner_executor
-from tools.indicator_calculator import indicator_calculator
-from tools.market_structure_analyzer import market_structure_analyzer
-from tools.daily_context_detector import daily_context_detector
-from tools.a_plus_analyzer import a_plus_analyzer
-from tools.quick_backtester import quick_backtester
-from tools.parameter_optimizer import parameter_optimizer
-from tools.sensitivity_analyzer import sensitivity_analyzer
-from tools.backtest_generator import backtest_generator
-from tools.backtest_analyzer import backtest_analyzer
-from tools.build_plan_generator import build_plan_generator
-from tools.tool_types import ToolStatus, ToolResult
+try:
+    import ahocorasick  # optional: pyahocorasick, one-pass keyword matching
+except ImportError:
+    ahocorasick = None
+
+# Importers put backend/src on sys.path (as `orchestrator.renata_orchestrator`);
+# only a direct `python renata_orchestrator.py` run needs it added here
+if not __package__:
+    import sys
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.tool_types import ToolSpec, ToolStatus, ToolResult
+
+logger = logging.getLogger(__name__)
+
+# Statuses compared per result; enum members are singletons, so `is` is exact
+_SUCCESS = ToolStatus.SUCCESS
+_ERROR = ToolStatus.ERROR
+
+# RENATA_EMOJI=0 swaps the emoji in responses for ASCII tags (smaller payloads,
+# plain terminals and logs)
+EMOJI_ENABLED = os.environ.get("RENATA_EMOJI", "1") != "0"
+_ASCII_GLYPHS = str.maketrans({
+    "✅": "[ok]",
+    "❌": "[error]",
+    "🔧": "[tool]",
+    "📄": "[code]",
+    "📈": "[up]",
+    "🔺": "[high]",
+    "🔻": "[low]",
+    "🎯": "[best]",
+    "🛡": "[robust]",
+    "📊": "[return]",
+    "⚡": "[sharpe]",
+    "📋": "[plan]",
+    "📝": "[steps]",
+    "⏱": "[time]",
+    "\ufe0f": None,  # emoji variation selector
+})
+
+
+def _glyphs(text: str) -> str:
+    """text as sent to users: unchanged, or with emoji as ASCII tags when EMOJI_ENABLED is off"""
+    return text if EMOJI_ENABLED else text.translate(_ASCII_GLYPHS)
+
+
+# Shared pool for tools that can run side by side in a workflow layer
+TOOL_WORKERS = 4
+_TOOL_POOL = ThreadPoolExecutor(max_workers=TOOL_WORKERS, thread_name_prefix="renata-tool")
+
+# Requests run side by side by process_requests_batch()
+BATCH_WORKERS = 4
+
+
+def _lazy_tool(name: str) -> Callable[[Dict[str, Any]], ToolResult]:
+    """
+    Tool function tools.<name>.<name>, imported on its first call
+
+    Keeps the orchestrator's import (and requests that only touch a few
+    tools) from paying for every tool's dependencies up front.
+    """
+
+    @functools.lru_cache(maxsize=1)
+    def load():
+        return getattr(importlib.import_module(f"tools.{name}"), name)
+
+    def tool(input_data: Dict[str, Any]) -> ToolResult:
+        return load()(input_data)
+
+    tool.__name__ = tool.__qualname__ = name
+    return tool
+
+
+class KeywordMatcher:
+    """
+    Finds which keyword groups occur in lowercased text, in one pass
+
+    Uses an Aho-Corasick automaton when pyahocorasick is installed, which
+    reports every hit including overlapping ones. Otherwise falls back to
+    one compiled alternation; its matches don't overlap, so a keyword
+    starting inside another keyword's match is only missed in run-together
+    words.
+    """
+
+    def __init__(self, groups: Dict[str, Tuple[str, ...]]):
+        self.keyword_group = {word: group for group, words in groups.items() for word in words}
+        self._automaton = None
+        self._regex = None
+
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for word, group in self.keyword_group.items():
+                self._automaton.add_word(word, group)
+            self._automaton.make_automaton()
+        else:
+            alternatives = sorted(self.keyword_group, key=len, reverse=True)
+            self._regex = re.compile("|".join(re.escape(word) for word in alternatives))
+
+    def groups(self, text_lower: str) -> set:
+        """Groups with at least one keyword in text_lower"""
+        if self._automaton is not None:
+            return {group for _, group in self._automaton.iter(text_lower)}
+        return {self.keyword_group[word] for word in self._regex.findall(text_lower)}
 
 
 class RenataOrchestrator:
@@ -44,123 +138,195 @@ class RenataOrchestrator:
     5. Formats results for users
     """
 
+    # Explicit CLI command verbs and the intent each one means
+    COMMAND_INTENTS = {
+        "generate": "GENERATE_SCANNER",
+        "analyze": "ANALYZE",
+        "indicators": "ANALYZE",
+        "optimize": "OPTIMIZE",
+        "plan": "PLAN",
+        "backtest": "BACKTEST",
+        "analyze-backtest": "BACKTEST",
+    }
+
+    # Substrings of the lowercased input that flag each intent
+    INTENT_KEYWORDS = {
+        "generate": ("generate", "create", "build"),
+        "validate": ("validate", "check", "compliance"),
+        "backtest": ("backtest", "performance"),
+        "analyze": ("analyze", "indicator", "structure", "trend", "market"),
+        "optimize": ("optimize", "tune"),
+        "plan": ("plan", "strategy", "implementation"),
+        "execute": ("execute", "run"),
+    }
+
+    # Setup types in reporting order, then complexity levels
+    SETUP_KEYWORDS = {
+        "BACKSIDE_B": ("backside", "gap"),
+        "D2": ("d2",),
+        "MDR": ("mdr", "multi"),
+        "FBO": ("fbo",),
+    }
+    COMPLEXITY_KEYWORDS = {
+        "simple": ("simple", "basic"),
+        "complex": ("complex", "advanced", "comprehensive"),
+    }
+
+    _INTENT_MATCHER = KeywordMatcher(INTENT_KEYWORDS)
+    _DETAIL_MATCHER = KeywordMatcher({**SETUP_KEYWORDS, **COMPLEXITY_KEYWORDS})
+
+    # Candidate tickers/symbols: standalone runs of 1-5 capitals
+    _TICKER_RE = re.compile(r'\b[A-Z]{1,5}\b')
+
+    # Tools each intent runs, in order (VALIDATE picks from VALIDATE_TOOLS)
+    INTENT_TOOLS = {
+        "GENERATE_SCANNER": ("v31_scanner_generator", "v31_validator"),
+        "BACKTEST": ("quick_backtester", "backtest_analyzer"),
+        "ANALYZE": ("indicator_calculator", "market_structure_analyzer"),
+        "OPTIMIZE": ("parameter_optimizer", "sensitivity_analyzer"),
+        "PLAN": ("build_plan_generator",),
+        "EXECUTE": ("scanner_executor",),
+    }
+
+    # VALIDATE tools and the input substring that asks for each
+    VALIDATE_TOOLS = (
+        ("scanner", "v31_validator"),
+        ("a+", "a_plus_analyzer"),
+    )
+
+    # Finished results kept for repeatable requests (see _run_intent)
+    REQUEST_CACHE_SIZE = 512
+
     def __init__(self):
         """Initialize the orchestrator"""
-        self.tool_registry = self._build_tool_registry()
+        # Shared by every orchestrator; treat as read-only
+        self.tool_registry, self.producers = _shared_registry()
         self.conversation_history = []
+        self._request_cache = OrderedDict()
+        self._request_cache_lock = threading.Lock()
 
-    def _build_tool_registry(self) -> Dict[str, Dict]:
+    @staticmethod
+    def _build_tool_registry() -> Dict[str, ToolSpec]:
         """
         Build registry of all available tools
 
+        Tools flagged "cacheable" are deterministic for JSON inputs, so
+        their results are memoized (see _cached_tool_call). The scanner
+        generator is not: it stamps its code with the generation time.
+
         Returns:
-            Dictionary mapping tool names to their metadata
+            Dictionary mapping tool names to their ToolSpec
         """
         return {
-            "v31_scanner_generator": {
-                "name": "V31 Scanner Generator",
-                "description": "Generate V31-compliant scanner code from description",
-                "keywords": ["generate", "create", "scanner", "code", "v31"],
-                "required_params": ["description"],
-                "optional_params": ["parameters"],
-                "function": v31_scanner_generator
-            },
-            "v31_validator": {
-                "name": "V31 Validator",
-                "description": "Validate scanner meets V31 Gold Standard",
-                "keywords": ["validate", "check", "compliance", "v31", "standards"],
-                "required_params": ["scanner_code"],
-                "optional_params": ["strict_mode"],
-                "function": v31_validator
-            },
-            "indicator_calculator": {
-                "name": "Indicator Calculator",
-                "description": "Calculate proprietary indicators (RahulLines Cloud, Deviation Bands)",
-                "keywords": ["indicator", "rahullines", "cloud", "ema", "deviation", "calculate"],
-                "required_params": ["ticker", "df"],
-                "optional_params": ["indicators"],
-                "function": indicator_calculator
-            },
-            "market_structure_analyzer": {
-                "name": "Market Structure Analyzer",
-                "description": "Detect pivots, trends, support/resistance levels",
-                "keywords": ["pivot", "trend", "support", "resistance", "structure", "levels"],
-                "required_params": ["ticker", "df"],
-                "optional_params": ["pivot_lookback", "trend_lookback"],
-                "function": market_structure_analyzer
-            },
-            "daily_context_detector": {
-                "name": "Daily Context Detector",
-                "description": "Detect daily market molds (D2, MDR, FBO, T30)",
-                "keywords": ["daily", "context", "mold", "market type", "d2", "mdr", "fbo"],
-                "required_params": ["df"],
-                "optional_params": ["date"],
-                "function": daily_context_detector
-            },
-            "a_plus_analyzer": {
-                "name": "A+ Analyzer",
-                "description": "Validate scanner against A+ historical examples",
-                "keywords": ["a+", "example", "validate", "historical", "backtest"],
-                "required_params": ["scanner_code", "a_plus_examples"],
-                "optional_params": ["strict_mode"],
-                "function": a_plus_analyzer
-            },
-            "quick_backtester": {
-                "name": "Quick Backtester",
-                "description": "Fast 30-day backtest validation",
-                "keywords": ["backtest", "test", "validate", "performance", "quick", "30-day"],
-                "required_params": ["scanner_results"],
-                "optional_params": ["entry_price_col", "exit_price_col"],
-                "function": quick_backtester
-            },
-            "parameter_optimizer": {
-                "name": "Parameter Optimizer",
-                "description": "Optimize scanner parameters using grid search",
-                "keywords": ["optimize", "parameter", "tune", "grid search", "best"],
-                "required_params": ["scanner_function", "parameter_ranges", "evaluation_data"],
-                "optional_params": ["metric"],
-                "function": parameter_optimizer
-            },
-            "sensitivity_analyzer": {
-                "name": "Sensitivity Analyzer",
-                "description": "Test parameter sensitivity and robustness",
-                "keywords": ["sensitivity", "robustness", "variation", "stable"],
-                "required_params": ["scanner_function", "base_parameters", "evaluation_data"],
-                "optional_params": ["parameter_variations"],
-                "function": sensitivity_analyzer
-            },
-            "backtest_generator": {
-                "name": "Backtest Generator",
-                "description": "Generate complete backtest script from scanner",
-                "keywords": ["generate", "backtest", "script", "code"],
-                "required_params": ["scanner_code"],
-                "optional_params": ["backtest_config"],
-                "function": backtest_generator
-            },
-            "backtest_analyzer": {
-                "name": "Backtest Analyzer",
-                "description": "Analyze backtest results and metrics",
-                "keywords": ["analyze", "metrics", "performance", "sharpe", "drawdown"],
-                "required_params": ["backtest_results"],
-                "optional_params": ["initial_capital"],
-                "function": backtest_analyzer
-            },
-            "build_plan_generator": {
-                "name": "Build Plan Generator",
-                "description": "Generate implementation plan for trading strategies",
-                "keywords": ["plan", "strategy", "implementation", "roadmap", "steps"],
-                "required_params": ["strategy_description", "setup_types"],
-                "optional_params": ["complexity_level"],
-                "function": build_plan_generator
-            },
-            "scanner_executor": {
-                "name": "Scanner Executor",
-                "description": "Execute scanner on live market data",
-                "keywords": ["execute", "run", "scanner", "live", "market"],
-                "required_params": ["scanner_code", "symbols"],
-                "optional_params": ["date"],
-                "function": scanner_executor
-            }
+            "v31_scanner_generator": ToolSpec(
+                name="V31 Scanner Generator",
+                description="Generate V31-compliant scanner code from description",
+                keywords=("generate", "create", "scanner", "code", "v31"),
+                required_params=frozenset({"description"}),
+                optional_params=frozenset({"parameters"}),
+                outputs=("scanner_code",),
+                function=_lazy_tool("v31_scanner_generator")
+            ),
+            "v31_validator": ToolSpec(
+                name="V31 Validator",
+                description="Validate scanner meets V31 Gold Standard",
+                keywords=("validate", "check", "compliance", "v31", "standards"),
+                required_params=frozenset({"scanner_code"}),
+                optional_params=frozenset({"strict_mode"}),
+                produce_if_missing=("scanner_code",),
+                cacheable=True,
+                function=_lazy_tool("v31_validator")
+            ),
+            "indicator_calculator": ToolSpec(
+                name="Indicator Calculator",
+                description="Calculate proprietary indicators (RahulLines Cloud, Deviation Bands)",
+                keywords=("indicator", "rahullines", "cloud", "ema", "deviation", "calculate"),
+                required_params=frozenset({"ticker", "df"}),
+                optional_params=frozenset({"indicators"}),
+                function=_lazy_tool("indicator_calculator")
+            ),
+            "market_structure_analyzer": ToolSpec(
+                name="Market Structure Analyzer",
+                description="Detect pivots, trends, support/resistance levels",
+                keywords=("pivot", "trend", "support", "resistance", "structure", "levels"),
+                required_params=frozenset({"ticker", "df"}),
+                optional_params=frozenset({"pivot_lookback", "trend_lookback"}),
+                function=_lazy_tool("market_structure_analyzer")
+            ),
+            "daily_context_detector": ToolSpec(
+                name="Daily Context Detector",
+                description="Detect daily market molds (D2, MDR, FBO, T30)",
+                keywords=("daily", "context", "mold", "market type", "d2", "mdr", "fbo"),
+                required_params=frozenset({"df"}),
+                optional_params=frozenset({"date"}),
+                function=_lazy_tool("daily_context_detector")
+            ),
+            "a_plus_analyzer": ToolSpec(
+                name="A+ Analyzer",
+                description="Validate scanner against A+ historical examples",
+                keywords=("a+", "example", "validate", "historical", "backtest"),
+                required_params=frozenset({"scanner_code", "a_plus_examples"}),
+                optional_params=frozenset({"strict_mode"}),
+                function=_lazy_tool("a_plus_analyzer")
+            ),
+            "quick_backtester": ToolSpec(
+                name="Quick Backtester",
+                description="Fast 30-day backtest validation",
+                keywords=("backtest", "test", "validate", "performance", "quick", "30-day"),
+                required_params=frozenset({"scanner_results"}),
+                optional_params=frozenset({"entry_price_col", "exit_price_col"}),
+                function=_lazy_tool("quick_backtester")
+            ),
+            "parameter_optimizer": ToolSpec(
+                name="Parameter Optimizer",
+                description="Optimize scanner parameters using grid search",
+                keywords=("optimize", "parameter", "tune", "grid search", "best"),
+                required_params=frozenset({"scanner_function", "parameter_ranges", "evaluation_data"}),
+                optional_params=frozenset({"metric"}),
+                function=_lazy_tool("parameter_optimizer")
+            ),
+            "sensitivity_analyzer": ToolSpec(
+                name="Sensitivity Analyzer",
+                description="Test parameter sensitivity and robustness",
+                keywords=("sensitivity", "robustness", "variation", "stable"),
+                required_params=frozenset({"scanner_function", "base_parameters", "evaluation_data"}),
+                optional_params=frozenset({"parameter_variations"}),
+                function=_lazy_tool("sensitivity_analyzer")
+            ),
+            "backtest_generator": ToolSpec(
+                name="Backtest Generator",
+                description="Generate complete backtest script from scanner",
+                keywords=("generate", "backtest", "script", "code"),
+                required_params=frozenset({"scanner_code"}),
+                optional_params=frozenset({"backtest_config"}),
+                cacheable=True,
+                function=_lazy_tool("backtest_generator")
+            ),
+            "backtest_analyzer": ToolSpec(
+                name="Backtest Analyzer",
+                description="Analyze backtest results and metrics",
+                keywords=("analyze", "metrics", "performance", "sharpe", "drawdown"),
+                required_params=frozenset({"backtest_results"}),
+                optional_params=frozenset({"initial_capital"}),
+                function=_lazy_tool("backtest_analyzer")
+            ),
+            "build_plan_generator": ToolSpec(
+                name="Build Plan Generator",
+                description="Generate implementation plan for trading strategies",
+                keywords=("plan", "strategy", "implementation", "roadmap", "steps"),
+                required_params=frozenset({"strategy_description", "setup_types"}),
+                optional_params=frozenset({"complexity_level"}),
+                cacheable=True,
+                function=_lazy_tool("build_plan_generator")
+            ),
+            "scanner_executor": ToolSpec(
+                name="Scanner Executor",
+                description="Execute scanner on live market data",
+                keywords=("execute", "run", "scanner", "live", "market"),
+                required_params=frozenset({"scanner_code", "symbols"}),
+                optional_params=frozenset({"date"}),
+                function=_lazy_tool("scanner_executor")
+            )
         }
 
     def process_request(self, user_input: str, context: Optional[Dict] = None) -> Dict[str, Any]:
@@ -175,49 +341,182 @@ class RenataOrchestrator:
             Dictionary with response and metadata
         """
 
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
+        user_input_lower = user_input.lower()
 
         # Step 1: Understand intent
-        intent = self._understand_intent(user_input)
+        intent = self._understand_intent(user_input, user_input_lower)
+
+        return self._run_intent(intent, user_input, user_input_lower, context, start_ns)
 
-        # Step 2: Select tools
-        selected_tools = self._select_tools(intent, user_input)
+    def process_requests_batch(self, user_inputs: List[str], context: Optional[Dict] = None,
+                               max_workers: int = BATCH_WORKERS) -> List[Any]:
+        """
+        Process several independent requests, returning results in input order
+
+        All intents are classified up front, then the requests run
+        concurrently on up to max_workers threads of their own (never the
+        tool pool, which their workflows use). Each entry is the dictionary
+        process_request() returns, or the exception that request raised,
+        so one failure doesn't lose the rest of the batch. Concurrent
+        requests each get their own copy of a context DataFrame.
+        """
+
+        lowered = [user_input.lower() for user_input in user_inputs]
+        intents = [self._understand_intent(user_input, lower) for user_input, lower in zip(user_inputs, lowered)]
+        concurrent = len(user_inputs) > 1 and max_workers > 1
+
+        def run(i: int):
+            request_context = context
+            if concurrent and context and "df" in context:
+                request_context = {**context, "df": context["df"].copy()}
+            try:
+                return self._run_intent(intents[i], user_inputs[i], lowered[i], request_context, time.perf_counter_ns())
+            except Exception as e:
+                return e
+
+        if not concurrent:
+            return [run(i) for i in range(len(user_inputs))]
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(user_inputs)),
+                                thread_name_prefix="renata-request") as pool:
+            return list(pool.map(run, range(len(user_inputs))))
+
+    def process_command(self, command: str, user_input: str, context: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        Process a request that starts with an explicit command verb
+
+        The verb (a COMMAND_INTENTS key) fixes the intent, so keyword
+        classification is skipped; details are still extracted from the
+        full input. Returns the same dictionary as process_request().
+        """
+
+        start_ns = time.perf_counter_ns()
+        user_input_lower = user_input.lower()
+
+        intent_type = self.COMMAND_INTENTS[command]
+        intent = {
+            "type": intent_type,
+            "details": self._extract_details(user_input, intent_type, user_input_lower),
+            "original_input": user_input
+        }
+
+        return self._run_intent(intent, user_input, user_input_lower, context, start_ns)
+
+    def _run_intent(self, intent: Dict[str, Any], user_input: str, user_input_lower: str,
+                    context: Optional[Dict], start_ns: int) -> Dict[str, Any]:
+        """
+        Select tools for an understood intent, run them and format the result
+
+        When every scheduled tool (including producers the DAG adds) is
+        cacheable and the context is JSON-serializable, the finished result
+        is memoized on (intent type, input, context); a repeat gets a copy
+        with its own execution_time.
+        """
+
+        # Step 2: Select tools and schedule them
+        selected_tools = self._select_tools(intent, user_input_lower)
+        dag = self._build_dag(selected_tools, context)
+        scheduled = dag[0]
+
+        cache_key = None
+        if all(tool.cacheable for tool in scheduled):
+            try:
+                cache_key = (intent["type"], user_input, json.dumps(context or {}, sort_keys=True))
+            except (TypeError, ValueError):
+                pass  # e.g. a DataFrame in the context
+
+        if cache_key is not None:
+            with self._request_cache_lock:
+                cached = self._request_cache.get(cache_key)
+                if cached is not None:
+                    self._request_cache.move_to_end(cache_key)
+            if cached is not None:
+                result = copy.deepcopy(cached)
+                result["execution_time"] = (time.perf_counter_ns() - start_ns) / 1e9
+                return result
 
         # Step 3: Execute workflow
-        results = self._execute_workflow(selected_tools, user_input, context)
+        results = self._execute_workflow(dag, user_input, context)
 
         # Step 4: Format response
         response = self._format_response(results, intent)
 
-        execution_time = time.time() - start_time
+        result = self._build_result(response, intent, scheduled, results, start_ns)
+
+        if cache_key is not None:
+            with self._request_cache_lock:
+                self._request_cache[cache_key] = copy.deepcopy(result)
+                if len(self._request_cache) > self.REQUEST_CACHE_SIZE:
+                    self._request_cache.popitem(last=False)
+
+        return result
+
+    def process_request_stream(self, user_input: str, context: Optional[Dict] = None) -> Iterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """
+        Process user request, yielding output as it becomes available
+
+        Yields (chunk, None) for a progress line as each tool finishes, then
+        for each line of the formatted response, and finally ("", result)
+        with the same dictionary process_request() returns.
+        """
+
+        start_ns = time.perf_counter_ns()
+        user_input_lower = user_input.lower()
+
+        intent = self._understand_intent(user_input, user_input_lower)
+        dag = self._build_dag(self._select_tools(intent, user_input_lower), context)
+
+        results = []
+        for tool, result in self._iter_workflow(dag, user_input, context):
+            results.append(result)
+            yield _glyphs(f"🔧 {tool.name}: {result.status.value} ({result.execution_time:.4f}s)\n"), None
+
+        response = self._format_response(results, intent)
+        for line in response.splitlines(keepends=True):
+            yield line, None
+
+        yield "", self._build_result(response, intent, dag[0], results, start_ns)
+
+    def _build_result(self, response: str, intent: Dict[str, Any], scheduled: List[ToolSpec],
+                      results: List[ToolResult], start_ns: int) -> Dict[str, Any]:
+        """Result dictionary returned for a processed request (start_ns from time.perf_counter_ns())"""
+
+        execution_time = (time.perf_counter_ns() - start_ns) / 1e9
 
         return {
             "response": response,
             "intent": intent,
-            "tools_used": [tool["name"] for tool in selected_tools],
+            "tools_used": [tool.name for tool in scheduled],
             "execution_time": execution_time,
-            "success": all(r.status == ToolStatus.SUCCESS for r in results)
+            "success": all(r.status is _SUCCESS for r in results)
         }
 
-    def _understand_intent(self, user_input: str) -> Dict[str, Any]:
+    def _understand_intent(self, user_input: str, user_input_lower: Optional[str] = None) -> Dict[str, Any]:
         """
         Understand user intent from natural language
 
+        Args:
+            user_input: Request as typed (tickers are read from it)
+            user_input_lower: user_input.lower(), if the caller already has it
+
         Returns:
             Dictionary with intent classification
         """
 
-        user_input_lower = user_input.lower()
+        if user_input_lower is None:
+            user_input_lower = user_input.lower()
 
-        # Classify intent type
+        # Classify intent type from one keyword pass
         # Check for multi-intent requests first
-        has_generate = any(word in user_input_lower for word in ["generate", "create", "build"])
-        has_validate = any(word in user_input_lower for word in ["validate", "check", "compliance"])
-        has_backtest = any(word in user_input_lower for word in ["backtest", "performance"])
-        has_analyze = any(word in user_input_lower for word in ["analyze", "indicator", "structure", "trend", "market"])
-        has_optimize = any(word in user_input_lower for word in ["optimize", "tune"])
-        has_plan = any(word in user_input_lower for word in ["plan", "strategy", "implementation"])
-        has_execute = any(word in user_input_lower for word in ["execute", "run"])
+        flags = self._INTENT_MATCHER.groups(user_input_lower)
+        has_generate = "generate" in flags
+        has_validate = "validate" in flags
+        has_backtest = "backtest" in flags
+        has_analyze = "analyze" in flags
+        has_optimize = "optimize" in flags
+        has_plan = "plan" in flags
+        has_execute = "execute" in flags
 
         # Priority: multi-tool workflows > specific intents
         if has_generate and has_validate:
@@ -242,7 +541,7 @@ class RenataOrchestrator:
             intent_type = "GENERAL"
 
         # Extract details
-        details = self._extract_details(user_input, intent_type)
+        details = self._extract_details(user_input, intent_type, user_input_lower)
 
         return {
             "type": intent_type,
@@ -250,43 +549,34 @@ class RenataOrchestrator:
             "original_input": user_input
         }
 
-    def _extract_details(self, user_input: str, intent_type: str) -> Dict[str, Any]:
-        """Extract relevant details from user input"""
+    def _extract_details(self, user_input: str, intent_type: str, user_input_lower: str) -> Dict[str, Any]:
+        """Extract relevant details from user input (user_input_lower is user_input.lower())"""
 
         details = {}
-        user_input_lower = user_input.lower()
+        flags = self._DETAIL_MATCHER.groups(user_input_lower)
 
         # Detect setup types
-        setup_types = []
-        if "backside" in user_input_lower or "gap" in user_input_lower:
-            setup_types.append("BACKSIDE_B")
-        if "d2" in user_input_lower:
-            setup_types.append("D2")
-        if "mdr" in user_input_lower or "multi" in user_input_lower:
-            setup_types.append("MDR")
-        if "fbo" in user_input_lower:
-            setup_types.append("FBO")
+        setup_types = [setup for setup in self.SETUP_KEYWORDS if setup in flags]
 
         if setup_types:
             details["setup_types"] = setup_types
 
         # Detect complexity
-        if any(word in user_input_lower for word in ["simple", "basic"]):
+        if "simple" in flags:
             details["complexity"] = "simple"
-        elif any(word in user_input_lower for word in ["complex", "advanced", "comprehensive"]):
+        elif "complex" in flags:
             details["complexity"] = "complex"
         else:
             details["complexity"] = "medium"
 
         # Detect tickers/symbols
-        ticker_pattern = r'\b[A-Z]{1,5}\b'
-        tickers = re.findall(ticker_pattern, user_input)
+        tickers = self._TICKER_RE.findall(user_input)
         if tickers:
             details["tickers"] = tickers
 
         return details
 
-    def _select_tools(self, intent: Dict[str, Any], user_input: str) -> List[Dict]:
+    def _select_tools(self, intent: Dict[str, Any], user_input_lower: str) -> List[ToolSpec]:
         """
         Select appropriate tools based on intent
 
@@ -295,126 +585,195 @@ class RenataOrchestrator:
         """
 
         intent_type = intent["type"]
-        details = intent["details"]
-        selected = []
 
-        # Tool selection logic
-        if intent_type == "GENERATE_SCANNER":
-            selected.append(self.tool_registry["v31_scanner_generator"])
-            selected.append(self.tool_registry["v31_validator"])
+        if intent_type == "VALIDATE":
+            names = [name for trigger, name in self.VALIDATE_TOOLS if trigger in user_input_lower]
+        else:
+            names = self.INTENT_TOOLS.get(intent_type, ())
 
-        elif intent_type == "VALIDATE":
-            if "scanner" in user_input.lower():
-                selected.append(self.tool_registry["v31_validator"])
-            if "a+" in user_input.lower():
-                selected.append(self.tool_registry["a_plus_analyzer"])
+        return [self.tool_registry[name] for name in names]
 
-        elif intent_type == "BACKTEST":
-            selected.append(self.tool_registry["quick_backtester"])
-            selected.append(self.tool_registry["backtest_analyzer"])
+    def _execute_workflow(self, dag: Tuple[List[ToolSpec], Dict[int, set]], user_input: str,
+                          context: Optional[Dict]) -> List[ToolResult]:
+        """
+        Execute scheduled tools as workflow
 
-        elif intent_type == "ANALYZE":
-            selected.append(self.tool_registry["indicator_calculator"])
-            selected.append(self.tool_registry["market_structure_analyzer"])
+        Returns:
+            List of tool results
+        """
 
-        elif intent_type == "OPTIMIZE":
-            selected.append(self.tool_registry["parameter_optimizer"])
-            selected.append(self.tool_registry["sensitivity_analyzer"])
+        return [result for _, result in self._iter_workflow(dag, user_input, context)]
 
-        elif intent_type == "PLAN":
-            selected.append(self.tool_registry["build_plan_generator"])
+    def _iter_workflow(self, dag: Tuple[List[ToolSpec], Dict[int, set]], user_input: str,
+                       context: Optional[Dict]) -> Iterator[Tuple[ToolSpec, ToolResult]]:
+        """
+        Execute scheduled tools, yielding (tool, result) in schedule order
+
+        dag is the (scheduled, graph) pair from _build_dag. Tools run layer
+        by layer in dependency order.
+        Inputs for a layer are prepared up front from the outputs produced
+        so far, then the tools of a multi-tool layer run concurrently on the
+        shared tool pool. A FATAL tool error stops the workflow after that
+        tool.
+        """
 
-        elif intent_type == "EXECUTE":
-            selected.append(self.tool_registry["scanner_executor"])
+        scheduled, graph = dag
+        sorter = TopologicalSorter(graph)
+        sorter.prepare()
+
+        # Declared outputs of successful tools, read by later layers
+        outputs = {}
+
+        while sorter.is_active():
+            ready = sorted(sorter.get_ready())
+            layer = [scheduled[i] for i in ready]
+
+            # Tools sharing a layer run at the same time, so none of them
+            # may see another's in-place changes to the context frame
+            concurrent = len(layer) > 1
+
+            calls = []
+            for tool in layer:
+                try:
+                    # Prepare input for tool
+                    tool_input = self._prepare_tool_input(tool, user_input, context, outputs, copy_df=concurrent)
+                except Exception as e:
+                    calls.append((tool, (self._error_result(e), True)))
+                    continue
+
+                # Execute tool (off-thread only when it has company)
+                if not concurrent:
+                    calls.append((tool, self._call_tool(tool, tool_input)))
+                else:
+                    calls.append((tool, _TOOL_POOL.submit(self._call_tool, tool, tool_input)))
+
+            for tool, outcome in calls:
+                result, raised = outcome.result() if isinstance(outcome, Future) else outcome
+                if result.status is _SUCCESS and result.result:
+                    for output in tool.outputs:
+                        if output in result.result:
+                            outputs[output] = result.result[output]
+                yield tool, result
 
-        return selected
+                # Stop if critical error
+                if not raised and result.status is _ERROR and "FATAL" in str(result.error).upper():
+                    for _, other in calls:
+                        if isinstance(other, Future):
+                            other.cancel()
+                    return
 
-    def _execute_workflow(self, tools: List[Dict], user_input: str, context: Optional[Dict]) -> List[ToolResult]:
-        """
-        Execute selected tools as workflow
+            sorter.done(*ready)
 
-        Returns:
-            List of tool results
+    def _build_dag(self, tools: List[ToolSpec], context: Optional[Dict]) -> Tuple[List[ToolSpec], Dict[int, set]]:
         """
+        Build the dependency graph for a set of selected tools
 
-        results = []
+        A tool depends on the latest earlier tool whose "outputs" include
+        one of its required params (the validator on the generator's
+        scanner_code). A param listed in a tool's "produce_if_missing"
+        that neither the context nor an earlier tool provides gets its
+        producer scheduled first, so it runs once as part of the workflow.
 
-        for tool in tools:
-            try:
-                # Prepare input for tool
-                tool_input = self._prepare_tool_input(tool, user_input, context, results)
+        Returns:
+            (scheduled tools, graph mapping each tool's index in scheduled
+            to the indices it depends on)
+        """
 
-                # Execute tool
-                result = tool["function"](tool_input)
-                results.append(result)
+        scheduled = []
+        graph = {}
+        produced_by = {}
 
-                # Stop if critical error
-                if result.status == ToolStatus.ERROR and "FATAL" in str(result.error).upper():
-                    break
+        def schedule(tool):
+            index = len(scheduled)
+            graph[index] = {produced_by[p] for p in tool.required_params if p in produced_by}
+            scheduled.append(tool)
+            for output in tool.outputs:
+                produced_by[output] = index
 
-            except Exception as e:
-                # Create error result
-                results.append(ToolResult(
-                    status=ToolStatus.ERROR,
-                    result=None,
-                    error={"code": "EXECUTION_ERROR", "message": str(e)},
-                    warnings=None,
-                    execution_time=0,
-                    tool_version="1.0.0"
-                ))
-
-        return results
-
-    def _prepare_tool_input(self, tool: Dict, user_input: str, context: Optional[Dict], previous_results: List) -> Dict[str, Any]:
+        for tool in tools:
+            for param in tool.produce_if_missing:
+                if param not in produced_by and not (context and param in context) and param in self.producers:
+                    schedule(self.producers[param])
+            schedule(tool)
+
+        return scheduled, graph
+
+    @staticmethod
+    def _call_tool(tool: ToolSpec, tool_input: Dict[str, Any]) -> Tuple[ToolResult, bool]:
+        """Run one tool, returning (result, raised)"""
+
+        try:
+            if tool.cacheable:
+                try:
+                    input_key = json.dumps(tool_input, sort_keys=True)
+                except (TypeError, ValueError):
+                    input_key = None  # not JSON-serializable, run it directly
+                if input_key is not None:
+                    # Callers get their own result and this call's timing
+                    start_ns = time.perf_counter_ns()
+                    cached = _cached_tool_call(tool.function, input_key)
+                    return dataclasses.replace(
+                        cached,
+                        result=copy.deepcopy(cached.result),
+                        warnings=copy.deepcopy(cached.warnings),
+                        execution_time=(time.perf_counter_ns() - start_ns) / 1e9
+                    ), False
+            return tool.function(tool_input), False
+        except Exception as e:
+            return RenataOrchestrator._error_result(e), True
+
+    @staticmethod
+    def _error_result(error: Exception) -> ToolResult:
+        """Error result for a tool that raised"""
+
+        return ToolResult(
+            status=ToolStatus.ERROR,
+            result=None,
+            error={"code": "EXECUTION_ERROR", "message": str(error)},
+            warnings=None,
+            execution_time=0,
+            tool_version="1.0.0"
+        )
+
+    def _prepare_tool_input(self, tool: ToolSpec, user_input: str, context: Optional[Dict], outputs: Dict[str, Any],
+                            copy_df: bool = False) -> Dict[str, Any]:
         """
         Prepare input parameters for tool
 
+        Args:
+            outputs: Declared outputs of the tools that have already run
+            copy_df: Give the tool its own copy of the context DataFrame
+                (tools like the Indicator Calculator add columns in place)
+
         Returns:
             Dictionary with tool input parameters
         """
 
-        tool_name = tool["name"]
+        tool_name = tool.name
         input_data = {}
 
         # Use context if available
         if context:
-            if "df" in context and "df" in tool.get("required_params", []):
-                input_data["df"] = context["df"]
-            if "scanner_code" in context and "scanner_code" in tool.get("required_params", []):
+            if "df" in context and "df" in tool.required_params:
+                input_data["df"] = context["df"].copy() if copy_df else context["df"]
+            if "scanner_code" in context and "scanner_code" in tool.required_params:
                 input_data["scanner_code"] = context["scanner_code"]
 
-        # Extract from previous results
-        for result in previous_results:
-            if result.status == ToolStatus.SUCCESS and result.result:
-                if "scanner_code" in result.result and "scanner_code" in tool.get("required_params", []):
-                    input_data["scanner_code"] = result.result["scanner_code"]
+        # Outputs of earlier tools take precedence over the context
+        for param in tool.required_params:
+            if param in outputs:
+                input_data[param] = outputs[param]
 
         # Tool-specific preparation
         if tool_name == "V31 Scanner Generator":
             input_data["description"] = user_input
             input_data["parameters"] = context.get("parameters", {}) if context else {}
 
-        elif tool_name == "V31 Validator":
-            if "scanner_code" not in input_data:
-                # Generate scanner first
-                scanner_result = v31_scanner_generator({"description": user_input})
-                if scanner_result.status == ToolStatus.SUCCESS:
-                    input_data["scanner_code"] = scanner_result.result["scanner_code"]
-
         elif tool_name == "Indicator Calculator":
             if "df" not in input_data:
-                # Use sample data if no context
-                import pandas as pd
-                import numpy as np
-                dates = pd.date_range('2024-01-01', periods=100, freq='D')
-                input_data["df"] = pd.DataFrame({
-                    'date': dates,
-                    'open': np.random.uniform(90, 110, 100),
-                    'high': np.random.uniform(90, 110, 100),
-                    'low': np.random.uniform(90, 110, 100),
-                    'close': np.random.uniform(90, 110, 100),
-                    'volume': np.random.randint(1000000, 10000000, 100)
-                })
+                # Use sample data if no context (the tool adds columns, so
+                # hand it a shallow copy of the shared frame)
+                input_data["df"] = _sample_df().copy(deep=False)
             if "ticker" not in input_data:
                 input_data["ticker"] = context.get("ticker", "AAPL") if context else "AAPL"
             # Add default indicators if not specified
@@ -427,7 +786,7 @@ class RenataOrchestrator:
             input_data["complexity_level"] = context.get("complexity_level", "medium") if context else "medium"
 
         # Add default values for optional params
-        for param in tool.get("optional_params", []):
+        for param in tool.optional_params:
             if param not in input_data:
                 input_data[param] = None  # Tool will use default
 
@@ -441,12 +800,17 @@ class RenataOrchestrator:
             Formatted response string
         """
 
+        return _glyphs(self._format_results(results, intent))
+
+    def _format_results(self, results: List[ToolResult], intent: Dict) -> str:
+        """Formatted response with emoji, picked by error state and intent type"""
+
         intent_type = intent["type"]
 
         # Check for errors
-        errors = [r for r in results if r.status == ToolStatus.ERROR]
-        if errors:
-            error_msg = f"❌ Error: {errors[0].error.get('message', 'Unknown error')}"
+        first_error = next((r for r in results if r.status is _ERROR), None)
+        if first_error is not None:
+            error_msg = f"❌ Error: {first_error.error.get('message', 'Unknown error')}"
             return error_msg
 
         # Format based on intent type
@@ -469,7 +833,7 @@ class RenataOrchestrator:
         response = ["✅ **Scanner Generated Successfully!**\n"]
 
         for result in results:
-            if result.status == ToolStatus.SUCCESS:
+            if result.status is _SUCCESS:
                 if "scanner_code" in result.result:
                     response.append(f"📄 Scanner code: {len(result.result['scanner_code'])} characters")
                 if "compliance_score" in result.result:
@@ -484,7 +848,7 @@ class RenataOrchestrator:
         response = ["✅ **Analysis Complete**\n"]
 
         for result in results:
-            if result.status == ToolStatus.SUCCESS:
+            if result.status is _SUCCESS:
                 if "trend" in result.result:
                     trend = result.result["trend"]["direction"]
                     response.append(f"📈 Trend: {trend}")
@@ -502,7 +866,7 @@ class RenataOrchestrator:
         response = ["✅ **Optimization Complete**\n"]
 
         for result in results:
-            if result.status == ToolStatus.SUCCESS:
+            if result.status is _SUCCESS:
                 if "best_parameters" in result.result:
                     response.append(f"🎯 Best Parameters: {result.result['best_parameters']}")
                 if "robustness_score" in result.result:
@@ -516,7 +880,7 @@ class RenataOrchestrator:
         response = ["✅ **Backtest Complete**\n"]
 
         for result in results:
-            if result.status == ToolStatus.SUCCESS:
+            if result.status is _SUCCESS:
                 if "total_return" in result.result:
                     response.append(f"📊 Total Return: {result.result['total_return']:.2f}%")
                 if "win_rate" in result.result:
@@ -532,7 +896,7 @@ class RenataOrchestrator:
         response = ["✅ **Implementation Plan Generated**\n"]
 
         for result in results:
-            if result.status == ToolStatus.SUCCESS:
+            if result.status is _SUCCESS:
                 if "strategy_name" in result.result:
                     response.append(f"📋 Strategy: {result.result['strategy_name']}")
                 if "implementation_steps" in result.result:
@@ -554,6 +918,65 @@ class RenataOrchestrator:
         return "\n".join(response)
 
 
+@functools.lru_cache(maxsize=1)
+def _sample_df():
+    """Random 100-day OHLCV frame used when no data is supplied, built once per process"""
+
+    import pandas as pd
+    import numpy as np
+
+    logger.warning("No data supplied; indicator requests will run on a synthetic sample DataFrame")
+    dates = pd.date_range('2024-01-01', periods=100, freq='D')
+    return pd.DataFrame({
+        'date': dates,
+        'open': np.random.uniform(90, 110, 100),
+        'high': np.random.uniform(90, 110, 100),
+        'low': np.random.uniform(90, 110, 100),
+        'close': np.random.uniform(90, 110, 100),
+        'volume': np.random.randint(1000000, 10000000, 100)
+    })
+
+
+@functools.lru_cache(maxsize=None)
+def _shared_registry() -> Tuple[Dict[str, ToolSpec], Dict[str, ToolSpec]]:
+    """Tool registry and output -> producing tool map, built once per process"""
+
+    registry = RenataOrchestrator._build_tool_registry()
+    producers = {
+        output: tool
+        for tool in registry.values()
+        for output in tool.outputs
+    }
+    return registry, producers
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_tool_call(function, input_key: str) -> ToolResult:
+    """
+    Run a cacheable tool on its JSON-encoded input, once per distinct input
+
+    The ToolResult is shared between callers, so it is never handed out
+    directly; _call_tool returns a copy with its own execution_time.
+    """
+
+    return function(json.loads(input_key))
+
+
+_orchestrator: Optional[RenataOrchestrator] = None
+_orchestrator_lock = threading.Lock()
+
+
+def get_orchestrator() -> RenataOrchestrator:
+    """Process-wide orchestrator, created on first use"""
+
+    global _orchestrator
+    if _orchestrator is None:
+        with _orchestrator_lock:
+            if _orchestrator is None:
+                _orchestrator = RenataOrchestrator()
+    return _orchestrator
+
+
 # Convenience function for direct usage
 def process_user_request(user_input: str, context: Optional[Dict] = None) -> Dict[str, Any]:
     """
@@ -566,8 +989,7 @@ def process_user_request(user_input: str, context: Optional[Dict] = None) -> Dic
     Returns:
         Dictionary with response and metadata
     """
-    orchestrator = RenataOrchestrator()
-    return orchestrator.process_request(user_input, context)
+    return get_orchestrator().process_request(user_input, context)
 
 
 if __name__ == "__main__":
@@ -585,10 +1007,15 @@ if __name__ == "__main__":
         "Create implementation plan for momentum strategy"
     ]
 
-    for request in test_requests:
+    start_ns = time.perf_counter_ns()
+    batch_results = orchestrator.process_requests_batch(test_requests)
+    batch_time = (time.perf_counter_ns() - start_ns) / 1e9
+
+    for request, result in zip(test_requests, batch_results):
         print(f"\n👤 User: {request}")
-        result = orchestrator.process_request(request)
         print(f"\n🤖 Renata: {result['response']}")
         print(f"\n   Tools: {', '.join(result['tools_used'])}")
         print(f"   Time: {result['execution_time']:.4f}s")
         print(f"   Success: {result['success']}")
+
+    print(f"\n⏱️ Batch time: {batch_time:.4f}s")
@@ -19,26 +19,40 @@ Status: Task 2.2 - Implementing Market Analysis Tools
 __version__ = "1.0.0"
 
 # Import shared types
-from .tool_types import ToolStatus, ToolResult
-
-# Import all tools (will be available as we implement them)
-from .v31_scanner_generator import v31_scanner_generator
-from .v31_validator import v31_validator
-from .scanner_executor import scanner_executor
-from .indicator_calculator import indicator_calculator
-from .market_structure_analyzer import market_structure_analyzer
-from .daily_context_detector import daily_context_detector
-from .a_plus_analyzer import a_plus_analyzer
-from .quick_backtester import quick_backtester
-from .parameter_optimizer import parameter_optimizer
-from .sensitivity_analyzer import sensitivity_analyzer
-from .backtest_generator import backtest_generator
-from .backtest_analyzer import backtest_analyzer
-from .build_plan_generator import build_plan_generator
+from .tool_types import ToolStatus, ToolResult, ToolSpec
+
+# Tools are imported on first access (PEP 562), so importing one tool or the
+# shared types doesn't pull in every tool's dependencies (pandas, requests, ...)
+_TOOL_MODULES = (
+    "v31_scanner_generator",
+    "v31_validator",
+    "scanner_executor",
+    "indicator_calculator",
+    "market_structure_analyzer",
+    "daily_context_detector",
+    "a_plus_analyzer",
+    "quick_backtester",
+    "parameter_optimizer",
+    "sensitivity_analyzer",
+    "backtest_generator",
+    "backtest_analyzer",
+    "build_plan_generator",
+)
+
+
+def __getattr__(name):
+    if name in _TOOL_MODULES:
+        import importlib
+        tool = getattr(importlib.import_module(f".{name}", __name__), name)
+        globals()[name] = tool
+        return tool
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "ToolStatus",
     "ToolResult",
+    "ToolSpec",
     # Core Scanner Tools
     "v31_scanner_generator",
     "v31_validator",
@@ -11,7 +11,9 @@ This tool does ONE thing: Validate if a scanner would have caught A+ setups.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Optional, List
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, List
+import functools
 import time
 import re
 
@@ -21,6 +23,27 @@ try:
 except ImportError:
     from tool_types import ToolStatus, ToolResult
 
+# Capability checks run against the scanner source (case-insensitive)
+_CAPABILITY_PATTERNS = {
+    "has_gap_detection": re.compile(r'gap', re.IGNORECASE),
+    "has_ema_cloud": re.compile(r'ema.*cloud|cloud.*ema', re.IGNORECASE),
+    "has_volume_filter": re.compile(r'volume', re.IGNORECASE),
+    "has_atr_filter": re.compile(r'atr', re.IGNORECASE),
+    "has_rsi_indicator": re.compile(r'rsi', re.IGNORECASE),
+    "has_macd_indicator": re.compile(r'macd', re.IGNORECASE),
+    "has_stage1_detection": re.compile(r'stage1|stage_1|get_stage1', re.IGNORECASE),
+    "has_stage2_processing": re.compile(r'stage2|stage_2|process_symbols', re.IGNORECASE),
+}
+
+# Common setup patterns
+_SETUP_PATTERNS = {
+    "BACKSIDE_B": re.compile(r'backside.?b|backside_b', re.IGNORECASE),
+    "D2": re.compile(r'\bd2\b|daily.?continuation', re.IGNORECASE),
+    "MDR": re.compile(r'\bmdr\b|multi.?day.?range', re.IGNORECASE),
+    "FBO": re.compile(r'\bfbo\b|first.?breakout', re.IGNORECASE),
+    "T30": re.compile(r'\bt30\b|30.?minute|opening.?range', re.IGNORECASE),
+}
+
 
 def a_plus_analyzer(input_data: Dict[str, Any]) -> ToolResult:
     """
@@ -64,8 +87,8 @@ def a_plus_analyzer(input_data: Dict[str, Any]) -> ToolResult:
         return_details = input_data.get("return_details", True)
         tolerance_pct = input_data.get("tolerance_pct", 0.02)
 
-        # Analyze scanner capabilities
-        capabilities = analyze_scanner_capabilities(scanner_code)
+        # Analyze scanner capabilities (once per distinct scanner)
+        capabilities = _analyze_cached(scanner_code)
 
         # Check each A+ example
         results = []
@@ -93,7 +116,10 @@ def a_plus_analyzer(input_data: Dict[str, Any]) -> ToolResult:
             "total_examples": total_examples,
             "caught_examples": caught_examples,
             "missed_examples": total_examples - caught_examples,
-            "scanner_capabilities": capabilities,
+            "scanner_capabilities": {
+                **capabilities,
+                "setup_types_detected": list(capabilities["setup_types_detected"])
+            },
             "threshold": strict_mode and "100%" or "70%",
             "example_results": results if return_details else []
         }
@@ -185,16 +211,10 @@ def analyze_scanner_capabilities(scanner_code: str) -> Dict[str, Any]:
     """
 
     capabilities = {
-        "has_gap_detection": bool(re.search(r'gap', scanner_code, re.IGNORECASE)),
-        "has_ema_cloud": bool(re.search(r'ema.*cloud|cloud.*ema', scanner_code, re.IGNORECASE)),
-        "has_volume_filter": bool(re.search(r'volume', scanner_code, re.IGNORECASE)),
-        "has_atr_filter": bool(re.search(r'atr', scanner_code, re.IGNORECASE)),
-        "has_rsi_indicator": bool(re.search(r'rsi', scanner_code, re.IGNORECASE)),
-        "has_macd_indicator": bool(re.search(r'macd', scanner_code, re.IGNORECASE)),
-        "has_stage1_detection": bool(re.search(r'stage1|stage_1|get_stage1', scanner_code, re.IGNORECASE)),
-        "has_stage2_processing": bool(re.search(r'stage2|stage_2|process_symbols', scanner_code, re.IGNORECASE)),
-        "setup_types_detected": extract_setup_types(scanner_code)
+        name: bool(pattern.search(scanner_code))
+        for name, pattern in _CAPABILITY_PATTERNS.items()
     }
+    capabilities["setup_types_detected"] = extract_setup_types(scanner_code)
 
     # Calculate capability score
     capability_count = sum([
@@ -210,6 +230,20 @@ def analyze_scanner_capabilities(scanner_code: str) -> Dict[str, Any]:
     return capabilities
 
 
+@functools.lru_cache(maxsize=128)
+def _analyze_cached(scanner_code: str) -> Mapping[str, Any]:
+    """
+    analyze_scanner_capabilities(), memoized per scanner_code
+
+    The entry is shared between callers, so it is returned read-only with
+    setup_types_detected as a tuple.
+    """
+
+    capabilities = analyze_scanner_capabilities(scanner_code)
+    capabilities["setup_types_detected"] = tuple(capabilities["setup_types_detected"])
+    return MappingProxyType(capabilities)
+
+
 def extract_setup_types(scanner_code: str) -> List[str]:
     """
     Extract setup types from scanner code
@@ -218,28 +252,13 @@ def extract_setup_types(scanner_code: str) -> List[str]:
         List of detected setup types
     """
 
-    setup_types = []
-
-    # Common setup patterns
-    patterns = {
-        "backside_b": r'backside.?b|backside_b',
-        "d2": r'\bd2\b|daily.?continuation',
-        "mdr": r'\bmdr\b|multi.?day.?range',
-        "fbo": r'\bfbo\b|first.?breakout',
-        "t30": r'\bt30\b|30.?minute|opening.?range'
-    }
-
-    for setup_type, pattern in patterns.items():
-        if re.search(pattern, scanner_code, re.IGNORECASE):
-            setup_types.append(setup_type.upper())
-
-    return setup_types
+    return [setup_type for setup_type, pattern in _SETUP_PATTERNS.items() if pattern.search(scanner_code)]
 
 
 def check_a_plus_example(
     scanner_code: str,
     example: Dict[str, Any],
-    capabilities: Dict[str, Any],
+    capabilities: Mapping[str, Any],
     tolerance_pct: float
 ) -> Dict[str, Any]:
 
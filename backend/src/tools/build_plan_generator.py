@@ -20,6 +20,15 @@ try:
 except ImportError:
     from tool_types import ToolStatus, ToolResult
 
+# Description terms that imply each component
+GAP_TERMS = ("gap", "overnight", "pre-market")
+TREND_TERMS = ("trend", "ema", "moving average")
+MULTI_TIMEFRAME_TERMS = ("multi", "multiple", "different time")
+
+# Setup types that need pre-market / intraday data
+PREMARKET_SETUPS = frozenset({"BACKSIDE_B", "FBO", "T30"})
+INTRADAY_SETUPS = frozenset({"FBO", "T30", "MDR"})
+
 
 def build_plan_generator(input_data: Dict[str, Any]) -> ToolResult:
     """
@@ -199,11 +208,12 @@ def analyze_requirements(description: str, setup_types: List[str], complexity: s
     """
 
     # Detect required components
-    has_gap_detection = any(term in description.lower() for term in ["gap", "overnight", "pre-market"])
-    has_trend_detection = any(term in description.lower() for term in ["trend", "ema", "moving average"])
-    has_volume_analysis = "volume" in description.lower()
-    has_multi_timeframe = any(term in description.lower() for term in ["multi", "multiple", "different time"])
-    has_backtesting = "backtest" in description.lower()
+    description_lower = description.lower()
+    has_gap_detection = any(term in description_lower for term in GAP_TERMS)
+    has_trend_detection = any(term in description_lower for term in TREND_TERMS)
+    has_volume_analysis = "volume" in description_lower
+    has_multi_timeframe = any(term in description_lower for term in MULTI_TIMEFRAME_TERMS)
+    has_backtesting = "backtest" in description_lower
 
     # Calculate technical complexity
     technical_components = 0
@@ -254,8 +264,8 @@ def estimate_data_requirements(setup_types: List[str], complexity: str) -> Dict[
     return {
         "required_fields": required_fields,
         "lookback_period": lookback_period,
-        "premarket_required": any(s in setup_types for s in ["BACKSIDE_B", "FBO", "T30"]),
-        "intraday_data": any(s in setup_types for s in ["FBO", "T30", "MDR"])
+        "premarket_required": not PREMARKET_SETUPS.isdisjoint(setup_types),
+        "intraday_data": not INTRADAY_SETUPS.isdisjoint(setup_types)
     }
 
 
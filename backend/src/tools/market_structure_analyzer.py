@@ -11,6 +11,7 @@ This tool does ONE thing: Analyze market structure from OHLCV data.
 
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 from typing import Dict, Any, Optional, List
 import time
 
@@ -293,47 +294,36 @@ def detect_pivots(df: pd.DataFrame, lookback: int, min_strength: float) -> tuple
     pivot_highs = []
     pivot_lows = []
 
-    # Detect pivot highs
-    for i in range(lookback, len(df) - lookback):
-        window_before = df['high'].iloc[i-lookback:i+lookback]
-        window_after = df['high'].iloc[i-lookback:i+lookback+1]
-
-        if (df['high'].iloc[i] == window_before.max() and
-            df['high'].iloc[i] > window_after.max()):
-
-            # Calculate strength
-            low_in_window = window_before.min()
-            strength = (df['high'].iloc[i] - low_in_window) / df['high'].iloc[i]
-
-            if strength >= min_strength:
-                pivot_type = "major" if strength > 0.05 else "minor"
-                pivot_highs.append({
-                    "date": str(df.index[i].date()),
-                    "price": float(df['high'].iloc[i]),
-                    "strength": round(strength, 3),
-                    "type": pivot_type
-                })
-
-    # Detect pivot lows
-    for i in range(lookback, len(df) - lookback):
-        window_before = df['low'].iloc[i-lookback:i+lookback]
-        window_after = df['low'].iloc[i-lookback:i+lookback+1]
-
-        if (df['low'].iloc[i] == window_before.min() and
-            df['low'].iloc[i] < window_after.min()):
-
-            # Calculate strength
-            high_in_window = window_before.max()
-            strength = (high_in_window - df['low'].iloc[i]) / df['low'].iloc[i]
-
-            if strength >= min_strength:
-                pivot_type = "major" if strength > 0.05 else "minor"
-                pivot_lows.append({
-                    "date": str(df.index[i].date()),
-                    "price": float(df['low'].iloc[i]),
-                    "strength": round(strength, 3),
-                    "type": pivot_type
-                })
+    n = len(df)
+    count = n - 2 * lookback  # bars with a full window on both sides
+    if lookback < 1 or count < 1:
+        return pivot_highs, pivot_lows
+
+    for column, pivots in (('high', pivot_highs), ('low', pivot_lows)):
+        values = _as_float_array(df[column])
+        center = values[lookback:n - lookback]
+
+        # Windows [i-lookback, i+lookback) and [i-lookback, i+lookback] for each bar i
+        before = sliding_window_view(values, 2 * lookback)[:count]
+        after = sliding_window_view(values, 2 * lookback + 1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if column == 'high':
+                # Strength against the opposite extreme of the window
+                hits = (center == np.fmax.reduce(before, axis=1)) & (center > np.fmax.reduce(after, axis=1))
+                strength = (center - np.fmin.reduce(before, axis=1)) / center
+            else:
+                hits = (center == np.fmin.reduce(before, axis=1)) & (center < np.fmin.reduce(after, axis=1))
+                strength = (np.fmax.reduce(before, axis=1) - center) / center
+
+        for j in np.flatnonzero(hits & (strength >= min_strength)):
+            pivot_strength = float(strength[j])
+            pivots.append({
+                "date": str(df.index[j + lookback].date()),
+                "price": float(center[j]),
+                "strength": round(pivot_strength, 3),
+                "type": "major" if pivot_strength > 0.05 else "minor"
+            })
 
     # Sort by date
     pivot_highs = sorted(pivot_highs, key=lambda x: x['date'])
@@ -350,29 +340,24 @@ def calculate_support_levels(df: pd.DataFrame, num_levels: int) -> List[Dict[str
         List of support level dictionaries
     """
 
-    pivot_lows = []
-
-    # Detect pivot lows
-    for i in range(10, len(df) - 10):
-        window_before = df['low'].iloc[i-5:i+6]
-        window_after = df['low'].iloc[i-5:i+6]
+    lows = _as_float_array(df['low'])
 
-        if (df['low'].iloc[i] == window_before.min() and
-            df['low'].iloc[i] <= window_after.min()):
-
-            pivot_lows.append({
-                "price": float(df['low'].iloc[i]),
-                "date": str(df.index[i].date()),
-                "strength": 0.0  # Will calculate
-            })
+    # Detect pivot lows: the lowest low of the 11 bars centred on them
+    pivot_lows = [
+        {
+            "price": float(lows[i]),
+            "date": str(df.index[i].date()),
+            "strength": 0.0  # Will calculate
+        }
+        for i in _level_pivot_indices(lows, np.fmin)
+    ]
 
     # Sort by price (ascending), then recency
     pivot_lows.sort(key=lambda x: x['price'])
 
     # Calculate strength for each pivot (number of tests)
     for pivot in pivot_lows:
-        tests = sum(1 for i in range(len(df))
-                     if abs(df['low'].iloc[i] - pivot['price']) < pivot['price'] * 0.01)
+        tests = _count_tests(lows, pivot['price'])
 
         pivot['strength'] = round(tests / len(df) * 100, 1)
         pivot['tests'] = tests
@@ -405,29 +390,24 @@ def calculate_resistance_levels(df: pd.DataFrame, num_levels: int) -> List[Dict[
         List of resistance level dictionaries
     """
 
-    pivot_highs = []
-
-    # Detect pivot highs
-    for i in range(10, len(df) - 10):
-        window_before = df['high'].iloc[i-5:i+6]
-        window_after = df['high'].iloc[i-5:i+6]
-
-        if (df['high'].iloc[i] == window_before.max() and
-            df['high'].iloc[i] >= window_after.max()):
+    highs = _as_float_array(df['high'])
 
-            pivot_highs.append({
-                "price": float(df['high'].iloc[i]),
-                "date": str(df.index[i].date()),
-                "strength": 0.0
-            })
+    # Detect pivot highs: the highest high of the 11 bars centred on them
+    pivot_highs = [
+        {
+            "price": float(highs[i]),
+            "date": str(df.index[i].date()),
+            "strength": 0.0
+        }
+        for i in _level_pivot_indices(highs, np.fmax)
+    ]
 
     # Sort by price (descending), then recency
     pivot_highs.sort(key=lambda x: x['price'], reverse=True)
 
     # Calculate strength
     for pivot in pivot_highs:
-        tests = sum(1 for i in range(len(df))
-                     if abs(df['high'].iloc[i] - pivot['price']) < pivot['price'] * 0.01)
+        tests = _count_tests(highs, pivot['price'])
 
         pivot['strength'] = round(tests / len(df) * 100, 1)
         pivot['tests'] = tests
@@ -450,6 +430,31 @@ def calculate_resistance_levels(df: pd.DataFrame, num_levels: int) -> List[Dict[
     return result
 
 
+def _as_float_array(series: pd.Series) -> np.ndarray:
+    """Column values as a float64 array (NaN for missing)"""
+    return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def _level_pivot_indices(values: np.ndarray, extreme: np.ufunc) -> np.ndarray:
+    """
+    Bars in [10, n-10) whose value is the extreme (np.fmax/np.fmin) of
+    the 11 bars centred on them
+    """
+    count = len(values) - 20
+    if count < 1:
+        return np.empty(0, dtype=np.intp)
+
+    # NaN-skipping like pandas max()/min(); window k is centred on bar k+10
+    windows = sliding_window_view(values, 11)[5:5 + count]
+    center = values[10:10 + count]
+    return np.flatnonzero(center == extreme.reduce(windows, axis=1)) + 10
+
+
+def _count_tests(values: np.ndarray, price: float) -> int:
+    """Bars whose value came within 1% of price"""
+    return int(np.count_nonzero(np.abs(values - price) < price * 0.01))
+
+
 def determine_current_position(
     df: pd.DataFrame,
     trend_analysis: Dict[str, Any],
@@ -504,22 +509,26 @@ def identify_trend_changes(df: pd.DataFrame, lookback: int) -> List[str]:
     current_direction = None
     bars_in_direction = 0
 
-    for i in range(lookback, len(df)):
-        # Check for higher high and higher low
-        if (df['high'].iloc[i] == df['high'].iloc[i-lookback:i].max() and
-            df['low'].iloc[i] == df['low'].iloc[i-lookback:i].min()):
+    n = len(df)
+    if lookback < 1 or n <= lookback:
+        return trend_changes
 
-            new_direction = "UPTREND"
+    highs = _as_float_array(df['high'])
+    lows = _as_float_array(df['low'])
 
-        # Check for lower high and lower low
-        elif (df['high'].iloc[i] == df['high'].iloc[i-lookback:i].min() and
-              df['low'].iloc[i] == df['low'].iloc[i-lookback:i].max()):
+    # Windows of the `lookback` bars before each bar i in [lookback, n)
+    high_windows = sliding_window_view(highs, lookback)[:n - lookback]
+    low_windows = sliding_window_view(lows, lookback)[:n - lookback]
+    high_now, low_now = highs[lookback:], lows[lookback:]
 
-            new_direction = "DOWNTREND"
+    # Check for higher high and higher low
+    uptrend = (high_now == np.fmax.reduce(high_windows, axis=1)) & (low_now == np.fmin.reduce(low_windows, axis=1))
+    # Check for lower high and lower low
+    downtrend = (high_now == np.fmin.reduce(high_windows, axis=1)) & (low_now == np.fmax.reduce(low_windows, axis=1))
 
-        else:
-            new_direction = "SIDEWAYS"
+    directions = np.where(uptrend, "UPTREND", np.where(downtrend, "DOWNTREND", "SIDEWAYS"))
 
+    for i, new_direction in enumerate(directions.tolist(), start=lookback):
         # Detect direction change
         if new_direction != current_direction:
             if current_direction is not None:
@@ -6,7 +6,7 @@ This module defines common data structures used across all tools.
 
 from enum import Enum
 from dataclasses import dataclass
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Callable, FrozenSet, NamedTuple, Optional, List, Tuple
 
 
 class ToolStatus(Enum):
@@ -16,12 +16,25 @@ class ToolStatus(Enum):
     PARTIAL = "partial"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ToolResult:
-    """Standard tool result structure"""
+    """Standard tool result structure (immutable once returned)"""
     status: ToolStatus
     result: Optional[Dict[str, Any]]
     error: Optional[Dict[str, str]]
     warnings: Optional[List[str]]
     execution_time: float
     tool_version: str
+
+
+class ToolSpec(NamedTuple):
+    """Orchestrator registry entry describing one tool"""
+    name: str
+    description: str
+    keywords: Tuple[str, ...]
+    required_params: FrozenSet[str]
+    optional_params: FrozenSet[str]
+    function: Callable[[Dict[str, Any]], ToolResult]
+    outputs: Tuple[str, ...] = ()  # result keys later tools can consume
+    produce_if_missing: Tuple[str, ...] = ()  # required params to schedule a producer for
+    cacheable: bool = False  # deterministic for JSON inputs
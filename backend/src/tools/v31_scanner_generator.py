@@ -339,7 +339,7 @@ def detect_scanner_type(description: str, a_plus_example: Dict) -> str:
     description_lower = description.lower()
 
     # Check for backside patterns
-    if any(keyword in description_lower for keyword in ["backside", "gap up into resistance", "red candle"]):
+    if any(keyword in description_lower for keyword in ("backside", "gap up into resistance", "red candle")):
         return "backside_b"
 
     # Check A+ example for hints
@@ -216,10 +216,11 @@ def check_pillar_0_market_scanning(code: str) -> Dict[str, Any]:
 
     violations = []
 
+    code_lower = code.lower()
     checks = {
         "full_market_coverage": "get_stage1_symbols" in code or "symbols" in code,
-        "grouped_endpoint_optimization": "grouped" in code.lower() or "batch" in code.lower(),
-        "batch_processing": "batch" in code.lower() or "process" in code.lower()
+        "grouped_endpoint_optimization": "grouped" in code_lower or "batch" in code_lower,
+        "batch_processing": "batch" in code_lower or "process" in code_lower
     }
 
     # Generate violations for failed checks
@@ -314,9 +315,10 @@ def check_pillar_2_per_ticker_operations(code: str, return_fixes: bool) -> Dict[
 
     violations = []
 
+    code_lower = code.lower()
     checks = {
         "independent_processing": "def stage2_process_symbols" in code,
-        "smart_filters": any(keyword in code.lower() for keyword in ["smart_filter", "passes_smart_filters", "quick_rejection"]),
+        "smart_filters": any(keyword in code_lower for keyword in ("smart_filter", "passes_smart_filters", "quick_rejection")),
         "no_lookahead_bias": ".shift(" in code or ".shift(1)" in code
     }
 
@@ -0,0 +1,316 @@
+"""
+Unit Tests for the RENATA V2 CLI
+
+Tests:
+- Concurrent batch mode ordering and context isolation
+- Micro-batching through process_requests_batch
+- Streaming batch results to JSON Lines
+- Serving requests over a Unix socket
+- Interactive result cache
+- Data file loading
+- Built-in command dispatch
+- Bounded conversation history
+- Background requests in the interactive loop
+- Command-verb fast path
+- Batch progress moving averages
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add backend root to path
+backend_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_root))
+
+from renata_cli import BatchProgress, RenataCLI, load_data, request_via_socket
+
+
+class RecordingOrchestrator:
+    """Orchestrator stand-in that records the context each request saw"""
+
+    def __init__(self, delays=None, mark_context=True):
+        self.delays = delays or {}
+        self.mark_context = mark_context
+        self.contexts = []
+
+    def process_request(self, user_input, context=None):
+        time.sleep(self.delays.get(user_input, 0))
+        if self.mark_context:
+            context["seen"] = user_input
+        self.contexts.append(context)
+        if user_input == "boom":
+            raise RuntimeError("tool failure")
+        return {
+            "response": f"done: {user_input}",
+            "tools_used": ["Tool"],
+            "execution_time": 0.001,
+            "success": True,
+        }
+
+
+class BatchingOrchestrator(RecordingOrchestrator):
+    """Orchestrator stand-in that also accepts whole chunks of requests"""
+
+    def __init__(self):
+        super().__init__()
+        self.chunks = []
+
+    def process_requests_batch(self, requests, context=None):
+        self.chunks.append(list(requests))
+        return [self.process_request(request, dict(context)) for request in requests]
+
+
+def _cli(orchestrator):
+    cli = RenataCLI()
+    cli.orchestrator = orchestrator
+    return cli
+
+
+class TestRunBatch:
+    """Test suite for RenataCLI.run_batch"""
+
+    def test_results_keep_request_order(self):
+        """Test 1: Results come back in request order even when later requests finish first"""
+        cli = _cli(RecordingOrchestrator(delays={"slow": 0.05}))
+
+        results = cli.run_batch(["slow", "fast"], workers=2)
+
+        assert [r["response"] for r in results] == ["done: slow", "done: fast"]
+
+    def test_each_request_gets_its_own_context(self):
+        """Test 2: Requests see a copy of the CLI context, never the shared dict"""
+        orchestrator = RecordingOrchestrator()
+        cli = _cli(orchestrator)
+        cli.context["ticker"] = "AAPL"
+
+        cli.run_batch(["a", "b"], workers=2)
+
+        assert cli.context == {"ticker": "AAPL"}
+        assert sorted(c["seen"] for c in orchestrator.contexts) == ["a", "b"]
+
+    def test_each_request_gets_its_own_frame(self):
+        """Test 2b: DataFrames in the context are copied per request, not shared"""
+        import pandas as pd
+
+        orchestrator = RecordingOrchestrator()
+        cli = _cli(orchestrator)
+        cli.context["df"] = pd.DataFrame({"close": [1.0, 2.0]})
+
+        cli.run_batch(["a", "b"], workers=2)
+
+        frames = [c["df"] for c in orchestrator.contexts]
+        assert all(frame is not cli.context["df"] for frame in frames)
+        assert frames[0] is not frames[1]
+
+    def test_failures_are_recorded(self):
+        """Test 3: A request that raises is reported as a failed result"""
+        cli = _cli(RecordingOrchestrator())
+
+        results = cli.run_batch(["ok", "boom"])
+
+        assert results[0]["success"] is True
+        assert results[1] == {"success": False, "error": "tool failure"}
+
+    def test_micro_batches_use_batch_entry_point(self):
+        """Test 4: Adjacent requests are grouped into chunks when the orchestrator supports it"""
+        orchestrator = BatchingOrchestrator()
+        cli = _cli(orchestrator)
+
+        results = cli.run_batch(["a", "b", "c", "d", "e"], micro_batch=2)
+
+        assert sorted(orchestrator.chunks) == [["a", "b"], ["c", "d"], ["e"]]
+        assert [r["response"] for r in results] == [f"done: {r}" for r in "abcde"]
+
+    def test_streams_results_to_jsonl(self, tmp_path):
+        """Test 5: With out set, one JSON Lines record per request is written and nothing is returned"""
+        out = tmp_path / "results.jsonl"
+        cli = _cli(RecordingOrchestrator())
+
+        assert cli.run_batch(["a", "boom"], out=str(out)) is None
+
+        records = sorted((json.loads(line) for line in out.read_text().splitlines()), key=lambda r: r["i"])
+        assert [(r["i"], r["request"], r["success"]) for r in records] == [(1, "a", True), (2, "boom", False)]
+        assert records[0]["response"] == "done: a"
+        assert records[1]["error"] == "tool failure"
+
+
+class TestServe:
+    """Test suite for --serve / --client"""
+
+    def test_round_trip_over_unix_socket(self, tmp_path):
+        """Test 1: A client request is answered by the serving CLI's orchestrator with merged context"""
+        orchestrator = RecordingOrchestrator()
+        cli = _cli(orchestrator)
+        cli.context["ticker"] = "AAPL"
+        socket_path = str(tmp_path / "renata.sock")
+
+        async def scenario():
+            server = asyncio.create_task(cli.serve(socket_path))
+            while not Path(socket_path).exists():
+                await asyncio.sleep(0.01)
+            result = await asyncio.to_thread(request_via_socket, socket_path, "hello", {"extra": 1})
+            server.cancel()
+            return result
+
+        result = asyncio.run(scenario())
+
+        assert result["response"] == "done: hello"
+        assert orchestrator.contexts[0] == {"ticker": "AAPL", "extra": 1, "seen": "hello"}
+        assert cli.context == {"ticker": "AAPL"}
+
+
+class TestResultCache:
+    """Test suite for the interactive result cache"""
+
+    def test_repeat_request_is_served_from_cache(self):
+        """Test 1: The same request with the same context skips the orchestrator"""
+        orchestrator = RecordingOrchestrator(mark_context=False)
+        cli = _cli(orchestrator)
+
+        cli.process_input("analyze AAPL")
+        cli.process_input("analyze AAPL")
+
+        assert len(orchestrator.contexts) == 1
+        assert cli.history[1][1]["cached"] is True
+        assert "cached" not in cli.history[0][1]
+
+    def test_context_change_misses(self):
+        """Test 2: A changed context runs the request again"""
+        orchestrator = RecordingOrchestrator(mark_context=False)
+        cli = _cli(orchestrator)
+
+        cli.process_input("analyze AAPL")
+        cli.context["ticker"] = "MSFT"
+        cli.process_input("analyze AAPL")
+
+        assert len(orchestrator.contexts) == 2
+
+    def test_cache_can_be_disabled(self):
+        """Test 3: use_cache=False always calls the orchestrator"""
+        orchestrator = RecordingOrchestrator()
+        cli = RenataCLI(use_cache=False)
+        cli.orchestrator = orchestrator
+
+        cli.process_input("analyze AAPL")
+        cli.process_input("analyze AAPL")
+
+        assert len(orchestrator.contexts) == 2
+
+
+class TestLoadData:
+    """Test suite for load_data"""
+
+    def test_csv_full_and_sampled(self, tmp_path):
+        """Test 1: CSVs load in full, or only the first nrows rows when asked"""
+        path = tmp_path / "bars.csv"
+        path.write_text("date,close\n2024-01-02,10.5\n2024-01-03,11.0\n2024-01-04,11.5\n")
+
+        assert len(load_data(str(path))) == 3
+        sampled = load_data(str(path), nrows=2)
+        assert list(sampled["close"]) == [10.5, 11.0]
+
+
+class TestCommands:
+    """Test suite for built-in command dispatch"""
+
+    def test_builtin_commands_skip_orchestrator(self):
+        """Test 1: Built-in commands are matched case-insensitively and never reach the orchestrator"""
+        orchestrator = RecordingOrchestrator()
+        cli = _cli(orchestrator)
+        cli.context["ticker"] = "AAPL"
+
+        cli.process_input("History")
+        cli.process_input(" RESET ")
+        cli.process_input("quit")
+
+        assert orchestrator.contexts == []
+        assert cli.context == {}
+        assert cli.running is False
+
+
+class TestHistory:
+    """Test suite for conversation history"""
+
+    def test_history_is_bounded_and_saved(self, tmp_path):
+        """Test 1: Only the newest entries are kept, numbered by their position in the session"""
+        cli = RenataCLI(use_cache=False, history_size=2)
+        cli.orchestrator = RecordingOrchestrator(mark_context=False)
+
+        for request in ("one", "two", "three"):
+            cli.process_input(request)
+
+        assert [request for request, _ in cli.history] == ["two", "three"]
+
+        path = tmp_path / "history.jsonl"
+        cli.process_input(f"history save {path}")
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [(r["i"], r["request"]) for r in records] == [(2, "two"), (3, "three")]
+
+
+class TestInteractive:
+    """Test suite for the asyncio interactive loop"""
+
+    def test_requests_complete_before_exit(self, monkeypatch):
+        """Test 1: Prompts are processed in the background and finished before the loop returns"""
+        lines = iter(["slow", "fast", "history"])
+
+        def fake_input(prompt):
+            try:
+                return next(lines)
+            except StopIteration:
+                raise EOFError
+
+        monkeypatch.setattr("builtins.input", fake_input)
+        monkeypatch.setattr("renata_cli.readline", None)
+        cli = _cli(RecordingOrchestrator(delays={"slow": 0.05}, mark_context=False))
+
+        asyncio.run(cli.run_interactive())
+
+        assert sorted(request for request, _ in cli.history) == ["fast", "slow"]
+
+
+class CommandOrchestrator(RecordingOrchestrator):
+    """Orchestrator stand-in that also accepts explicit command verbs"""
+
+    def __init__(self):
+        super().__init__(mark_context=False)
+        self.commands = []
+
+    def process_command(self, command, user_input, context=None):
+        self.commands.append(command)
+        return self.process_request(user_input, context)
+
+
+class TestFastCommands:
+    """Test suite for the command-verb fast path"""
+
+    def test_command_verbs_skip_intent_detection(self):
+        """Test 1: Requests starting with a command verb go through process_command"""
+        orchestrator = CommandOrchestrator()
+        cli = _cli(orchestrator)
+
+        cli.process_input("Analyze-backtest last run")
+        cli.process_input("analyze AAPL")
+        cli.process_input("what is the trend of SPY")
+
+        assert orchestrator.commands == ["analyze-backtest", "analyze"]
+        assert len(orchestrator.contexts) == 3
+
+
+class TestBatchProgress:
+    """Test suite for BatchProgress"""
+
+    def test_moving_averages(self):
+        """Test 1: Request and per-tool averages start at the first sample and then move by ALPHA"""
+        progress = BatchProgress(total=3, workers=2)
+
+        progress.update({"success": True, "tools_used": ["A", "B"], "execution_time": 2.0})
+        progress.update({"success": False, "tools_used": ["A"], "execution_time": 4.0})
+
+        assert progress.done == 2 and progress.ok == 1
+        assert progress.request_ema == 0.9 * 2.0 + 0.1 * 4.0
+        assert progress.tool_ema == {"A": 0.9 * 1.0 + 0.1 * 4.0, "B": 1.0}
+        progress.close()
@@ -0,0 +1,97 @@
+"""
+Unit Tests for the Scanner Formatting Core
+
+Tests:
+- format_scanner output layout
+- freeze_parameters canonical keys
+- Bounded, thread-safe literal cache
+"""
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add backend root to path
+backend_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_root))
+
+import formatter_core
+from formatter_core import format_scanner, freeze, freeze_parameters, to_literal
+
+
+class TestFormatScanner:
+    """Test suite for format_scanner"""
+
+    def test_parameter_rendering(self):
+        """Test 1: Range, list and scalar parameters render as config attributes"""
+        params = freeze_parameters([
+            {"name": "gap", "value": {"min": 0.5, "max": 2}},
+            {"name": "tickers", "value": ["AAPL", "MSFT"]},
+            {"name": "enabled", "value": True},
+        ])
+
+        code, improvements = format_scanner("print('scan')", params)
+
+        assert "    gap_min = 0.5\n    gap_max = 2\n" in code
+        assert "    tickers = ['AAPL', 'MSFT']\n" in code
+        assert "    enabled = true\n" in code
+        assert "config = ScannerConfig()\n\nprint('scan')\n\n# Usage Instructions:" in code
+        assert code.endswith("# 3. 3 parameters are now user-configurable")
+        assert improvements == (
+            "Configurable range for gap",
+            "Configurable array for tickers",
+            "Configurable parameter enabled",
+        )
+
+    def test_no_parameters(self):
+        """Test 2: Empty parameter list still produces a valid config section"""
+        code, improvements = format_scanner("x = 1", freeze_parameters([]))
+
+        assert '"""User-configurable scanner parameters"""\n\n# Initialize configuration' in code
+        assert improvements == ()
+
+    def test_duplicate_improvements_collapsed(self):
+        """Test 3: Same-named parameters produce a single improvement entry"""
+        params = freeze_parameters([{"name": "atr", "value": 1}, {"name": "atr", "value": 2}])
+
+        _, improvements = format_scanner("", params)
+
+        assert improvements == ("Configurable parameter atr",)
+
+
+class TestFreezeParameters:
+    """Test suite for freeze_parameters"""
+
+    def test_keys_are_hashable_and_type_tagged(self):
+        """Test 4: True and 1 freeze to different keys"""
+        as_bool = freeze_parameters([{"name": "p", "value": True}])
+        as_int = freeze_parameters([{"name": "p", "value": 1}])
+
+        assert hash(as_bool) is not None
+        assert as_bool != as_int
+
+    def test_missing_name_defaults_to_unknown(self):
+        """Test 5: Parameters without a name are rendered as 'unknown'"""
+        params = freeze_parameters([{"value": 3}])
+
+        assert params[0][0] == "unknown"
+
+    def test_missing_value_defaults_to_empty_dict(self):
+        """Test 6: Parameters without a value render as {} rather than null"""
+        code, _ = format_scanner("x = 1", freeze_parameters([{"name": "atr"}]))
+
+        assert "    atr = {}\n" in code
+        assert "null" not in code
+
+
+class TestToLiteral:
+    """Test suite for to_literal"""
+
+    def test_cache_stays_bounded_across_threads(self):
+        """Test 7: Concurrent misses past the bound evict without errors"""
+        count = formatter_core._LITERAL_CACHE_SIZE * 2
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            literals = list(pool.map(lambda i: to_literal(freeze({"n": i})), range(count)))
+
+        assert literals[5] == '{"n": 5}'
+        assert len(formatter_core._LITERAL_CACHE) <= formatter_core._LITERAL_CACHE_SIZE
@@ -11,7 +11,12 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
 
 import pandas as pd
 import numpy as np
-from orchestrator.renata_orchestrator import RenataOrchestrator, process_user_request
+from orchestrator.renata_orchestrator import (
+    RenataOrchestrator,
+    _cached_tool_call,
+    get_orchestrator,
+    process_user_request,
+)
 
 
 def create_sample_context():
@@ -209,6 +214,181 @@ def test_convenience_function():
     return True
 
 
+def test_orchestrator_streaming():
+    """Test: Streamed output matches the non-streamed result"""
+    print("\n🧪 Test 9: Streaming")
+
+    orchestrator = RenataOrchestrator()
+    events = list(orchestrator.process_request_stream("Generate a Backside B gap scanner"))
+
+    chunks = [chunk for chunk, meta in events if meta is None]
+    final_chunk, result = events[-1]
+
+    assert final_chunk == "" and result is not None
+    assert result["success"] == True
+    assert chunks[0].startswith("🔧 V31 Scanner Generator")
+    assert "".join(chunks).endswith(result["response"])
+
+    print(f"   ✅ Streamed {len(chunks)} chunks")
+    print(f"   🔧 Tools: {', '.join(result['tools_used'])}")
+
+    return True
+
+
+def test_orchestrator_workflow_dag():
+    """Test: Independent tools share a layer, dependent tools wait for their producer"""
+    print("\n🧪 Test 10: Workflow DAG")
+
+    orchestrator = RenataOrchestrator()
+    registry = orchestrator.tool_registry
+    generator, validator = registry["v31_scanner_generator"], registry["v31_validator"]
+
+    analyze = [registry["indicator_calculator"], registry["market_structure_analyzer"]]
+    assert orchestrator._build_dag(analyze, None) == (analyze, {0: set(), 1: set()})
+    assert orchestrator._build_dag([generator, validator], None) == ([generator, validator], {0: set(), 1: {0}})
+
+    # A validator without code gets the generator scheduled ahead of it, once
+    assert orchestrator._build_dag([validator], {}) == ([generator, validator], {0: set(), 1: {0}})
+    assert orchestrator._build_dag([validator], {"scanner_code": "x"}) == ([validator], {0: set()})
+
+    context = create_sample_context()
+    columns = list(context["df"].columns)
+    result = orchestrator.process_request("Analyze AAPL market structure", context=context)
+    assert result["tools_used"] == ["Indicator Calculator", "Market Structure Analyzer"]
+
+    # Tools run side by side each get their own frame
+    assert list(context["df"].columns) == columns
+
+    print(f"   ✅ DAG edges follow declared outputs")
+
+    return True
+
+
+def test_orchestrator_keyword_details():
+    """Test: One keyword pass yields intent, setup types and complexity"""
+    print("\n🧪 Test 11: Keyword Details")
+
+    orchestrator = RenataOrchestrator()
+    intent = orchestrator._understand_intent("Build a simple multi-day FBO and D2 gap scanner, then validate it")
+
+    assert intent["type"] == "GENERATE_SCANNER"
+    assert intent["details"]["setup_types"] == ["BACKSIDE_B", "D2", "MDR", "FBO"]
+    assert intent["details"]["complexity"] == "simple"
+    assert orchestrator._understand_intent("Comprehensive strategy")["details"]["complexity"] == "complex"
+
+    print(f"   ✅ Details: {intent['details']}")
+
+    return True
+
+
+def test_orchestrator_shared_state():
+    """Test: Registry and orchestrator are built once, deterministic tools run once per input"""
+    print("\n🧪 Test 12: Shared State")
+
+    assert get_orchestrator() is get_orchestrator()
+    assert RenataOrchestrator().tool_registry is RenataOrchestrator().tool_registry
+
+    # Separate orchestrators, so the tool cache is hit rather than the request cache
+    request = "Validate this scanner"
+    context = {"scanner_code": "def get_stage1_symbols():\n    return []\n"}
+    first = RenataOrchestrator().process_request(request, context)
+    hits = _cached_tool_call.cache_info().hits
+    second = RenataOrchestrator().process_request(request, context)
+
+    # Same response apart from the timing line, which is this call's own
+    assert second["response"].splitlines()[:-1] == first["response"].splitlines()[:-1]
+    assert _cached_tool_call.cache_info().hits == hits + 1  # validator
+
+    # Each hit is a private copy of the cached result
+    validator = RenataOrchestrator().tool_registry["v31_validator"]
+    one, _ = RenataOrchestrator._call_tool(validator, dict(context))
+    two, _ = RenataOrchestrator._call_tool(validator, dict(context))
+    assert one.result == two.result and one.result is not two.result
+
+    # The generator stamps its code with the time, so it always runs
+    hits = _cached_tool_call.cache_info().hits
+    generated = RenataOrchestrator().process_request("Generate a cached FBO scanner for shared state")
+    assert generated["tools_used"][0] == "V31 Scanner Generator"
+    assert _cached_tool_call.cache_info().hits == hits
+
+    print(f"   ✅ Cache: {_cached_tool_call.cache_info()}")
+
+    return True
+
+
+def test_orchestrator_request_cache():
+    """Test: Repeat requests on cacheable tools are served from the request cache"""
+    print("\n🧪 Test 13: Request Cache")
+
+    orchestrator = RenataOrchestrator()
+    first = orchestrator.process_request("Create implementation plan for a cached strategy")
+    first["intent"]["details"]["mutated"] = True
+    second = orchestrator.process_request("Create implementation plan for a cached strategy")
+
+    assert len(orchestrator._request_cache) == 1
+    assert second["response"] == first["response"]
+    assert "mutated" not in second["intent"]["details"]
+
+    # Data-driven requests are never cached
+    orchestrator.process_request("Analyze AAPL market structure", context=create_sample_context())
+    assert len(orchestrator._request_cache) == 1
+
+    # Nor are requests whose DAG pulls in the (uncacheable) scanner generator
+    validated = orchestrator.process_request("Validate a new scanner")
+    assert validated["tools_used"] == ["V31 Scanner Generator", "V31 Validator"]
+    assert len(orchestrator._request_cache) == 1
+
+    print(f"   ✅ Cached requests: {len(orchestrator._request_cache)}")
+
+    return True
+
+
+def test_orchestrator_lazy_tools():
+    """Test: Importing the orchestrator doesn't import tool modules or their dependencies"""
+    print("\n🧪 Test 14: Lazy Tool Imports")
+
+    import subprocess
+
+    src = os.path.join(os.path.dirname(__file__), '../../src')
+    probe = (
+        "import sys; sys.path.insert(0, sys.argv[1]); "
+        "import orchestrator.renata_orchestrator; "
+        "print(sorted(m for m in sys.modules if m == 'pandas' or m.startswith('tools.')))"
+    )
+    out = subprocess.run([sys.executable, "-c", probe, src], capture_output=True, text=True, check=True).stdout
+
+    assert out.strip() == "['tools.tool_types']"
+
+    print(f"   ✅ Loaded at import: {out.strip()}")
+
+    return True
+
+
+def test_orchestrator_batch():
+    """Test: Batch results come back in input order and match single requests"""
+    print("\n🧪 Test 15: Batch Requests")
+
+    orchestrator = RenataOrchestrator()
+    requests = [
+        "Generate a Backside B gap scanner",
+        "Create implementation plan for momentum strategy",
+        "Analyze AAPL market structure",
+    ]
+
+    context = create_sample_context()
+    columns = list(context["df"].columns)
+    results = orchestrator.process_requests_batch(requests, context)
+    assert list(context["df"].columns) == columns
+
+    assert [r["intent"]["original_input"] for r in results] == requests
+    assert results[1]["response"] == orchestrator.process_request(requests[1])["response"]
+    assert results[2]["tools_used"] == ["Indicator Calculator", "Market Structure Analyzer"]
+
+    print(f"   ✅ Batch of {len(results)} processed")
+
+    return True
+
+
 def run_all_orchestrator_tests():
     """Run all orchestrator tests"""
 
@@ -225,6 +405,13 @@ def run_all_orchestrator_tests():
         ("Multi-Tool Workflow", test_orchestrator_multi_tool_workflow),
         ("Error Handling", test_orchestrator_error_handling),
         ("Convenience Function", test_convenience_function),
+        ("Streaming", test_orchestrator_streaming),
+        ("Workflow DAG", test_orchestrator_workflow_dag),
+        ("Keyword Details", test_orchestrator_keyword_details),
+        ("Shared State", test_orchestrator_shared_state),
+        ("Request Cache", test_orchestrator_request_cache),
+        ("Lazy Tool Imports", test_orchestrator_lazy_tools),
+        ("Batch Requests", test_orchestrator_batch),
     ]
 
     passed = 0
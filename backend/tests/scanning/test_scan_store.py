@@ -0,0 +1,67 @@
+"""
+Unit Tests for the Scan EZ Scan Store
+
+Tests:
+- Eviction of finished scans past max_size
+- Running scans are never evicted
+- setdefault()/update() respect the cap
+- TTL expiry of finished scans
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend root to path
+backend_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_root))
+
+from scan_store import ScanStore
+
+
+def _scan(status, minute):
+    return {"status": status, "created_at": f"2024-01-02T10:{minute:02d}:00"}
+
+
+class TestScanStore:
+    """Test suite for ScanStore"""
+
+    def test_evicts_oldest_finished_scan(self):
+        """Test 1: Going over max_size drops the least recently updated finished scan"""
+        store = ScanStore(max_size=2)
+        store["old"] = _scan("completed", 1)
+        store["running"] = _scan("running", 0)
+        store["new"] = _scan("completed", 2)
+
+        assert set(store) == {"running", "new"}
+
+    def test_running_scans_are_kept_over_the_cap(self):
+        """Test 2: Live scans are never evicted, even if that leaves the store over max_size"""
+        store = ScanStore(max_size=1)
+        store["a"] = _scan("running", 0)
+        store["b"] = _scan("initializing", 1)
+        store["a"].update(status="completed")
+        store["c"] = _scan("running", 2)
+
+        assert set(store) == {"b", "c"}
+
+    def test_setdefault_and_update_respect_cap(self):
+        """Test 3: Insertion through setdefault() and update() evicts like item assignment"""
+        store = ScanStore(max_size=1)
+        store.setdefault("a", _scan("completed", 0))
+        store.update({"b": _scan("completed", 1)})
+        assert set(store) == {"b"}
+
+        store |= {"c": _scan("completed", 2)}
+        assert set(store) == {"c"}
+        assert store.setdefault("c", {}) is store["c"]
+
+    def test_expire_finished_only(self):
+        """Test 4: expire() drops idle finished scans and keeps running ones"""
+        store = ScanStore()
+        store["done"] = _scan("completed", 0)
+        store["running"] = _scan("running", 0)
+
+        now = datetime.fromisoformat("2024-01-02T10:00:00") + timedelta(hours=2)
+        assert store.expire(3600, now) == 1
+        assert set(store) == {"running"}
@@ -0,0 +1,86 @@
+"""
+Unit Tests for the Scan EZ Scanner Runner
+
+Tests:
+- Result discovery from scanner globals and main()
+- Scanner errors and stdout capture
+- CappedOutput truncation
+- Compiled scanner cache
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+# Add backend root to path
+backend_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(backend_root))
+
+from scanner_runner import CappedOutput, compiled_scanner, run_scanner
+
+
+def _run(code):
+    return run_scanner(code, "scanner.py", "2024-01-02", "2024-01-31", "key", "https://example.test")
+
+
+class TestRunScanner:
+    """Test suite for run_scanner"""
+
+    def test_dataframe_results(self):
+        """Test 1: A DataFrame left in a result variable is returned as records, with dates injected"""
+        results = _run("df = pd.DataFrame([{'ticker': 'AAPL', 'date': START_DATE}])")
+
+        assert results == [{"ticker": "AAPL", "date": "2024-01-02"}]
+
+    def test_main_fallback(self):
+        """Test 2: main() is called when no result variable is set"""
+        results = _run("def main():\n    return [{'ticker': 'MSFT'}]\n")
+
+        assert results == [{"ticker": "MSFT"}]
+
+    def test_errors_and_prints_are_contained(self, capsys):
+        """Test 3: Scanner prints don't reach stdout and a failing scanner yields no results"""
+        results = _run("print('scanner noise')\nraise ValueError('boom')")
+
+        assert results == []
+        assert "scanner noise" not in capsys.readouterr().out
+
+    def test_errors_are_logged_with_traceback(self, caplog):
+        """Test 4: A scanner error reaches the logger with its traceback attached"""
+        with caplog.at_level(logging.ERROR, logger="scanner_runner"):
+            _run("raise ValueError('boom')")
+
+        record = caplog.records[-1]
+        assert "boom" in record.getMessage()
+        assert record.exc_info[0] is ValueError
+
+
+class TestCappedOutput:
+    """Test suite for CappedOutput"""
+
+    def test_truncates_past_limit(self):
+        """Test 1: Writes past the limit are dropped but still reported as written"""
+        buf = CappedOutput(limit=5)
+
+        assert buf.write("abc") == 3
+        assert buf.write("defgh") == 5
+        assert buf.write("ijk") == 3
+        assert buf.getvalue() == "abcde"
+
+
+class TestCompiledScanner:
+    """Test suite for the compiled scanner cache"""
+
+    def test_reuses_code_until_file_changes(self, tmp_path):
+        """Test 1: An unchanged (mtime, size) key reuses the code object; a new key recompiles"""
+        scanner = tmp_path / "scanner.py"
+        scanner.write_text("results = [1]\n")
+        key = (scanner.stat().st_mtime_ns, scanner.stat().st_size)
+
+        first = compiled_scanner(None, str(scanner), key)
+        assert compiled_scanner(None, str(scanner), key) is first
+
+        scanner.write_text("results = [1, 2]\n")
+        new_key = (key[0] + 1, scanner.stat().st_size)
+        assert compiled_scanner(None, str(scanner), new_key) is not first
+        assert run_scanner(None, str(scanner), "a", "b", "k", "u", new_key) == [1, 2]
@@ -284,6 +284,32 @@ def test_market_structure_analyzer_support_resistance():
     return True
 
 
+def test_market_structure_analyzer_known_levels():
+    """Test support/resistance on a series with known retests"""
+    print("\n🧪 Test 8b: market_structure_analyzer - Known Levels")
+
+    lows = np.linspace(101, 130, 100)
+    highs = lows + 5
+    lows[[20, 40, 60]] = 100.0   # three dips to the same support
+    highs[[30, 50]] = 140.0      # two spikes to the same resistance
+
+    df = pd.DataFrame({
+        'open': lows + 2, 'high': highs, 'low': lows, 'close': lows + 2, 'volume': 1000000
+    }, index=pd.date_range(start="2024-01-01", periods=100, freq="D"))
+
+    result = market_structure_analyzer({"ticker": "TEST", "df": df})
+
+    assert result.status == ToolStatus.SUCCESS
+    support = result.result["support_levels"][0]
+    resistance = result.result["resistance_levels"][0]
+    assert (support["price"], support["tests"]) == (100.0, 3)
+    assert (resistance["price"], resistance["tests"]) == (140.0, 2)
+
+    print(f"   ✅ Support ${support['price']:.2f} x{support['tests']}, resistance ${resistance['price']:.2f} x{resistance['tests']}")
+
+    return True
+
+
 def test_market_structure_analyzer_current_position():
     """Test current position analysis"""
     print("\n🧪 Test 9: market_structure_analyzer - Current Position")
@@ -469,6 +495,7 @@ def run_all_tests():
         ("Market Structure Analyzer - Trend", test_market_structure_analyzer_trend),
         ("Market Structure Analyzer - Pivots", test_market_structure_analyzer_pivots),
         ("Market Structure Analyzer - Support/Resistance", test_market_structure_analyzer_support_resistance),
+        ("Market Structure Analyzer - Known Levels", test_market_structure_analyzer_known_levels),
         ("Market Structure Analyzer - Current Position", test_market_structure_analyzer_current_position),
         ("Daily Context Detector - Backside B", test_daily_context_detector_backside_b),
         ("Daily Context Detector - Multiple Molds", test_daily_context_detector_multiple_molds),
@@ -506,6 +506,33 @@ def test_performance_validation_tools():
     return True
 
 
+def test_a_plus_analyzer_repeat_scanner():
+    """Test repeated analysis of the same scanner"""
+    print("\n🧪 Test 12: a_plus_analyzer - Repeated Scanner")
+
+    input_data = {
+        "scanner_code": SAMPLE_SCANNER_BACKSIDE_B,
+        "a_plus_examples": [
+            {"ticker": "AAPL", "date": "2024-01-15", "setup_type": "BACKSIDE_B", "entry_price": 150.25}
+        ]
+    }
+
+    first = a_plus_analyzer(input_data)
+    first.result["scanner_capabilities"]["setup_types_detected"].append("D2")
+    first.result["scanner_capabilities"]["has_gap_detection"] = False
+
+    second = a_plus_analyzer(input_data)
+
+    assert second.status == ToolStatus.SUCCESS
+    assert second.result["scanner_capabilities"]["has_gap_detection"] is True
+    assert "D2" not in second.result["scanner_capabilities"]["setup_types_detected"]
+    assert second.result["example_results"][0]["caught"] == first.result["example_results"][0]["caught"]
+
+    print(f"   ✅ Cached capabilities unaffected by caller changes")
+
+    return True
+
+
 def run_all_tests():
     """Run all tests and report results"""
 
@@ -525,6 +552,7 @@ def run_all_tests():
         ("Quick Backtester - Validation", test_quick_backtester_validation),
         ("Quick Backtester - Benchmark Comparison", test_quick_backtester_benchmark_comparison),
         ("Performance Test", test_performance_validation_tools),
+        ("A+ Analyzer - Repeated Scanner", test_a_plus_analyzer_repeat_scanner),
     ]
 
     passed = 0